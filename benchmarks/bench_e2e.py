@@ -0,0 +1,258 @@
+"""End-to-end benchmarks of the integration against a local fake hub.
+
+Measures coordinator refresh time, send_ir_code latency and throughput,
+learn-to-event latency and setup time, and writes them as JSON so two
+runs can be compared:
+
+    python benchmarks/bench_e2e.py --output before.json
+    python benchmarks/bench_e2e.py --baseline before.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from typing import Any
+
+from common import (
+    add_common_arguments,
+    async_create_hass,
+    async_setup_config_entries,
+    finish,
+    metadata,
+    summarize,
+)
+from fake_hub import NEC_CAPTURE, NEC_FRAME, FakeHub, FakeHubConfig
+from homeassistant.const import CONF_HOST, CONF_NAME, CONF_TOKEN
+
+from custom_components.haptique_extender.const import CONF_DEVICE_SNAPSHOT, DOMAIN
+from custom_components.haptique_extender.coordinator import HaptiqueCoordinator
+from custom_components.haptique_extender.ir_database import IRDatabase
+from custom_components.haptique_extender.learning import LearningSessionManager
+
+# A long air-conditioner frame, the worst case for payload size
+AC_FRAME = [3500, 1750] + [450, 1300, 450, 420] * 140 + [450]
+
+
+async def bench_refresh(coordinator: HaptiqueCoordinator, iterations: int) -> dict[str, Any]:
+    """Time full coordinator refreshes."""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await coordinator.async_refresh()
+        samples.append(time.perf_counter() - start)
+        if not coordinator.last_update_success:
+            raise RuntimeError("Refresh against the fake hub failed")
+    return summarize(samples)
+
+
+async def bench_send(
+    coordinator: HaptiqueCoordinator, raw_data: list[int], iterations: int
+) -> dict[str, Any]:
+    """Time sequential send_ir_code calls."""
+    samples = []
+    failures = 0
+    for _ in range(iterations):
+        start = time.perf_counter()
+        if not await coordinator.send_ir_code(raw_data):
+            failures += 1
+        samples.append(time.perf_counter() - start)
+    return {**summarize(samples), "failures": failures}
+
+
+async def bench_throughput(
+    coordinator: HaptiqueCoordinator, raw_data: list[int], total: int, concurrency: int
+) -> dict[str, Any]:
+    """Measure sends per second with concurrent callers."""
+    remaining = total
+    failures = 0
+
+    async def worker() -> None:
+        nonlocal remaining, failures
+        while remaining > 0:
+            remaining -= 1
+            if not await coordinator.send_ir_code(raw_data):
+                failures += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return {
+        "total": total,
+        "concurrency": concurrency,
+        "elapsed_ms": round(elapsed * 1000, 3),
+        "sends_per_sec": round(total / elapsed, 1),
+        "failures": failures,
+    }
+
+
+async def bench_learn(
+    hass, coordinator: HaptiqueCoordinator, hub: FakeHub, iterations: int
+) -> dict[str, Any]:
+    """Time from a button press on the hub to the learn success event."""
+    samples = []
+    done = asyncio.Event()
+
+    def on_operation(event) -> None:
+        if event.data.get("operation") == "learn" and event.data.get("status") == "success":
+            done.set()
+
+    unsub = hass.bus.async_listen("haptique_operation", on_operation)
+    try:
+        for index in range(iterations):
+            done.clear()
+            hub.clear_last()
+            coordinator.start_learning("Bench Device", f"command {index}")
+            await asyncio.sleep(0.1)
+
+            start = time.perf_counter()
+            hub.press(NEC_CAPTURE)
+            await asyncio.wait_for(done.wait(), timeout=60)
+            samples.append(time.perf_counter() - start)
+    finally:
+        unsub()
+        coordinator.set_learning_mode(False)
+
+    return summarize(samples)
+
+
+async def _setup(hass, data: dict[str, Any]) -> str:
+    """Set a hub entry up through async_setup_entry, remove it and return its state.
+
+    The shared IR database is dropped first, so every setup loads it from
+    disk as after a restart.
+    """
+    from homeassistant.config_entries import SOURCE_USER, ConfigEntry
+
+    hass.data.get(DOMAIN, {}).pop("ir_database", None)
+    entry = ConfigEntry(
+        data=data,
+        discovery_keys={},
+        domain=DOMAIN,
+        minor_version=1,
+        options={},
+        source=SOURCE_USER,
+        title="Bench Hub",
+        unique_id=None,
+        version=1,
+    )
+    await hass.config_entries.async_add(entry)
+    state = entry.state.value
+    await hass.config_entries.async_remove(entry.entry_id)
+    return state
+
+
+async def bench_setup(
+    hass, hub: FakeHub, db_commands: int, iterations: int
+) -> dict[str, Any]:
+    """Time the setup of a config entry, platforms included.
+
+    `cold` is a first setup (no device snapshot), `snapshot` a restart with
+    the hub online and `offline` a restart with the hub unreachable. The
+    `states` of each variant count the entry states setups ended in.
+    """
+    ir_db = IRDatabase(hass)
+    devices = ir_db.get_all_data()["devices"]
+    for index in range(db_commands):
+        device = devices.setdefault(
+            f"Device {index // 50}", {"created_at": None, "commands": {}}
+        )
+        device["commands"][f"command {index % 50}"] = {
+            "freq_khz": 38,
+            "duty": 33,
+            "repeat": 1,
+            "raw": list(NEC_FRAME),
+            "learned_at": None,
+        }
+    await ir_db.async_save()
+
+    snapshot = {"mac": "AA:BB:CC:DD:EE:FF", "hostname": "fake-hub", "fw_ver": "1.0.0"}
+    entry_data = {CONF_NAME: "Bench Hub", CONF_TOKEN: hub.config.token}
+    # Nothing listens on port 9 of the loopback address
+    variants = {
+        "cold": {**entry_data, CONF_HOST: hub.host},
+        "snapshot": {**entry_data, CONF_HOST: hub.host, CONF_DEVICE_SNAPSHOT: snapshot},
+        "offline": {**entry_data, CONF_HOST: "127.0.0.1:9", CONF_DEVICE_SNAPSHOT: snapshot},
+    }
+
+    results: dict[str, Any] = {"db_commands": db_commands}
+    for name, data in variants.items():
+        samples = []
+        states: dict[str, int] = {}
+        for _ in range(iterations):
+            start = time.perf_counter()
+            state = await _setup(hass, data)
+            samples.append(time.perf_counter() - start)
+            states[state] = states.get(state, 0) + 1
+        results[name] = {**summarize(samples), "states": states}
+    await hass.async_block_till_done()
+
+    return results
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    """Run every benchmark and return the results."""
+    hub = FakeHub(FakeHubConfig(latency=args.latency, jitter=args.jitter))
+    await hub.start()
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await async_create_hass(config_dir)
+        try:
+            await async_setup_config_entries(hass)
+            ir_db = IRDatabase(hass)
+            hass.data[DOMAIN] = {
+                "ir_database": ir_db,
+                "learning_sessions": LearningSessionManager(hass),
+            }
+            coordinator = HaptiqueCoordinator(hass, hub.host, hub.config.token)
+
+            results: dict[str, Any] = {}
+            results["refresh"] = await bench_refresh(coordinator, args.iterations)
+            results["send_nec"] = await bench_send(coordinator, NEC_FRAME, args.iterations)
+            results["send_ac"] = await bench_send(coordinator, AC_FRAME, args.iterations)
+            results["throughput"] = await bench_throughput(
+                coordinator, NEC_FRAME, args.iterations * 4, args.concurrency
+            )
+            if args.learn_iterations:
+                results["learn_to_event"] = await bench_learn(
+                    hass, coordinator, hub, args.learn_iterations
+                )
+            results["setup"] = await bench_setup(
+                hass, hub, args.db_commands, max(3, args.iterations // 10)
+            )
+            results["hub_requests"] = dict(hub.stats.requests)
+        finally:
+            await hass.async_stop(force=True)
+            await hub.stop()
+
+    return {
+        "meta": metadata(
+            suite="e2e",
+            latency=args.latency,
+            jitter=args.jitter,
+            iterations=args.iterations,
+        ),
+        "results": results,
+    }
+
+
+def main() -> int:
+    """Parse arguments and run the suite."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--learn-iterations", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--db-commands", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.005, help="Hub latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.002, help="Hub jitter in seconds")
+    add_common_arguments(parser)
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    return finish("e2e", results, args.output, args.baseline, args.threshold)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,223 @@
+"""IRDatabase and codec microbenchmarks at 1k to 100k commands.
+
+Generates synthetic databases, times every public IRDatabase operation plus
+load and save, the stdlib JSON codec against the integration's codec, and
+records the peak memory of each with tracemalloc:
+
+    python benchmarks/bench_ir_database.py --sizes 1000,10000,100000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+from common import add_common_arguments, async_create_hass, finish, metadata, summarize
+from fake_hub import NEC_CAPTURE, NEC_FRAME
+
+from custom_components.haptique_extender.codec import (
+    JSON_BACKEND,
+    json_dumps,
+    json_dumps_pretty,
+    json_loads,
+)
+from custom_components.haptique_extender.ir_database import IRDatabase
+from custom_components.haptique_extender.ir_signal import (
+    detect_repeat_frames,
+    normalize_timings,
+)
+
+COMMANDS_PER_DEVICE = 50
+AC_FRAME = [3500, 1750] + [450, 1300, 450, 420] * 140 + [450]
+
+
+def build_database(ir_db: IRDatabase, commands: int) -> list[tuple[str, str]]:
+    """Fill a database in memory and return its (device, command) keys."""
+    devices = ir_db.get_all_data()["devices"]
+    keys = []
+    for index in range(commands):
+        device_name = f"Device {index // COMMANDS_PER_DEVICE}"
+        command_name = f"command {index % COMMANDS_PER_DEVICE}"
+        device = devices.setdefault(
+            device_name, {"created_at": "2025-01-01T00:00:00+00:00", "commands": {}}
+        )
+        # One command in ten is a long air-conditioner frame
+        raw_data = AC_FRAME if index % 10 == 0 else NEC_FRAME
+        device["commands"][command_name] = {
+            "freq_khz": 38,
+            "duty": 33,
+            "repeat": 1,
+            "raw": list(raw_data),
+            "learned_at": "2025-01-01T00:00:00+00:00",
+        }
+        keys.append((device_name, command_name))
+    return keys
+
+
+async def measure(
+    operation: Callable[[], Awaitable[Any] | Any], iterations: int
+) -> dict[str, Any]:
+    """Time an operation, then trace the peak memory of one more call."""
+
+    async def call() -> None:
+        result = operation()
+        if asyncio.iscoroutine(result):
+            await result
+
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await call()
+        samples.append(time.perf_counter() - start)
+
+    # Tracing slows allocations down, so it stays out of the timed calls
+    tracemalloc.start()
+    try:
+        await call()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {**summarize(samples), "peak_bytes": peak}
+
+
+async def bench_size(hass, commands: int, args: argparse.Namespace) -> dict[str, Any]:
+    """Run every operation against a database of the given size."""
+    ir_db = IRDatabase(hass)
+    keys = build_database(ir_db, commands)
+    await ir_db.async_save()
+    file_size = Path(ir_db._file_path).stat().st_size
+    rng = random.Random(commands)
+    iterations = args.iterations
+
+    def get_command() -> None:
+        device_name, command_name = rng.choice(keys)
+        # Callers do not always match the stored case
+        ir_db.get_command(device_name.upper(), command_name)
+
+    def get_missing_command() -> None:
+        ir_db.get_command(rng.choice(keys)[0], "missing command")
+
+    def list_commands() -> None:
+        ir_db.list_commands(rng.choice(keys)[0])
+
+    added = 0
+
+    async def add_command() -> None:
+        nonlocal added
+        added += 1
+        await ir_db.add_command(
+            "Benchmark Device", f"new command {added}", 38, 33, 1, list(NEC_FRAME)
+        )
+
+    async def load() -> None:
+        await IRDatabase(hass).async_load()
+
+    slow_iterations = max(1, min(iterations, args.slow_iterations))
+    results = {
+        "file_bytes": file_size,
+        "get_command": await measure(get_command, iterations * 10),
+        "get_command_missing": await measure(get_missing_command, iterations * 10),
+        "list_devices": await measure(ir_db.list_devices, iterations),
+        "list_commands": await measure(list_commands, iterations),
+        "add_command": await measure(add_command, slow_iterations),
+        "async_load": await measure(load, slow_iterations),
+        "save_sync": await measure(ir_db._save_sync, slow_iterations),
+    }
+
+    # Bytes written to disk by one learn, journal record included
+    journal_before = ir_db.get_statistics()["journal_bytes"]
+    await add_command()
+    results["add_command_written_bytes"] = (
+        ir_db.get_statistics()["journal_bytes"] - journal_before
+    )
+
+    data = ir_db.get_all_data()
+    encoded = json.dumps(data, indent=2, ensure_ascii=False)
+    results["codec"] = {
+        "encode": await measure(
+            lambda: json.dumps(data, indent=2, ensure_ascii=False), slow_iterations
+        ),
+        "decode": await measure(lambda: json.loads(encoded), slow_iterations),
+    }
+    pretty = json_dumps_pretty(data)
+    results[f"codec_{JSON_BACKEND}"] = {
+        "encode": await measure(lambda: json_dumps_pretty(data), slow_iterations),
+        "decode": await measure(lambda: json_loads(pretty), slow_iterations),
+    }
+    return results
+
+
+async def bench_signal(iterations: int) -> dict[str, Any]:
+    """Time the capture analysis run on every learned code."""
+    ac_payload = {"freq_khz": 38, "duty": 33, "repeat": 1, "raw": AC_FRAME}
+    ac_body = json.dumps(ac_payload).encode()
+    return {
+        "encode_ac_json": await measure(lambda: json.dumps(ac_payload).encode(), iterations),
+        f"encode_ac_{JSON_BACKEND}": await measure(lambda: json_dumps(ac_payload), iterations),
+        "decode_ac_json": await measure(lambda: json.loads(ac_body), iterations),
+        f"decode_ac_{JSON_BACKEND}": await measure(lambda: json_loads(ac_body), iterations),
+        "normalize_nec": await measure(lambda: normalize_timings(NEC_CAPTURE), iterations),
+        "normalize_ac": await measure(lambda: normalize_timings(AC_FRAME), iterations),
+        "detect_repeat_nec": await measure(
+            lambda: detect_repeat_frames(NEC_CAPTURE), iterations
+        ),
+    }
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    """Run the suite for every database size."""
+    results: dict[str, Any] = {}
+    for commands in args.sizes:
+        with tempfile.TemporaryDirectory() as config_dir:
+            hass = await async_create_hass(config_dir)
+            try:
+                print(f"Benchmarking a database of {commands} commands")
+                results[f"commands_{commands}"] = await bench_size(hass, commands, args)
+            finally:
+                await hass.async_stop(force=True)
+
+    results["signal"] = await bench_signal(args.iterations * 10)
+    return {
+        "meta": metadata(
+            suite="ir_database",
+            sizes=args.sizes,
+            iterations=args.iterations,
+            slow_iterations=args.slow_iterations,
+        ),
+        "results": results,
+    }
+
+
+def main() -> int:
+    """Parse arguments and run the suite."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        type=lambda value: [int(item) for item in value.split(",")],
+        default=[1000, 10000, 100000],
+        help="Comma separated database sizes in commands",
+    )
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument(
+        "--slow-iterations",
+        type=int,
+        default=5,
+        help="Iterations for operations that rewrite or reread the whole file",
+    )
+    add_common_arguments(parser)
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    return finish("ir_database", results, args.output, args.baseline, args.threshold)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
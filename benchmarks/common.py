@@ -0,0 +1,172 @@
+"""Shared helpers for the Haptique Extender benchmarks."""
+from __future__ import annotations
+
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# Make `custom_components.haptique_extender` importable from a checkout
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    """Summarize latency samples given in seconds, reported in milliseconds."""
+    if not samples:
+        return {"count": 0}
+
+    ordered = sorted(samples)
+
+    def percentile(fraction: float) -> float:
+        index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+        return ordered[index] * 1000
+
+    return {
+        "count": len(ordered),
+        "min_ms": round(ordered[0] * 1000, 3),
+        "p50_ms": round(percentile(0.50), 3),
+        "p95_ms": round(percentile(0.95), 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+    }
+
+
+async def async_create_hass(config_dir: str):
+    """Create a bare Home Assistant core for driving the integration."""
+    from homeassistant.core import HomeAssistant
+
+    return HomeAssistant(config_dir)
+
+
+async def async_setup_config_entries(hass) -> None:
+    """Load what config entries need to set the integration up for real."""
+    from homeassistant import config_entries, loader
+    from homeassistant.helpers import (
+        area_registry,
+        category_registry,
+        device_registry,
+        entity_registry,
+        floor_registry,
+        issue_registry,
+        label_registry,
+    )
+
+    loader.async_setup(hass)
+    hass.config.skip_pip = True
+    await asyncio.gather(
+        *(
+            registry.async_load(hass)
+            for registry in (
+                area_registry,
+                category_registry,
+                device_registry,
+                entity_registry,
+                floor_registry,
+                issue_registry,
+                label_registry,
+            )
+        )
+    )
+    hass.config_entries = config_entries.ConfigEntries(hass, {})
+    await hass.config_entries.async_initialize()
+    await hass.async_start()
+
+
+def metadata(**extra: Any) -> dict[str, Any]:
+    """Describe the environment a result was produced in."""
+    try:
+        from homeassistant.const import __version__ as ha_version
+    except ImportError:
+        ha_version = None
+
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "homeassistant": ha_version,
+        **extra,
+    }
+
+
+def write_results(name: str, results: dict[str, Any], output: str | None) -> Path:
+    """Write results as JSON and return the path."""
+    path = Path(output) if output else RESULTS_DIR / f"{name}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    return path
+
+
+def compare(
+    results: dict[str, Any], baseline_path: str, threshold: float
+) -> list[str]:
+    """Compare results with a baseline and list the regressions.
+
+    Every `*_ms` and `*_bytes` value may grow by at most `threshold`
+    (a fraction), every `*_per_sec` value may shrink by at most as much.
+    """
+    baseline = json.loads(Path(baseline_path).read_text(encoding="utf-8"))
+    regressions: list[str] = []
+
+    def walk(current: Any, previous: Any, path: str) -> None:
+        if isinstance(current, dict) and isinstance(previous, dict):
+            for key, value in current.items():
+                if key in previous:
+                    walk(value, previous[key], f"{path}.{key}" if path else key)
+            return
+        if not isinstance(current, (int, float)) or not isinstance(previous, (int, float)):
+            return
+        if previous <= 0:
+            return
+        change = (current - previous) / previous
+        if (path.endswith("_ms") or path.endswith("_bytes")) and change > threshold:
+            regressions.append(f"{path}: {previous} -> {current} (+{change:.0%})")
+        elif path.endswith("_per_sec") and change < -threshold:
+            regressions.append(f"{path}: {previous} -> {current} ({change:.0%})")
+
+    walk(results.get("results", {}), baseline.get("results", {}), "")
+    return regressions
+
+
+def finish(
+    name: str,
+    results: dict[str, Any],
+    output: str | None,
+    baseline: str | None,
+    threshold: float,
+) -> int:
+    """Write results, compare with a baseline and return an exit code."""
+    path = write_results(name, results, output)
+    print(f"Results written to {path}")
+
+    if not baseline:
+        return 0
+
+    regressions = compare(results, baseline, threshold)
+    if not regressions:
+        print(f"No regression above {threshold:.0%} against {baseline}")
+        return 0
+
+    print(f"Regressions above {threshold:.0%} against {baseline}:")
+    for regression in regressions:
+        print(f"  {regression}")
+    return 1
+
+
+def add_common_arguments(parser) -> None:
+    """Add the output and baseline arguments shared by all suites."""
+    parser.add_argument("--output", help="Where to write the JSON results")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Allowed relative change before flagging a regression",
+    )
@@ -0,0 +1,230 @@
+"""Local aiohttp server emulating a Haptique Extender hub."""
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+from dataclasses import dataclass, field
+from typing import Any
+
+from aiohttp import web
+
+# A typical NEC frame followed by two repeats of the same frame
+NEC_FRAME = [9000, 4500] + [560, 560, 560, 1690] * 16 + [560]
+NEC_CAPTURE = NEC_FRAME + [40000] + NEC_FRAME + [40000] + NEC_FRAME
+
+
+@dataclass
+class FakeHubConfig:
+    """Behaviour of a fake hub."""
+
+    token: str = "bench-token"
+    mac: str = "AA:BB:CC:DD:EE:FF"
+    hostname: str = "haptique-bench"
+    fw_ver: str = "1.1.2"
+    # Added to every request, in seconds
+    latency: float = 0.005
+    jitter: float = 0.002
+    # Failure injection probabilities, per request
+    timeout_rate: float = 0.0
+    unauthorized_rate: float = 0.0
+    malformed_rate: float = 0.0
+    # How long an injected timeout hangs, in seconds
+    hang_secs: float = 30.0
+    max_saved: int = 50
+
+
+@dataclass
+class FakeHubStats:
+    """Counters kept by a fake hub."""
+
+    requests: dict[str, int] = field(default_factory=dict)
+    bytes_in: int = 0
+    bytes_out: int = 0
+    injected_failures: int = 0
+
+
+class FakeHub:
+    """Emulate the hub REST API on a local port."""
+
+    def __init__(self, config: FakeHubConfig | None = None) -> None:
+        """Initialize the fake hub."""
+        self.config = config or FakeHubConfig()
+        self.stats = FakeHubStats()
+        self.saved: dict[str, dict[str, Any]] = {}
+        self.learning = False
+        self.rssi = -55
+        self._last_ir: dict[str, Any] = {}
+        self._runner: web.AppRunner | None = None
+        self.port = 0
+
+    @property
+    def host(self) -> str:
+        """Return the host string the integration expects."""
+        return f"127.0.0.1:{self.port}"
+
+    def press(self, raw_data: list[int] | None = None, freq_khz: int = 38) -> None:
+        """Simulate a remote button press seen by the IR receiver."""
+        combined = list(raw_data or NEC_CAPTURE)
+        self._last_ir = {
+            "combined": combined,
+            "freq_khz": freq_khz,
+            "frames": 1,
+            "count": len(combined),
+        }
+
+    def clear_last(self) -> None:
+        """Forget the last capture, as after a hub reboot."""
+        self._last_ir = {}
+
+    async def start(self, port: int = 0) -> None:
+        """Start serving on localhost."""
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_get("/api/status", self._status)
+        app.router.add_get("/api/wifi/status", self._wifi_status)
+        app.router.add_get("/api/ir/rxinfo", self._rxinfo)
+        app.router.add_get("/api/ir/saved", self._saved)
+        app.router.add_get("/api/ir/last", self._last)
+        app.router.add_post("/api/ir/send", self._send)
+        app.router.add_post("/api/ir/learn/start", self._learn_start)
+        app.router.add_post("/api/ir/learn/stop", self._learn_stop)
+        app.router.add_post("/api/ir/save", self._save)
+        app.router.add_post("/api/ir/send/name", self._send_name)
+        app.router.add_delete("/api/ir/delete", self._delete)
+        app.router.add_post("/api/ir/clear", self._clear)
+
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler) -> web.StreamResponse:
+        """Apply latency, authentication and failure injection."""
+        config = self.config
+        path = request.path
+        self.stats.requests[path] = self.stats.requests.get(path, 0) + 1
+        self.stats.bytes_in += request.content_length or 0
+
+        delay = config.latency + random.uniform(0, config.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+
+        if config.timeout_rate and random.random() < config.timeout_rate:
+            self.stats.injected_failures += 1
+            await asyncio.sleep(config.hang_secs)
+
+        if config.unauthorized_rate and random.random() < config.unauthorized_rate:
+            self.stats.injected_failures += 1
+            return web.json_response({"error": "unauthorized"}, status=401)
+
+        if request.headers.get("Authorization") != f"Bearer {config.token}":
+            return web.json_response({"error": "unauthorized"}, status=401)
+
+        if config.malformed_rate and random.random() < config.malformed_rate:
+            self.stats.injected_failures += 1
+            return web.Response(text='{"status": ', content_type="application/json")
+
+        response = await handler(request)
+        if isinstance(response, web.Response) and response.body is not None:
+            self.stats.bytes_out += len(response.body)
+        return response
+
+    async def _status(self, request: web.Request) -> web.Response:
+        config = self.config
+        return web.json_response({
+            "hostname": config.hostname,
+            "instance": "Haptique Extender",
+            "mac": config.mac,
+            "fw_ver": config.fw_ver,
+            "ap_on": False,
+            "sta_ok": True,
+            "sta_ssid": "bench",
+            "sta_ip": "127.0.0.1",
+        })
+
+    async def _wifi_status(self, request: web.Request) -> web.Response:
+        return web.json_response({
+            "sta": {"ssid": "bench", "rssi": self.rssi, "ip": "127.0.0.1"},
+            "ap": {"on": False},
+        })
+
+    async def _rxinfo(self, request: web.Request) -> web.Response:
+        return web.json_response({"rx_pin": 23, "learning": self.learning})
+
+    async def _saved(self, request: web.Request) -> web.Response:
+        max_saved = self.config.max_saved
+        return web.json_response({
+            "count": len(self.saved),
+            "max": max_saved,
+            "available": max_saved - len(self.saved),
+            "names": list(self.saved),
+        })
+
+    async def _last(self, request: web.Request) -> web.Response:
+        return web.json_response(self._last_ir)
+
+    async def _send(self, request: web.Request) -> web.Response:
+        payload = json.loads(await request.read())
+        if not payload.get("raw"):
+            return web.json_response({"error": "missing raw"}, status=400)
+        return web.json_response({"status": "sent"})
+
+    async def _learn_start(self, request: web.Request) -> web.Response:
+        self.learning = True
+        return web.json_response({"status": "learning"})
+
+    async def _learn_stop(self, request: web.Request) -> web.Response:
+        self.learning = False
+        return web.json_response({"status": "stopped"})
+
+    async def _save(self, request: web.Request) -> web.Response:
+        payload = json.loads(await request.read())
+        if len(self.saved) >= self.config.max_saved:
+            return web.json_response({"error": "storage full"}, status=507)
+        self.saved[payload["name"]] = dict(self._last_ir)
+        return web.json_response({"status": "saved"})
+
+    async def _send_name(self, request: web.Request) -> web.Response:
+        payload = json.loads(await request.read())
+        if payload.get("name") not in self.saved:
+            return web.json_response({"error": "not found"}, status=404)
+        return web.json_response({"status": "sent"})
+
+    async def _delete(self, request: web.Request) -> web.Response:
+        payload = json.loads(await request.read())
+        if self.saved.pop(payload.get("name"), None) is None:
+            return web.json_response({"error": "not found"}, status=404)
+        return web.json_response({"status": "deleted"})
+
+    async def _clear(self, request: web.Request) -> web.Response:
+        self.saved.clear()
+        return web.json_response({"status": "cleared"})
+
+
+async def _serve(port: int, latency: float) -> None:
+    """Run a fake hub until interrupted."""
+    hub = FakeHub(FakeHubConfig(latency=latency))
+    await hub.start(port)
+    print(f"Fake hub listening on {hub.host} (token: {hub.config.token})")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await hub.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.005)
+    args = parser.parse_args()
+    asyncio.run(_serve(args.port, args.latency))
@@ -0,0 +1,301 @@
+"""Multi-hub scale and soak harness.
+
+Runs 1 to 100 simulated hubs, each with its own coordinator, firmware
+storage helper and periodic learning sessions, while injecting timeouts,
+401 responses and malformed JSON. Samples event-loop lag, memory, task
+counts and request rates over time:
+
+    python benchmarks/soak.py --hubs 1,10,100 --duration 3600
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import timedelta
+from typing import Any
+
+from common import add_common_arguments, async_create_hass, finish, metadata, summarize
+from fake_hub import NEC_CAPTURE, FakeHub, FakeHubConfig
+
+from custom_components.haptique_extender.const import DOMAIN
+from custom_components.haptique_extender.coordinator import HaptiqueCoordinator
+from custom_components.haptique_extender.firmware_storage import FirmwareIRStorage
+from custom_components.haptique_extender.ir_database import IRDatabase
+from custom_components.haptique_extender.learning import LearningSessionManager
+
+INTEGRATION_PATH = "haptique_extender"
+
+
+class LoopLagMonitor:
+    """Measure how late the event loop wakes up a sleeping task."""
+
+    def __init__(self, interval: float = 0.05) -> None:
+        """Initialize the monitor."""
+        self.interval = interval
+        self.samples: list[float] = []
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Start sampling."""
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop sampling."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def drain(self) -> list[float]:
+        """Return and forget the samples taken so far."""
+        samples, self.samples = self.samples, []
+        return samples
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, loop.time() - start - self.interval))
+
+
+def _read_rss_bytes() -> int | None:
+    """Return the resident set size of this process, if available."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as file:
+            pages = int(file.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    import resource
+
+    return pages * resource.getpagesize()
+
+
+def _count_tasks() -> dict[str, int]:
+    """Count running tasks, split by who created them."""
+    counts = {"total": 0, "integration": 0, "learning_tasks": 0}
+    for task in asyncio.all_tasks():
+        counts["total"] += 1
+        coro = task.get_coro()
+        code = getattr(coro, "cr_code", None)
+        if code is None or INTEGRATION_PATH not in code.co_filename:
+            continue
+        counts["integration"] += 1
+        # The shared learning scheduler and its in-flight polls
+        if code.co_filename.endswith("learning.py"):
+            counts["learning_tasks"] += 1
+    return counts
+
+
+async def _hub_activity(
+    hass,
+    hub: FakeHub,
+    coordinator: HaptiqueCoordinator,
+    storage: FirmwareIRStorage,
+    ir_db: IRDatabase,
+    args: argparse.Namespace,
+    stats: dict[str, int],
+) -> None:
+    """Drive one hub like an installation would."""
+    index = 0
+    while True:
+        await asyncio.sleep(random.uniform(0.5, 1.5) * args.activity_interval)
+        index += 1
+        action = random.random()
+
+        if action < 0.6:
+            stats["sends"] += 1
+            if not await coordinator.send_ir_code(NEC_CAPTURE[:67]):
+                stats["send_failures"] += 1
+        elif action < 0.8:
+            stats["storage_calls"] += 1
+            await storage.list_saved_ir()
+        else:
+            stats["learns"] += 1
+            coordinator.start_learning(f"Soak {hub.port}", f"command {index}")
+            if random.random() < 0.7:
+                await asyncio.sleep(random.uniform(0, 2))
+                hub.press(NEC_CAPTURE)
+
+        # What the database sensors do on every state write
+        for device in ir_db.list_devices():
+            ir_db.list_commands(device["name"])
+
+
+async def run_scale(hass, hubs_count: int, args: argparse.Namespace) -> dict[str, Any]:
+    """Run one scale step and return its summary and timeline."""
+    hubs: list[FakeHub] = []
+    coordinators: list[HaptiqueCoordinator] = []
+    activities: list[asyncio.Task] = []
+    unsubs = []
+    stats = {"sends": 0, "send_failures": 0, "storage_calls": 0, "learns": 0}
+    ir_db: IRDatabase = hass.data[DOMAIN]["ir_database"]
+
+    for _ in range(hubs_count):
+        hub = FakeHub(
+            FakeHubConfig(
+                latency=args.latency,
+                jitter=args.latency,
+                timeout_rate=args.timeout_rate,
+                unauthorized_rate=args.unauthorized_rate,
+                malformed_rate=args.malformed_rate,
+                hang_secs=15,
+            )
+        )
+        await hub.start()
+        coordinator = HaptiqueCoordinator(hass, hub.host, hub.config.token)
+        coordinator.update_interval = timedelta(seconds=args.poll_interval)
+        # Scheduled refreshes only run while someone listens
+        unsubs.append(coordinator.async_add_listener(lambda: None))
+        storage = FirmwareIRStorage(hub.host, hub.config.token, coordinator.session)
+        hubs.append(hub)
+        coordinators.append(coordinator)
+        activities.append(
+            asyncio.create_task(
+                _hub_activity(hass, hub, coordinator, storage, ir_db, args, stats)
+            )
+        )
+
+    monitor = LoopLagMonitor()
+    monitor.start()
+    gc.collect()
+    tracemalloc.start()
+    start_memory = tracemalloc.get_traced_memory()[0]
+    start_rss = _read_rss_bytes()
+    start = time.monotonic()
+    previous_requests = sum(sum(hub.stats.requests.values()) for hub in hubs)
+    timeline: list[dict[str, Any]] = []
+    all_lag: list[float] = []
+
+    try:
+        while time.monotonic() - start < args.duration:
+            await asyncio.sleep(args.sample_interval)
+            lag = monitor.drain()
+            all_lag.extend(lag)
+            requests = sum(sum(hub.stats.requests.values()) for hub in hubs)
+            current, peak = tracemalloc.get_traced_memory()
+            sample = {
+                "elapsed_s": round(time.monotonic() - start, 1),
+                "loop_lag": summarize(lag),
+                "traced_memory_bytes": current,
+                "traced_peak_bytes": peak,
+                "rss_bytes": _read_rss_bytes(),
+                "tasks": _count_tasks(),
+                "hubs_learning": sum(1 for c in coordinators if c.learning_mode),
+                "requests_per_sec": round(
+                    (requests - previous_requests) / args.sample_interval, 1
+                ),
+            }
+            previous_requests = requests
+            timeline.append(sample)
+            if args.verbose:
+                print(f"[{hubs_count} hubs] {sample}")
+    finally:
+        for task in activities:
+            task.cancel()
+        await asyncio.gather(*activities, return_exceptions=True)
+        for unsub in unsubs:
+            unsub()
+        for coordinator in coordinators:
+            coordinator.set_learning_mode(False)
+        await monitor.stop()
+        end_memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        for hub in hubs:
+            await hub.stop()
+
+    end_rss = _read_rss_bytes()
+    return {
+        "summary": {
+            "duration_s": round(time.monotonic() - start, 1),
+            "loop_lag": summarize(all_lag),
+            "memory_growth_bytes": end_memory - start_memory,
+            "rss_growth_bytes": (
+                end_rss - start_rss if end_rss is not None and start_rss is not None else None
+            ),
+            "max_tasks": max((s["tasks"]["total"] for s in timeline), default=0),
+            "max_learning_tasks": max(
+                (s["tasks"]["learning_tasks"] for s in timeline), default=0
+            ),
+            "mean_requests_per_sec": round(
+                sum(s["requests_per_sec"] for s in timeline) / max(1, len(timeline)), 1
+            ),
+            "injected_failures": sum(hub.stats.injected_failures for hub in hubs),
+            "unchanged_refreshes": sum(
+                c.metrics.unchanged_refreshes for c in coordinators
+            ),
+            **stats,
+        },
+        "timeline": timeline,
+    }
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    """Run every scale step."""
+    results: dict[str, Any] = {}
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await async_create_hass(config_dir)
+        try:
+            ir_db = IRDatabase(hass)
+            hass.data[DOMAIN] = {
+                "ir_database": ir_db,
+                "learning_sessions": LearningSessionManager(hass),
+            }
+            for hubs_count in args.hubs:
+                print(f"Running {hubs_count} hub(s) for {args.duration}s")
+                results[f"hubs_{hubs_count}"] = await run_scale(hass, hubs_count, args)
+        finally:
+            await hass.async_stop(force=True)
+
+    return {
+        "meta": metadata(
+            suite="soak",
+            hubs=args.hubs,
+            duration=args.duration,
+            poll_interval=args.poll_interval,
+            timeout_rate=args.timeout_rate,
+            unauthorized_rate=args.unauthorized_rate,
+            malformed_rate=args.malformed_rate,
+        ),
+        "results": results,
+    }
+
+
+def main() -> int:
+    """Parse arguments and run the harness."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--hubs",
+        type=lambda value: [int(item) for item in value.split(",")],
+        default=[1, 10],
+        help="Comma separated hub counts to run, e.g. 1,10,100",
+    )
+    parser.add_argument("--duration", type=float, default=300, help="Seconds per scale step")
+    parser.add_argument("--sample-interval", type=float, default=10)
+    parser.add_argument("--poll-interval", type=float, default=30, help="Coordinator poll seconds")
+    parser.add_argument("--activity-interval", type=float, default=20)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--timeout-rate", type=float, default=0.01)
+    parser.add_argument("--unauthorized-rate", type=float, default=0.005)
+    parser.add_argument("--malformed-rate", type=float, default=0.005)
+    parser.add_argument("--verbose", action="store_true")
+    add_common_arguments(parser)
+    args = parser.parse_args()
+
+    if any(count < 1 or count > 100 for count in args.hubs):
+        parser.error("--hubs values must be between 1 and 100")
+
+    results = asyncio.run(run(args))
+    return finish("soak", results, args.output, args.baseline, args.threshold)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,24 +1,44 @@
 """Haptique Extender integration - Simplified with Unified Events."""
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import Any
 
-from homeassistant.config_entries import ConfigEntry
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
 from homeassistant.const import CONF_HOST, CONF_TOKEN, Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, ServiceResponse, SupportsResponse, callback
 from homeassistant.helpers import device_registry as dr
 
-from .const import DOMAIN
+from .const import (
+    CONF_DEVICE_SNAPSHOT,
+    CONF_EVENT_MODE,
+    CONF_MQTT_TOPIC,
+    DEFAULT_BATCH_NAME_PREFIX,
+    DEFAULT_HOLD_TIMEOUT,
+    DEFAULT_LEARNING_TIMEOUT,
+    DEFAULT_SEND_TIMEOUT,
+    DOMAIN,
+    EVENT_MODES,
+    MAX_BATCH_COMMANDS,
+    MAX_HOLD_TIMEOUT,
+)
+from .ac_codes import ACState, build_request, update_state
 from .coordinator import HaptiqueCoordinator
+from .entity import SELECTED_DEVICES, async_select_device
+from .events import EVENT_OPERATION, EventPublisher
 from .firmware_storage import FirmwareIRStorage
 from .ir_database import IRDatabase, InvalidNameError
+from .learning import BatchLearning, LearningSessionManager
+from .timeouts import Deadline
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS: list[Platform] = [
     Platform.SENSOR,
     Platform.BINARY_SENSOR,
+    Platform.REMOTE,
+    Platform.SELECT,
     Platform.SWITCH,
 ]
 
@@ -27,12 +47,13 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Haptique Extender from a config entry."""
     host = entry.data[CONF_HOST]
     token = entry.data.get(CONF_TOKEN, "")
+    snapshot = entry.data.get(CONF_DEVICE_SNAPSHOT)
 
     # Initialize coordinator
     coordinator = HaptiqueCoordinator(hass, host, token)
-    
-    # Initial data fetch
-    await coordinator.async_config_entry_first_refresh()
+    coordinator.apply_options(entry.options)
+    # The coordinator has its own HTTP session; created during setup, it is
+    # detached by Home Assistant when the entry unloads or fails to set up
 
     # Store coordinator
     hass.data.setdefault(DOMAIN, {})
@@ -40,26 +61,75 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     # Initialize IR Database (shared across all entries)
     if "ir_database" not in hass.data[DOMAIN]:
-        ir_db = IRDatabase(hass)
-        await ir_db.async_load()
-        hass.data[DOMAIN]["ir_database"] = ir_db
-        _LOGGER.info("IR Database initialized")
+        hass.data[DOMAIN]["ir_database"] = IRDatabase(hass)
+    ir_db: IRDatabase = hass.data[DOMAIN]["ir_database"]
+
+    # Learning sessions of every hub share one polling scheduler
+    if "learning_sessions" not in hass.data[DOMAIN]:
+        hass.data[DOMAIN]["learning_sessions"] = LearningSessionManager(hass)
+
+    # Events go through one publisher, set to the mode saved in the entries
+    if "events" not in hass.data[DOMAIN]:
+        hass.data[DOMAIN]["events"] = EventPublisher(hass)
+    if CONF_EVENT_MODE in entry.options:
+        hass.data[DOMAIN]["events"].mode = entry.options[CONF_EVENT_MODE]
+
+    try:
+        if snapshot:
+            # Known hub: register entities from the snapshot right away and
+            # fetch live data in the background, even if the hub is offline
+            coordinator.restore_snapshot(snapshot)
+            entry.async_create_background_task(
+                hass, coordinator.async_refresh(), f"{DOMAIN}_first_refresh_{host}"
+            )
+            await ir_db.async_ensure_loaded()
+        else:
+            # First setup: device info is needed, load the database meanwhile
+            await asyncio.gather(
+                ir_db.async_ensure_loaded(),
+                coordinator.async_config_entry_first_refresh(),
+            )
+    except Exception:
+        hass.data[DOMAIN].pop(entry.entry_id)
+        raise
 
     # Initialize Firmware Storage
-    firmware_storage = FirmwareIRStorage(host, token, coordinator.session)
+    firmware_storage = FirmwareIRStorage(
+        host,
+        token,
+        coordinator.session,
+        coordinator.request_trace,
+        coordinator.circuit_breaker,
+        coordinator.request_timeouts,
+        coordinator.request_limiter,
+    )
     hass.data[DOMAIN][f"{entry.entry_id}_firmware"] = firmware_storage
     _LOGGER.info("Firmware Storage initialized")
 
     # Register device
-    device_registry = dr.async_get(hass)
-    device_registry.async_get_or_create(
-        config_entry_id=entry.entry_id,
-        identifiers={(DOMAIN, coordinator.device_info["mac"])},
-        name=coordinator.device_info.get("hostname", "Haptique Extender"),
-        manufacturer="KINCONY",
-        model="KC868-AG",
-        sw_version=coordinator.device_info.get("fw_ver", "unknown"),
-    )
+    _async_register_device(hass, entry, coordinator)
+
+    @callback
+    def _async_update_snapshot() -> None:
+        """Persist device info changes seen by a successful refresh."""
+        device_snapshot = coordinator.device_snapshot
+        if (
+            not coordinator.last_update_success
+            or not device_snapshot["mac"]
+            or device_snapshot == entry.data.get(CONF_DEVICE_SNAPSHOT)
+        ):
+            return
+        hass.config_entries.async_update_entry(
+            entry, data={**entry.data, CONF_DEVICE_SNAPSHOT: device_snapshot}
+        )
+        _async_register_device(hass, entry, coordinator)
+
+    entry.async_on_unload(coordinator.async_add_listener(_async_update_snapshot))
+    _async_update_snapshot()
+    entry.async_on_unload(entry.add_update_listener(_async_options_updated))
+
+    # Hub telemetry over MQTT, HTTP polling covers whatever is not pushed
+    coordinator.configure_telemetry(entry.options.get(CONF_MQTT_TOPIC))
 
     # Setup platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
@@ -72,8 +142,35 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return True
 
 
+async def _async_options_updated(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed options without reloading the entry."""
+    coordinator: HaptiqueCoordinator = hass.data[DOMAIN][entry.entry_id]
+    coordinator.apply_options(entry.options)
+    coordinator.configure_telemetry(entry.options.get(CONF_MQTT_TOPIC))
+    if CONF_EVENT_MODE in entry.options:
+        hass.data[DOMAIN]["events"].mode = entry.options[CONF_EVENT_MODE]
+    _LOGGER.debug("Options of %s applied: %s", coordinator.host, dict(entry.options))
+
+
+@callback
+def _async_register_device(
+    hass: HomeAssistant, entry: ConfigEntry, coordinator: HaptiqueCoordinator
+) -> None:
+    """Register the hub, or update its name and firmware version."""
+    device_registry = dr.async_get(hass)
+    device_registry.async_get_or_create(
+        config_entry_id=entry.entry_id,
+        identifiers={(DOMAIN, coordinator.device_info["mac"])},
+        name=coordinator.device_info.get("hostname", "Haptique Extender"),
+        manufacturer="KINCONY",
+        model="KC868-AG",
+        sw_version=coordinator.device_info.get("fw_ver", "unknown"),
+    )
+
+
 def _register_services(hass: HomeAssistant) -> None:
     """Register all integration services."""
+    events: EventPublisher = hass.data[DOMAIN]["events"]
 
     async def handle_send_ir_code(call):
         """Handle send_ir_code service (raw IR code)."""
@@ -87,28 +184,35 @@ def _register_services(hass: HomeAssistant) -> None:
         freq_khz = call.data.get("freq_khz", 38)
         duty = call.data.get("duty", 33)
         repeat = call.data.get("repeat", 1)
+        deadline = Deadline(call.data.get("timeout", DEFAULT_SEND_TIMEOUT))
         
-        success = await coordinator.send_ir_code(raw_data, freq_khz, duty, repeat)
+        if coordinator.circuit_breaker.is_open:
+            _fire_hub_unavailable(hass, coordinator, "send", None, None)
+            return
+        
+        success = await coordinator.send_ir_code(
+            raw_data, freq_khz, duty, repeat, deadline=deadline
+        )
         
         if not success:
             _LOGGER.error("Failed to send IR code")
 
     async def handle_learn_ir_command(call):
         """Handle learn_ir_command service."""
-        coordinator = _get_any_coordinator(hass)
+        coordinator = _get_coordinator(hass, call.data.get("hub"))
         if not coordinator:
             _LOGGER.error("No coordinator available")
             return
         
         device_name = call.data.get("device_name", "").strip()
         command_name = call.data.get("command_name", "").strip()
-        timeout = call.data.get("timeout", 30)
+        timeout = call.data.get("timeout", DEFAULT_LEARNING_TIMEOUT)
 
         # Validation: device_name and command_name must not be empty
         if not device_name:
             _LOGGER.error("device_name cannot be empty")
-            hass.bus.async_fire(
-                "haptique_operation",
+            events.fire(
+                EVENT_OPERATION,
                 {
                     "operation": "learn",
                     "status": "error",
@@ -120,8 +224,8 @@ def _register_services(hass: HomeAssistant) -> None:
         
         if not command_name:
             _LOGGER.error("command_name cannot be empty")
-            hass.bus.async_fire(
-                "haptique_operation",
+            events.fire(
+                EVENT_OPERATION,
                 {
                     "operation": "learn",
                     "status": "error",
@@ -141,8 +245,8 @@ def _register_services(hass: HomeAssistant) -> None:
             command_name = validate_name(command_name)
         except InvalidNameError as err:
             _LOGGER.error("Invalid name: %s", err)
-            hass.bus.async_fire(
-                "haptique_operation",
+            events.fire(
+                EVENT_OPERATION,
                 {
                     "operation": "learn",
                     "status": "error",
@@ -154,30 +258,170 @@ def _register_services(hass: HomeAssistant) -> None:
             )
             return
 
-        await ir_db.add_device(device_name)
+        if coordinator.circuit_breaker.is_open:
+            _fire_hub_unavailable(hass, coordinator, "learn", device_name, command_name)
+            return
+
+        session = coordinator.start_learning(
+            device_name, command_name, timeout, call.data.get("session_id")
+        )
+        if not session:
+            _LOGGER.error("Hub %s is already learning", coordinator.host)
+            events.fire(
+                EVENT_OPERATION,
+                {
+                    "operation": "learn",
+                    "status": "error",
+                    "entity_type": "command",
+                    "device_name": device_name,
+                    "command_name": command_name,
+                    "error": "Hub is already learning",
+                    "data": {"hub": coordinator.host},
+                }
+            )
+            return
         
-        coordinator.set_learning_context(device_name, command_name)
-        coordinator.set_learning_mode(True)
+        await ir_db.add_device(device_name)
         
         _LOGGER.info(
-            "Learning mode activated for device '%s', command '%s'",
+            "Learning session %s started for device '%s', command '%s'",
+            session.session_id,
             device_name,
             command_name,
         )
         
         # Fire unified event - STARTED
-        hass.bus.async_fire(
-            "haptique_operation",
+        events.fire(
+            EVENT_OPERATION,
             {
                 "operation": "learn",
                 "status": "started",
                 "entity_type": "command",
                 "device_name": device_name,
                 "command_name": command_name,
-                "data": {"timeout": timeout}
+                "data": {"timeout": timeout, **session.event_data()}
+            }
+        )
+
+    async def handle_learn_ir_batch(call):
+        """Handle learn_ir_batch service - Learn a whole remote in one session."""
+        coordinator = _get_coordinator(hass, call.data.get("hub"))
+        if not coordinator:
+            _LOGGER.error("No coordinator available")
+            return
+        
+        device_name = call.data.get("device_name", "")
+        
+        try:
+            from .ir_database import validate_name
+            device_name = validate_name(device_name)
+            command_names = [validate_name(name) for name in _as_list(call.data.get("command_names"))]
+            name_prefix = validate_name(call.data.get("name_prefix", DEFAULT_BATCH_NAME_PREFIX))
+        except InvalidNameError as err:
+            _LOGGER.error("Invalid name: %s", err)
+            events.fire(
+                EVENT_OPERATION,
+                {
+                    "operation": "learn_batch",
+                    "status": "error",
+                    "entity_type": "device",
+                    "device_name": device_name,
+                    "error": str(err)
+                }
+            )
+            return
+        
+        # Names given twice would overwrite each other
+        command_names = list(dict.fromkeys(command_names))
+        count = min(len(command_names) or call.data.get("count", 10), MAX_BATCH_COMMANDS)
+        
+        if coordinator.circuit_breaker.is_open:
+            _fire_hub_unavailable(hass, coordinator, "learn_batch", device_name, None)
+            return
+        
+        batch = BatchLearning(command_names[:count], count, name_prefix)
+        timeout = call.data.get("timeout", DEFAULT_LEARNING_TIMEOUT)
+        session = coordinator.start_learning(
+            device_name, None, timeout, call.data.get("session_id"), batch
+        )
+        if not session:
+            _LOGGER.error("Hub %s is already learning", coordinator.host)
+            events.fire(
+                EVENT_OPERATION,
+                {
+                    "operation": "learn_batch",
+                    "status": "error",
+                    "entity_type": "device",
+                    "device_name": device_name,
+                    "error": "Hub is already learning",
+                    "data": {"hub": coordinator.host},
+                }
+            )
+            return
+        
+        _LOGGER.info(
+            "Batch learning %s started for %d command(s) of device '%s'",
+            session.session_id,
+            count,
+            device_name,
+        )
+        
+        # Fire unified event - STARTED
+        events.fire(
+            EVENT_OPERATION,
+            {
+                "operation": "learn_batch",
+                "status": "started",
+                "entity_type": "device",
+                "device_name": device_name,
+                "data": {
+                    **session.event_data(),
+                    "timeout": timeout,
+                    "count": count,
+                    "next_command_name": batch.next_name,
+                },
             }
         )
 
+    async def handle_get_event_payload(call) -> ServiceResponse:
+        """Handle get_event_payload service - Fetch the payload of a slim event."""
+        ref = call.data.get("ref", "")
+        payload = events.get_payload(ref)
+        if payload is None:
+            return {"ref": ref, "error": "Payload not found or expired"}
+        return {"ref": ref, **payload}
+
+    async def handle_set_event_mode(call):
+        """Handle set_event_mode service - Choose full or slim events."""
+        mode = call.data.get("mode")
+        if mode not in EVENT_MODES:
+            _LOGGER.error("Invalid event mode: %s", mode)
+            return
+        
+        events.mode = mode
+        events.async_flush()
+        _LOGGER.info("Events now fired in %s mode", mode)
+        
+        # Every entry keeps the mode so it survives restarts
+        for entry in hass.config_entries.async_entries(DOMAIN):
+            hass.config_entries.async_update_entry(
+                entry, options={**entry.options, CONF_EVENT_MODE: mode}
+            )
+
+    async def handle_cancel_learning(call):
+        """Handle cancel_learning service - Stop learning sessions."""
+        hub = None
+        if call.data.get("hub"):
+            coordinator = _get_coordinator(hass, call.data["hub"])
+            if not coordinator:
+                _LOGGER.error("Unknown hub %s", call.data["hub"])
+                return
+            hub = coordinator.host
+        
+        manager: LearningSessionManager = hass.data[DOMAIN]["learning_sessions"]
+        cancelled = manager.cancel(hub, call.data.get("session_id"))
+        _LOGGER.info("%d learning session(s) cancelled", len(cancelled))
+
     async def handle_send_ir_command(call):
         """Handle send_ir_command service (from database)."""
         coordinator = _get_any_coordinator(hass)
@@ -187,6 +431,11 @@ def _register_services(hass: HomeAssistant) -> None:
         
         device_name = call.data.get("device_name")
         command_name = call.data.get("command_name")
+        deadline = Deadline(call.data.get("timeout", DEFAULT_SEND_TIMEOUT))
+        
+        if coordinator.circuit_breaker.is_open:
+            _fire_hub_unavailable(hass, coordinator, "send", device_name, command_name)
+            return
         
         ir_db: IRDatabase = hass.data[DOMAIN]["ir_database"]
         
@@ -199,8 +448,8 @@ def _register_services(hass: HomeAssistant) -> None:
             )
             
             # Fire unified event - ERROR (not found)
-            hass.bus.async_fire(
-                "haptique_operation",
+            events.fire(
+                EVENT_OPERATION,
                 {
                     "operation": "send",
                     "status": "error",
@@ -208,7 +457,8 @@ def _register_services(hass: HomeAssistant) -> None:
                     "device_name": device_name,
                     "command_name": command_name,
                     "error": "Command not found in database"
-                }
+                },
+                coalesce=True,
             )
             return
         
@@ -217,28 +467,30 @@ def _register_services(hass: HomeAssistant) -> None:
             command["freq_khz"],
             command["duty"],
             command["repeat"],
+            deadline=deadline,
         )
         
         if success:
             _LOGGER.info("Command '%s' sent to device '%s'", command_name, device_name)
             
             # Fire unified event - SUCCESS
-            hass.bus.async_fire(
-                "haptique_operation",
+            events.fire(
+                EVENT_OPERATION,
                 {
                     "operation": "send",
                     "status": "success",
                     "entity_type": "command",
                     "device_name": device_name,
                     "command_name": command_name,
-                }
+                },
+                coalesce=True,
             )
         else:
             _LOGGER.error("Failed to send command '%s' to device '%s'", command_name, device_name)
             
             # Fire unified event - ERROR
-            hass.bus.async_fire(
-                "haptique_operation",
+            events.fire(
+                EVENT_OPERATION,
                 {
                     "operation": "send",
                     "status": "error",
@@ -246,8 +498,149 @@ def _register_services(hass: HomeAssistant) -> None:
                     "device_name": device_name,
                     "command_name": command_name,
                     "error": "Failed to send IR code"
+                },
+                coalesce=True,
+            )
+
+    async def handle_hold_ir_command(call):
+        """Handle hold_ir_command service - Repeat a command while held."""
+        coordinator = _get_coordinator(hass, call.data.get("hub"))
+        if not coordinator:
+            _LOGGER.error("No coordinator available")
+            return
+        
+        device_name = call.data.get("device_name")
+        command_name = call.data.get("command_name")
+        hold_secs = min(call.data.get("hold_secs", DEFAULT_HOLD_TIMEOUT), MAX_HOLD_TIMEOUT)
+        
+        if coordinator.circuit_breaker.is_open:
+            _fire_hub_unavailable(hass, coordinator, "hold", device_name, command_name)
+            return
+        
+        ir_db: IRDatabase = hass.data[DOMAIN]["ir_database"]
+        
+        command = ir_db.get_command(device_name, command_name)
+        if not command:
+            _LOGGER.error(
+                "Command '%s' not found for device '%s'",
+                command_name,
+                device_name,
+            )
+            
+            # Fire unified event - ERROR (not found)
+            events.fire(
+                EVENT_OPERATION,
+                {
+                    "operation": "hold",
+                    "status": "error",
+                    "entity_type": "command",
+                    "device_name": device_name,
+                    "command_name": command_name,
+                    "error": "Command not found in database"
                 }
             )
+            return
+        
+        session = coordinator.start_hold(
+            command, hold_secs, call.data.get("session_id"), device_name, command_name
+        )
+        _LOGGER.info(
+            "Holding '%s' of '%s' on %s for up to %ss (session %s)",
+            command_name,
+            device_name,
+            coordinator.host,
+            hold_secs,
+            session.session_id,
+        )
+
+    async def handle_set_ac_state(call):
+        """Handle set_ac_state service - Send a generated air conditioner state."""
+        coordinator = _get_coordinator(hass, call.data.get("hub"))
+        if not coordinator:
+            _LOGGER.error("No coordinator available")
+            return
+        
+        device_name = call.data.get("device_name")
+        ir_db: IRDatabase = hass.data[DOMAIN]["ir_database"]
+        
+        # Unchanged values are those last sent to this AC
+        descriptor = ir_db.get_ac(device_name) or {}
+        protocol = call.data.get("protocol") or descriptor.get("protocol")
+        state = ACState()
+        if descriptor and descriptor["protocol"] == protocol:
+            state = ACState(**descriptor["state"])
+        
+        try:
+            if not protocol:
+                raise ValueError("No AC protocol set for this device")
+            state = update_state(
+                protocol,
+                state,
+                hvac_mode=call.data.get("hvac_mode"),
+                temperature=call.data.get("temperature"),
+                fan_mode=call.data.get("fan_mode"),
+                swing_mode=call.data.get("swing_mode"),
+            )
+        except ValueError as err:
+            _LOGGER.error("Cannot set AC state of '%s': %s", device_name, err)
+            events.fire(
+                EVENT_OPERATION,
+                {
+                    "operation": "ac",
+                    "status": "error",
+                    "entity_type": "device",
+                    "device_name": device_name,
+                    "error": str(err),
+                },
+            )
+            return
+        
+        if coordinator.circuit_breaker.is_open:
+            _fire_hub_unavailable(hass, coordinator, "ac", device_name, None)
+            return
+        
+        success = await coordinator.async_send_prepared(
+            build_request(protocol, state),
+            Deadline(call.data.get("timeout", DEFAULT_SEND_TIMEOUT)),
+        )
+        if success:
+            await ir_db.set_ac(device_name, protocol, state.as_dict())
+            _LOGGER.info("AC state of '%s' sent: %s", device_name, state)
+        
+        # Slider drags send many setpoints; in slim mode they are coalesced
+        # into one event carrying the state last sent
+        event = {
+            "operation": "ac",
+            "status": "success" if success else "error",
+            "entity_type": "device",
+            "device_name": device_name,
+            "data": {"protocol": protocol, **state.as_dict()},
+        }
+        if not success:
+            event["error"] = "Failed to send IR code"
+        events.fire(EVENT_OPERATION, event, coalesce=True)
+
+    async def handle_release_ir_command(call):
+        """Handle release_ir_command service - Stop held commands."""
+        if call.data.get("hub"):
+            coordinator = _get_coordinator(hass, call.data["hub"])
+            if not coordinator:
+                _LOGGER.error("Unknown hub %s", call.data["hub"])
+                return
+            coordinators = [coordinator]
+        else:
+            coordinators = [
+                coordinator
+                for coordinator in hass.data[DOMAIN].values()
+                if isinstance(coordinator, HaptiqueCoordinator)
+            ]
+        
+        released = [
+            session
+            for coordinator in coordinators
+            if (session := coordinator.release_hold(call.data.get("session_id")))
+        ]
+        _LOGGER.info("%d held command(s) released", len(released))
 
     async def handle_delete_ir_command(call):
         """Handle delete_ir_command service."""
@@ -261,22 +654,23 @@ def _register_services(hass: HomeAssistant) -> None:
             _LOGGER.info("Command '%s' deleted from device '%s'", command_name, device_name)
             
             # Fire unified event - SUCCESS
-            hass.bus.async_fire(
-                "haptique_operation",
+            events.fire(
+                EVENT_OPERATION,
                 {
                     "operation": "delete",
                     "status": "success",
                     "entity_type": "command",
                     "device_name": device_name,
                     "command_name": command_name,
-                }
+                },
+                coalesce=True,
             )
         else:
             _LOGGER.error("Failed to delete command '%s' from device '%s'", command_name, device_name)
             
             # Fire unified event - ERROR
-            hass.bus.async_fire(
-                "haptique_operation",
+            events.fire(
+                EVENT_OPERATION,
                 {
                     "operation": "delete",
                     "status": "error",
@@ -284,7 +678,8 @@ def _register_services(hass: HomeAssistant) -> None:
                     "device_name": device_name,
                     "command_name": command_name,
                     "error": "Command not found or delete failed"
-                }
+                },
+                coalesce=True,
             )
 
     async def handle_delete_ir_device(call):
@@ -298,52 +693,38 @@ def _register_services(hass: HomeAssistant) -> None:
             _LOGGER.info("Device '%s' deleted", device_name)
             
             # Fire unified event - SUCCESS
-            hass.bus.async_fire(
-                "haptique_operation",
+            events.fire(
+                EVENT_OPERATION,
                 {
                     "operation": "delete",
                     "status": "success",
                     "entity_type": "device",
                     "device_name": device_name,
-                }
+                },
+                coalesce=True,
             )
         else:
             _LOGGER.error("Failed to delete device '%s'", device_name)
             
             # Fire unified event - ERROR
-            hass.bus.async_fire(
-                "haptique_operation",
+            events.fire(
+                EVENT_OPERATION,
                 {
                     "operation": "delete",
                     "status": "error",
                     "entity_type": "device",
                     "device_name": device_name,
                     "error": "Device not found or delete failed"
-                }
+                },
+                coalesce=True,
             )
 
     async def handle_set_commands_device(call):
-        """Handle set_commands_device service (to update commands sensor)."""
+        """Handle set_commands_device service (select a device on every hub)."""
         device_name = call.data.get("device_name")
         
-        # Find the commands sensor and update it
-        from homeassistant.helpers import entity_registry as er
-        ent_reg = er.async_get(hass)
-        
-        # Find the commands sensor entity
-        for entity_entry in ent_reg.entities.values():
-            if entity_entry.domain == "sensor" and "ir_commands" in entity_entry.unique_id:
-                # Get the actual entity object from the state machine
-                entity_id = entity_entry.entity_id
-                
-                # Access the entity through the component
-                component = hass.data.get("entity_components", {}).get("sensor")
-                if component:
-                    entity_obj = component.get_entity(entity_id)
-                    if entity_obj and hasattr(entity_obj, "set_device"):
-                        entity_obj.set_device(device_name)
-                        _LOGGER.info("Commands sensor updated for device: %s", device_name)
-                        break
+        if async_select_device(hass, device_name):
+            _LOGGER.info("Device selected for commands: %s", device_name)
     
     async def handle_list_device_commands(call):
         """Handle list_device_commands service - List commands for a specific device."""
@@ -360,9 +741,9 @@ def _register_services(hass: HomeAssistant) -> None:
                 [c["name"] for c in commands]
             )
             
-            # Fire unified event - SUCCESS
-            hass.bus.async_fire(
-                "haptique_operation",
+            # Fire unified event - SUCCESS, the list itself may go by reference
+            events.fire(
+                EVENT_OPERATION,
                 {
                     "operation": "list_commands",
                     "status": "success",
@@ -370,16 +751,17 @@ def _register_services(hass: HomeAssistant) -> None:
                     "device_name": device_name,
                     "data": {
                         "command_count": len(commands),
-                        "commands": commands
+                        "command_names": [c["name"] for c in commands],
                     }
-                }
+                },
+                {"commands": commands},
             )
         else:
             _LOGGER.warning("No commands found for device '%s'", device_name)
             
             # Fire unified event - ERROR (no commands)
-            hass.bus.async_fire(
-                "haptique_operation",
+            events.fire(
+                EVENT_OPERATION,
                 {
                     "operation": "list_commands",
                     "status": "error",
@@ -389,25 +771,216 @@ def _register_services(hass: HomeAssistant) -> None:
                 }
             )
 
+    async def handle_optimize_ir_database(call):
+        """Handle optimize_ir_database service - Normalize and trim codes."""
+        ir_db: IRDatabase = hass.data[DOMAIN]["ir_database"]
+        
+        stats = await ir_db.optimize(
+            normalize=call.data.get("normalize", True),
+            trim_repeats=call.data.get("trim_repeats", True),
+        )
+        
+        # Fire unified event - SUCCESS
+        events.fire(
+            EVENT_OPERATION,
+            {
+                "operation": "optimize",
+                "status": "success",
+                "entity_type": "database",
+                "data": stats,
+            }
+        )
+
+    async def handle_delete_ir_commands(call):
+        """Handle delete_ir_commands service - Delete many commands at once."""
+        device_name = call.data.get("device_name")
+        command_names = _as_list(call.data.get("command_names"))
+        ir_db: IRDatabase = hass.data[DOMAIN]["ir_database"]
+        
+        result = await ir_db.delete_commands(device_name, command_names)
+        _fire_bulk_result(
+            hass, "delete", "command", device_name, result, "Device not found"
+        )
+
+    async def handle_rename_ir_device(call):
+        """Handle rename_ir_device service - Rename or merge a device."""
+        device_name = call.data.get("device_name")
+        ir_db: IRDatabase = hass.data[DOMAIN]["ir_database"]
+        
+        result = await ir_db.rename_device(
+            device_name, call.data.get("new_name"), call.data.get("merge", False)
+        )
+        _fire_bulk_result(
+            hass,
+            "rename",
+            "device",
+            device_name,
+            result,
+            "Device not found, invalid name or target exists without merge",
+        )
+
+    async def handle_copy_ir_device(call):
+        """Handle copy_ir_device service - Copy a device's commands."""
+        device_name = call.data.get("device_name")
+        ir_db: IRDatabase = hass.data[DOMAIN]["ir_database"]
+        
+        result = await ir_db.copy_device(
+            device_name, call.data.get("new_name"), call.data.get("merge", False)
+        )
+        _fire_bulk_result(
+            hass,
+            "copy",
+            "device",
+            device_name,
+            result,
+            "Device not found, invalid name or target exists without merge",
+        )
+
+    async def handle_retag_ir_commands(call):
+        """Handle retag_ir_commands service - Add or remove command tags."""
+        device_name = call.data.get("device_name")
+        ir_db: IRDatabase = hass.data[DOMAIN]["ir_database"]
+        
+        changed = await ir_db.retag_commands(
+            device_name,
+            _as_list(call.data.get("command_names")),
+            _as_list(call.data.get("add_tags")),
+            _as_list(call.data.get("remove_tags")),
+        )
+        _fire_bulk_result(
+            hass,
+            "retag",
+            "command",
+            device_name,
+            None if changed is None else {"changed": changed},
+            "Device not found or invalid tag",
+        )
+
     # Register all services
     hass.services.async_register(DOMAIN, "send_ir_code", handle_send_ir_code)
     hass.services.async_register(DOMAIN, "learn_ir_command", handle_learn_ir_command)
     hass.services.async_register(DOMAIN, "send_ir_command", handle_send_ir_command)
+    hass.services.async_register(DOMAIN, "hold_ir_command", handle_hold_ir_command)
+    hass.services.async_register(DOMAIN, "release_ir_command", handle_release_ir_command)
+    hass.services.async_register(DOMAIN, "set_ac_state", handle_set_ac_state)
     hass.services.async_register(DOMAIN, "delete_ir_command", handle_delete_ir_command)
     hass.services.async_register(DOMAIN, "delete_ir_device", handle_delete_ir_device)
     hass.services.async_register(DOMAIN, "set_commands_device", handle_set_commands_device)
     hass.services.async_register(DOMAIN, "list_device_commands", handle_list_device_commands)
+    hass.services.async_register(DOMAIN, "optimize_ir_database", handle_optimize_ir_database)
+    hass.services.async_register(DOMAIN, "delete_ir_commands", handle_delete_ir_commands)
+    hass.services.async_register(DOMAIN, "rename_ir_device", handle_rename_ir_device)
+    hass.services.async_register(DOMAIN, "copy_ir_device", handle_copy_ir_device)
+    hass.services.async_register(DOMAIN, "retag_ir_commands", handle_retag_ir_commands)
+    hass.services.async_register(DOMAIN, "cancel_learning", handle_cancel_learning)
+    hass.services.async_register(DOMAIN, "learn_ir_batch", handle_learn_ir_batch)
+    hass.services.async_register(
+        DOMAIN,
+        "get_event_payload",
+        handle_get_event_payload,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(DOMAIN, "set_event_mode", handle_set_event_mode)
+
+
+def _as_list(value: Any) -> list[str]:
+    """Accept a list or a comma-separated string from a service call."""
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(",")
+    return [str(item).strip() for item in value if str(item).strip()]
+
+
+def _fire_bulk_result(
+    hass: HomeAssistant,
+    operation: str,
+    entity_type: str,
+    device_name: str | None,
+    result: dict[str, Any] | None,
+    error: str,
+) -> None:
+    """Fire the single summary event of a bulk database operation.
+
+    Not coalesced: each call already fires one event, with its own counts.
+    """
+    events: EventPublisher = hass.data[DOMAIN]["events"]
+    if result is None:
+        _LOGGER.error("Bulk %s failed for device '%s': %s", operation, device_name, error)
+        events.fire(
+            EVENT_OPERATION,
+            {
+                "operation": operation,
+                "status": "error",
+                "entity_type": entity_type,
+                "device_name": device_name,
+                "error": error,
+            },
+        )
+        return
+    
+    events.fire(
+        EVENT_OPERATION,
+        {
+            "operation": operation,
+            "status": "success",
+            "entity_type": entity_type,
+            "device_name": device_name,
+            "data": result,
+        },
+    )
 
 
 def _get_any_coordinator(hass: HomeAssistant) -> HaptiqueCoordinator | None:
-    """Get any available coordinator."""
-    for entry_id in hass.data[DOMAIN]:
-        if entry_id not in ["ir_database"]:
-            if not entry_id.endswith("_firmware"):
-                coordinator = hass.data[DOMAIN].get(entry_id)
-                if coordinator:
-                    return coordinator
-    return None
+    """Get any available coordinator, preferring reachable hubs."""
+    fallback = None
+    for coordinator in hass.data[DOMAIN].values():
+        if isinstance(coordinator, HaptiqueCoordinator):
+            if not coordinator.circuit_breaker.is_open:
+                return coordinator
+            fallback = fallback or coordinator
+    return fallback
+
+
+def _get_coordinator(hass: HomeAssistant, entry_id: str | None) -> HaptiqueCoordinator | None:
+    """Get the coordinator of a hub config entry, or any one without an entry."""
+    if not entry_id:
+        return _get_any_coordinator(hass)
+    coordinator = hass.data[DOMAIN].get(entry_id)
+    return coordinator if isinstance(coordinator, HaptiqueCoordinator) else None
+
+
+def _fire_hub_unavailable(
+    hass: HomeAssistant,
+    coordinator: HaptiqueCoordinator,
+    operation: str,
+    device_name: str | None,
+    command_name: str | None,
+) -> None:
+    """Fire an error event for a hub rejected by its circuit breaker.
+
+    Coalesced, every send of a burst is rejected while the circuit is open.
+    """
+    _LOGGER.error(
+        "Hub %s unavailable, retrying in %.0fs",
+        coordinator.host,
+        coordinator.circuit_breaker.retry_in,
+    )
+    events: EventPublisher = hass.data[DOMAIN]["events"]
+    events.fire(
+        EVENT_OPERATION,
+        {
+            "operation": operation,
+            "status": "error",
+            "entity_type": "command",
+            "device_name": device_name,
+            "command_name": command_name,
+            "error": "Hub unavailable",
+            "error_code": "unavailable",
+            "data": {"retry_in": round(coordinator.circuit_breaker.retry_in)},
+        },
+        coalesce=True,
+    )
 
 
 def _get_any_firmware_storage(hass: HomeAssistant) -> FirmwareIRStorage | None:
@@ -431,7 +1004,12 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     # Unload platforms
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator: HaptiqueCoordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        hass.data[DOMAIN]["learning_sessions"].cancel(coordinator.host)
+        coordinator.release_hold()
+        coordinator.configure_telemetry(None)
+        
+        hass.data[DOMAIN].get(SELECTED_DEVICES, {}).pop(entry.entry_id, None)
         
         # Remove firmware storage
         firmware_key = f"{entry.entry_id}_firmware"
@@ -442,7 +1020,7 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     loaded_entries = [
         entry
         for entry in hass.config_entries.async_entries(DOMAIN)
-        if entry.state == ConfigEntry.State.LOADED
+        if entry.state is ConfigEntryState.LOADED
     ]
     
     if len(loaded_entries) == 1:
@@ -455,10 +1033,25 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             "delete_ir_device",
             "set_commands_device",
             "list_device_commands",
+            "optimize_ir_database",
+            "delete_ir_commands",
+            "rename_ir_device",
+            "copy_ir_device",
+            "retag_ir_commands",
+            "cancel_learning",
+            "learn_ir_batch",
+            "get_event_payload",
+            "set_event_mode",
+            "hold_ir_command",
+            "release_ir_command",
+            "set_ac_state",
         ]
         
         for service_name in services_to_remove:
             if hass.services.has_service(DOMAIN, service_name):
                 hass.services.async_remove(DOMAIN, service_name)
+        
+        # Deliver the summaries still being coalesced
+        hass.data[DOMAIN]["events"].async_flush()
 
     return unload_ok
@@ -0,0 +1,201 @@
+"""Air conditioner IR code generation for Haptique Extender."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, replace
+from functools import lru_cache
+from typing import Any
+
+from .codec import json_dumps
+from .const import AC_FRAME_CACHE_SIZE
+from .ir_signal import DEFAULT_REPEAT_GAP_US
+
+# Mode names follow the climate entity HVAC modes
+AC_MODE_OFF = "off"
+AC_MODES = ("off", "auto", "cool", "dry", "fan_only", "heat")
+AC_FAN_MODES = ("auto", "low", "medium", "high")
+AC_SWING_MODES = ("off", "on")
+
+
+@dataclass(frozen=True, slots=True)
+class ACState:
+    """Everything an air conditioner remote sends in each frame."""
+
+    hvac_mode: str = "cool"
+    temperature: int = 24
+    fan_mode: str = "auto"
+    swing_mode: str = "off"
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state as stored in the IR database."""
+        return asdict(self)
+
+
+@dataclass(frozen=True, slots=True)
+class ACProtocol:
+    """How the remotes of an air conditioner family encode a state."""
+
+    name: str
+    min_temp: int
+    max_temp: int
+    swing: bool
+    encode: Callable[[ACState], list[int]]
+    freq_khz: int = 38
+
+
+def _pulses(
+    value: int, bits: int, mark: int, one: int, zero: int, msb_first: bool
+) -> list[int]:
+    """Return the mark/space pairs of the bits of a value."""
+    order = range(bits - 1, -1, -1) if msb_first else range(bits)
+    raw: list[int] = []
+    for bit in order:
+        raw += (mark, one if value >> bit & 1 else zero)
+    return raw
+
+
+# Coolix: Midea, Beko, Toshiba and many OEM units. Three bytes, each
+# followed by its inverse, sent twice; off is a code of its own
+COOLIX_HDR_MARK = 4692
+COOLIX_HDR_SPACE = 4416
+COOLIX_BIT_MARK = 552
+COOLIX_ONE_SPACE = 1656
+COOLIX_ZERO_SPACE = 552
+COOLIX_GAP = 5244
+COOLIX_OFF = 0xB27BE0
+COOLIX_MODES = {"cool": 0b00, "dry": 0b01, "auto": 0b10, "heat": 0b11, "fan_only": 0b01}
+COOLIX_FANS = {"auto": 0b101, "low": 0b100, "medium": 0b010, "high": 0b001}
+COOLIX_FAN_AUTO0 = 0b000
+COOLIX_FAN_ONLY_TEMP = 0b1110
+# Gray-like temperature codes from 17 to 30 C
+COOLIX_TEMPS = (0, 1, 3, 2, 6, 7, 5, 4, 12, 13, 9, 8, 10, 11)
+
+
+def _encode_coolix(state: ACState) -> list[int]:
+    """Return the raw frames of a Coolix state."""
+    if state.hvac_mode == AC_MODE_OFF:
+        code = COOLIX_OFF
+    else:
+        fan = COOLIX_FANS[state.fan_mode]
+        temp = COOLIX_TEMPS[state.temperature - 17]
+        if state.hvac_mode in ("auto", "dry"):
+            # These modes pick the fan speed themselves
+            fan = COOLIX_FAN_AUTO0
+        if state.hvac_mode == "fan_only":
+            temp = COOLIX_FAN_ONLY_TEMP
+        # The remote temperature sensor bits are left unset
+        code = 0xB2 << 16 | (fan << 5 | 0x1F) << 8 | temp << 4 | COOLIX_MODES[state.hvac_mode] << 2
+
+    frame = [COOLIX_HDR_MARK, COOLIX_HDR_SPACE]
+    for shift in (16, 8, 0):
+        byte = code >> shift & 0xFF
+        for value in (byte, byte ^ 0xFF):
+            frame += _pulses(
+                value, 8, COOLIX_BIT_MARK, COOLIX_ONE_SPACE, COOLIX_ZERO_SPACE, msb_first=True
+            )
+    frame += (COOLIX_BIT_MARK, COOLIX_GAP)
+    return frame + frame[:-1] + [DEFAULT_REPEAT_GAP_US]
+
+
+# Gree YAW1F and compatible remotes: eight bytes in two blocks, LSB first,
+# a 4-bit checksum in the last byte
+GREE_HDR_MARK = 9000
+GREE_HDR_SPACE = 4500
+GREE_BIT_MARK = 620
+GREE_ONE_SPACE = 1600
+GREE_ZERO_SPACE = 540
+GREE_MSG_SPACE = 19980
+GREE_BLOCK_FOOTER = 0b010
+GREE_MODES = {"off": 0, "auto": 0, "cool": 1, "dry": 2, "fan_only": 3, "heat": 4}
+GREE_FANS = {"auto": 0, "low": 1, "medium": 2, "high": 3}
+
+
+def _encode_gree(state: ACState) -> list[int]:
+    """Return the raw frame of a Gree state."""
+    # Light and model bits, then fixed bytes
+    state_bytes = [0, 0, 0x60, 0x50, 0, 0x20, 0, 0]
+    state_bytes[0] = GREE_MODES[state.hvac_mode] | GREE_FANS[state.fan_mode] << 4
+    if state.hvac_mode != AC_MODE_OFF:
+        state_bytes[0] |= 0x08
+    if state.swing_mode == "on":
+        state_bytes[0] |= 0x40
+        state_bytes[4] = 0x01
+    state_bytes[1] = state.temperature - 16
+
+    checksum = 10 + sum(byte & 0x0F for byte in state_bytes[:4])
+    checksum += sum(byte >> 4 for byte in state_bytes[4:7])
+    state_bytes[7] |= (checksum & 0x0F) << 4
+
+    def block(data: list[int]) -> list[int]:
+        raw: list[int] = []
+        for byte in data:
+            raw += _pulses(
+                byte, 8, GREE_BIT_MARK, GREE_ONE_SPACE, GREE_ZERO_SPACE, msb_first=False
+            )
+        return raw
+
+    return [
+        GREE_HDR_MARK,
+        GREE_HDR_SPACE,
+        *block(state_bytes[:4]),
+        *_pulses(
+            GREE_BLOCK_FOOTER, 3, GREE_BIT_MARK, GREE_ONE_SPACE, GREE_ZERO_SPACE, msb_first=False
+        ),
+        GREE_BIT_MARK,
+        GREE_MSG_SPACE,
+        *block(state_bytes[4:]),
+        GREE_BIT_MARK,
+        DEFAULT_REPEAT_GAP_US,
+    ]
+
+
+AC_PROTOCOLS: dict[str, ACProtocol] = {
+    "coolix": ACProtocol("coolix", 17, 30, False, _encode_coolix),
+    "gree": ACProtocol("gree", 16, 30, True, _encode_gree),
+}
+
+
+def update_state(protocol: str, state: ACState, **changes: Any) -> ACState:
+    """Return the state with some values changed, raise ValueError if invalid."""
+    if protocol not in AC_PROTOCOLS:
+        raise ValueError(f"Unknown AC protocol '{protocol}'")
+    ac_protocol = AC_PROTOCOLS[protocol]
+
+    state = replace(state, **{key: value for key, value in changes.items() if value is not None})
+    if state.hvac_mode not in AC_MODES:
+        raise ValueError(f"Unknown HVAC mode '{state.hvac_mode}'")
+    if state.fan_mode not in AC_FAN_MODES:
+        raise ValueError(f"Unknown fan mode '{state.fan_mode}'")
+    if state.swing_mode not in AC_SWING_MODES:
+        raise ValueError(f"Unknown swing mode '{state.swing_mode}'")
+    if state.swing_mode != "off" and not ac_protocol.swing:
+        raise ValueError(f"Protocol '{protocol}' has no swing setting")
+
+    # Out of range setpoints are clamped, as the remote buttons would
+    temperature = min(max(round(state.temperature), ac_protocol.min_temp), ac_protocol.max_temp)
+    return replace(state, temperature=temperature)
+
+
+@lru_cache(maxsize=AC_FRAME_CACHE_SIZE)
+def build_request(protocol: str, state: ACState) -> bytes:
+    """Return the encoded /api/ir/send request of a state, built once."""
+    ac_protocol = AC_PROTOCOLS[protocol]
+    return json_dumps(
+        {
+            "freq": ac_protocol.freq_khz * 1000,
+            "duty": 33,
+            "repeat": 1,
+            "raw": ac_protocol.encode(state),
+        }
+    )
+
+
+def frame_cache_statistics() -> dict[str, int]:
+    """Return the counters of the generated frame cache."""
+    info = build_request.cache_info()
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "max_size": info.maxsize,
+    }
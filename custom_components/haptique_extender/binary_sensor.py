@@ -11,12 +11,14 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntityDescription,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
+from .circuit_breaker import STATE_CLOSED
 from .const import DOMAIN
 from .coordinator import HaptiqueCoordinator
+from .entity import HaptiqueEntity
 
 
 @dataclass
@@ -24,6 +26,7 @@ class HaptiqueBinarySensorEntityDescription(BinarySensorEntityDescription):
     """Describes Haptique binary sensor entity."""
 
     value_fn: Callable[[dict[str, Any]], bool] = None
+    data_keys: tuple[str, ...] | None = None
 
 
 BINARY_SENSOR_TYPES: tuple[HaptiqueBinarySensorEntityDescription, ...] = (
@@ -32,6 +35,7 @@ BINARY_SENSOR_TYPES: tuple[HaptiqueBinarySensorEntityDescription, ...] = (
         name="WiFi Connected",
         device_class=BinarySensorDeviceClass.CONNECTIVITY,
         value_fn=lambda data: data.get("status", {}).get("sta_ok", False),
+        data_keys=("status.sta_ok",),
     ),
 )
 
@@ -48,11 +52,12 @@ async def async_setup_entry(
         HaptiqueBinarySensor(coordinator, entry, description)
         for description in BINARY_SENSOR_TYPES
     ]
+    entities.append(HaptiqueCircuitBinarySensor(coordinator, entry))
     
     async_add_entities(entities)
 
 
-class HaptiqueBinarySensor(CoordinatorEntity[HaptiqueCoordinator], BinarySensorEntity):
+class HaptiqueBinarySensor(HaptiqueEntity, BinarySensorEntity):
     """Representation of a Haptique binary sensor."""
 
     entity_description: HaptiqueBinarySensorEntityDescription
@@ -64,7 +69,7 @@ class HaptiqueBinarySensor(CoordinatorEntity[HaptiqueCoordinator], BinarySensorE
         description: HaptiqueBinarySensorEntityDescription,
     ) -> None:
         """Initialize the binary sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, description.data_keys)
         self.entity_description = description
         
         # Use hostname for entity naming
@@ -88,3 +93,55 @@ class HaptiqueBinarySensor(CoordinatorEntity[HaptiqueCoordinator], BinarySensorE
         if self.entity_description.value_fn:
             return self.entity_description.value_fn(self.coordinator.data)
         return False
+
+
+class HaptiqueCircuitBinarySensor(BinarySensorEntity):
+    """Problem sensor that is on while the hub circuit breaker is not closed."""
+
+    def __init__(
+        self,
+        coordinator: HaptiqueCoordinator,
+        entry: ConfigEntry,
+    ) -> None:
+        """Initialize the circuit binary sensor."""
+        self._circuit_breaker = coordinator.circuit_breaker
+        
+        hostname = coordinator.device_info.get("hostname", "haptique_extender")
+        
+        self._attr_name = "Hub Circuit Open"
+        self._attr_unique_id = f"{entry.entry_id}_circuit_open"
+        self._attr_has_entity_name = True
+        self._attr_device_class = BinarySensorDeviceClass.PROBLEM
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._attr_should_poll = False
+        
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, coordinator.device_info["mac"])},
+            "name": hostname,
+            "manufacturer": "KINCONY",
+            "model": "KC868-AG",
+            "sw_version": coordinator.device_info["fw_ver"],
+        }
+
+    async def async_added_to_hass(self) -> None:
+        """Follow circuit state changes."""
+        self.async_on_remove(self._circuit_breaker.add_listener(self._handle_change))
+
+    @callback
+    def _handle_change(self) -> None:
+        """Write the new circuit state."""
+        self.async_write_ha_state()
+
+    @property
+    def is_on(self) -> bool:
+        """Return true while requests to the hub fail fast."""
+        return self._circuit_breaker.state != STATE_CLOSED
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the circuit details."""
+        return {
+            "state": self._circuit_breaker.state,
+            "failures": self._circuit_breaker.failures,
+            "retry_in": round(self._circuit_breaker.retry_in),
+        }
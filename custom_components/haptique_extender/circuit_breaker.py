@@ -0,0 +1,157 @@
+"""Circuit breaker for unreachable Haptique Extender hubs."""
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Callable
+
+from .request_trace import ERROR_DEADLINE, RequestRecord
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+DEFAULT_FAILURE_THRESHOLD = 3
+DEFAULT_RESET_TIMEOUT = 10.0
+DEFAULT_MAX_RESET_TIMEOUT = 300.0
+
+
+class HubUnavailableError(Exception):
+    """Exception raised when a request is rejected by an open circuit."""
+    pass
+
+
+class CircuitBreaker:
+    """Fail fast on a hub after repeated failures.
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    requests are rejected without touching the network. Once the reset
+    timeout has passed a single probe request is let through (half-open):
+    its success closes the circuit, its failure reopens it with the timeout
+    doubled, up to `max_reset_timeout`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+        max_reset_timeout: float = DEFAULT_MAX_RESET_TIMEOUT,
+    ) -> None:
+        """Initialize the circuit breaker."""
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+
+        self._state = STATE_CLOSED
+        self._failures = 0
+        self._current_timeout = reset_timeout
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._listeners: list[Callable[[], None]] = []
+
+    @property
+    def state(self) -> str:
+        """Return the circuit state."""
+        return self._state
+
+    @property
+    def is_open(self) -> bool:
+        """Return True while requests are being rejected."""
+        if self._state == STATE_OPEN:
+            return time.monotonic() < self._opened_at + self._current_timeout
+        return self._state == STATE_HALF_OPEN and self._probe_in_flight
+
+    @property
+    def failures(self) -> int:
+        """Return the number of consecutive failures."""
+        return self._failures
+
+    @property
+    def retry_in(self) -> float:
+        """Return the seconds left before the next probe is allowed."""
+        if self._state != STATE_OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self._current_timeout - time.monotonic())
+
+    def add_listener(self, listener: Callable[[], None]) -> Callable[[], None]:
+        """Call `listener` on every state change; return a remover."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def before_request(self) -> None:
+        """Check if a request may go out, raise HubUnavailableError if not."""
+        if self._state == STATE_CLOSED:
+            return
+
+        if self._state == STATE_OPEN and not self.is_open:
+            self._set_state(STATE_HALF_OPEN)
+
+        if self._state == STATE_HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            _LOGGER.debug("Circuit of %s half-open, probing", self.name)
+            return
+
+        raise HubUnavailableError(
+            f"Hub {self.name} unavailable, retrying in {self.retry_in:.0f}s"
+        )
+
+    def record_success(self) -> None:
+        """Account for a request that reached the hub."""
+        self._failures = 0
+        self._probe_in_flight = False
+        if self._state != STATE_CLOSED:
+            self._current_timeout = self.reset_timeout
+            _LOGGER.info("Hub %s reachable again, circuit closed", self.name)
+            self._set_state(STATE_CLOSED)
+
+    def record_failure(self) -> None:
+        """Account for a request that could not reach the hub."""
+        self._failures += 1
+
+        if self._state == STATE_HALF_OPEN:
+            self._probe_in_flight = False
+            self._current_timeout = min(self._current_timeout * 2, self.max_reset_timeout)
+            self._open()
+        elif self._state == STATE_CLOSED and self._failures >= self.failure_threshold:
+            self._open()
+
+    def record_request(self, record: RequestRecord) -> None:
+        """Account for a finished request from its trace record.
+
+        Any HTTP answer below 500 proves the hub is reachable; no answer at
+        all (connection error, timeout) or a server error counts as a
+        failure. Cancelled requests are ignored, and so are timeouts cut
+        short by the caller's deadline before the endpoint timeout.
+        """
+        if record.status is not None:
+            if record.status < 500:
+                self.record_success()
+            else:
+                self.record_failure()
+        elif record.error and record.error != ERROR_DEADLINE:
+            self.record_failure()
+        else:
+            self._probe_in_flight = False
+
+    def _open(self) -> None:
+        """Open the circuit for the current reset timeout."""
+        self._opened_at = time.monotonic()
+        _LOGGER.warning(
+            "Hub %s unreachable after %d failures, failing fast for %.0fs",
+            self.name,
+            self._failures,
+            self._current_timeout,
+        )
+        self._set_state(STATE_OPEN)
+
+    def _set_state(self, state: str) -> None:
+        """Change state and notify listeners."""
+        if state == self._state and state != STATE_OPEN:
+            return
+        self._state = state
+        for listener in list(self._listeners):
+            listener()
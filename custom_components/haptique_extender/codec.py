@@ -0,0 +1,38 @@
+"""JSON codec for the IR database and hub payloads.
+
+Uses orjson, which Home Assistant ships, and falls back to the standard
+library when it is not importable. Both paths produce and accept UTF-8
+bytes, so callers do not care which one is active.
+"""
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_BACKEND = "orjson" if orjson else "json"
+
+
+def json_dumps(data: Any) -> bytes:
+    """Encode a hub request body, compact."""
+    if orjson:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def json_dumps_pretty(data: Any) -> bytes:
+    """Encode the database file, indented so it stays readable."""
+    if orjson:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode()
+
+
+def json_loads(data: bytes | str) -> Any:
+    """Decode JSON, raise ValueError when it is malformed."""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
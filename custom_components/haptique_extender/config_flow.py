@@ -10,10 +10,26 @@ import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.components import zeroconf
 from homeassistant.const import CONF_HOST, CONF_NAME
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
-from .const import DOMAIN
+from .const import (
+    CONF_LEARNING_POLL_INTERVAL,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_MQTT_TOPIC,
+    CONF_REFRESH_TIMEOUT,
+    CONF_REQUEST_QUEUE_DEPTH,
+    CONF_SCAN_INTERVAL,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_REQUEST_QUEUE_DEPTH,
+    DEFAULT_REQUEST_TIMEOUTS,
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    LEARNING_POLL_INTERVAL,
+    REFRESH_TIMEOUT,
+    REQUEST_TIMEOUT_OPTIONS,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -35,6 +51,14 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """Initialize the config flow."""
         self._discovery_info: dict[str, Any] = {}
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> HaptiqueOptionsFlow:
+        """Get the options flow for this handler."""
+        return HaptiqueOptionsFlow()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -238,3 +262,66 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         except Exception as err:  # pylint: disable=broad-except
             _LOGGER.exception("Unexpected error getting device info from %s: %s", host, err)
             return None
+
+
+class HaptiqueOptionsFlow(config_entries.OptionsFlow):
+    """Tune the polling, timeouts and request limits of a hub.
+
+    Options are applied by the running coordinator, without a reload.
+    """
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the performance options."""
+        if user_input is not None:
+            # Keep options set elsewhere, like the event mode
+            options = {**self.config_entry.options, **user_input}
+            # A cleared topic is left out of the input, it turns MQTT off
+            if not user_input.get(CONF_MQTT_TOPIC, "").strip():
+                options.pop(CONF_MQTT_TOPIC, None)
+            return self.async_create_entry(title="", data=options)
+
+        options = self.config_entry.options
+        seconds = vol.All(vol.Coerce(float), vol.Range(min=0.5, max=120))
+        schema = {
+            vol.Optional(
+                CONF_SCAN_INTERVAL,
+                default=options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+            ): vol.All(vol.Coerce(int), vol.Range(min=5, max=3600)),
+            vol.Optional(
+                CONF_REFRESH_TIMEOUT,
+                default=options.get(CONF_REFRESH_TIMEOUT, REFRESH_TIMEOUT),
+            ): seconds,
+            vol.Optional(
+                CONF_LEARNING_POLL_INTERVAL,
+                default=options.get(CONF_LEARNING_POLL_INTERVAL, LEARNING_POLL_INTERVAL),
+            ): seconds,
+        }
+        for endpoint_class, option in REQUEST_TIMEOUT_OPTIONS.items():
+            schema[
+                vol.Optional(
+                    option,
+                    default=options.get(option, DEFAULT_REQUEST_TIMEOUTS[endpoint_class][2]),
+                )
+            ] = seconds
+        schema[
+            vol.Optional(
+                CONF_MAX_CONCURRENT_REQUESTS,
+                default=options.get(CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS),
+            )
+        ] = vol.All(vol.Coerce(int), vol.Range(min=1, max=16))
+        schema[
+            vol.Optional(
+                CONF_REQUEST_QUEUE_DEPTH,
+                default=options.get(CONF_REQUEST_QUEUE_DEPTH, DEFAULT_REQUEST_QUEUE_DEPTH),
+            )
+        ] = vol.All(vol.Coerce(int), vol.Range(min=0, max=200))
+        schema[
+            vol.Optional(
+                CONF_MQTT_TOPIC,
+                description={"suggested_value": options.get(CONF_MQTT_TOPIC)},
+            )
+        ] = str
+
+        return self.async_show_form(step_id="init", data_schema=vol.Schema(schema))
@@ -12,9 +12,110 @@ API_IR_LAST = "/api/ir/last"
 API_IR_LEARN_START = "/api/ir/learn/start"
 API_IR_LEARN_STOP = "/api/ir/learn/stop"
 
+# Firmware storage endpoints
+API_IR_SAVE = "/api/ir/save"
+API_IR_SEND_NAME = "/api/ir/send/name"
+API_IR_DELETE = "/api/ir/delete"
+API_IR_CLEAR = "/api/ir/clear"
+
+# Endpoint classes, each with its own request timeouts
+ENDPOINT_CLASS_STATUS = "status"
+ENDPOINT_CLASS_SEND = "send"
+ENDPOINT_CLASS_POLL = "poll"
+ENDPOINT_CLASS_STORAGE = "storage"
+
+ENDPOINT_CLASSES = {
+    API_STATUS: ENDPOINT_CLASS_STATUS,
+    API_WIFI_STATUS: ENDPOINT_CLASS_STATUS,
+    API_IR_RXINFO: ENDPOINT_CLASS_STATUS,
+    API_IR_SAVED: ENDPOINT_CLASS_STATUS,
+    API_IR_SEND: ENDPOINT_CLASS_SEND,
+    API_IR_SEND_NAME: ENDPOINT_CLASS_SEND,
+    API_IR_LAST: ENDPOINT_CLASS_POLL,
+    API_IR_LEARN_START: ENDPOINT_CLASS_POLL,
+    API_IR_LEARN_STOP: ENDPOINT_CLASS_POLL,
+    API_IR_SAVE: ENDPOINT_CLASS_STORAGE,
+    API_IR_DELETE: ENDPOINT_CLASS_STORAGE,
+    API_IR_CLEAR: ENDPOINT_CLASS_STORAGE,
+}
+
 # Configuration
 CONF_HOST = "host"
+CONF_DEVICE_SNAPSHOT = "device_snapshot"
+CONF_EVENT_MODE = "event_mode"
+
+# Performance options, set per hub in the options flow
+CONF_SCAN_INTERVAL = "scan_interval"
+CONF_REFRESH_TIMEOUT = "refresh_timeout"
+CONF_LEARNING_POLL_INTERVAL = "learning_poll_interval"
+CONF_STATUS_TIMEOUT = "status_timeout"
+CONF_SEND_TIMEOUT = "send_timeout"
+CONF_POLL_TIMEOUT = "poll_timeout"
+CONF_STORAGE_TIMEOUT = "storage_timeout"
+CONF_MAX_CONCURRENT_REQUESTS = "max_concurrent_requests"
+CONF_REQUEST_QUEUE_DEPTH = "request_queue_depth"
+CONF_MQTT_TOPIC = "mqtt_topic"
+
+# Device info persisted in the entry so setup does not wait for the hub
+DEVICE_SNAPSHOT_KEYS = ("mac", "hostname", "fw_ver")
 
 # Default values
 DEFAULT_NAME = "Haptique Extender"
 DEFAULT_PORT = 80
+DEFAULT_SCAN_INTERVAL = 30
+
+# (connect, read, total) request timeouts in seconds, per endpoint class
+DEFAULT_REQUEST_TIMEOUTS = {
+    ENDPOINT_CLASS_STATUS: (3.0, 5.0, 8.0),
+    ENDPOINT_CLASS_SEND: (3.0, 8.0, 10.0),
+    ENDPOINT_CLASS_POLL: (2.0, 3.0, 4.0),
+    ENDPOINT_CLASS_STORAGE: (3.0, 8.0, 10.0),
+}
+
+# Option setting the total timeout of each endpoint class; the connect and
+# read timeouts are scaled with it
+REQUEST_TIMEOUT_OPTIONS = {
+    ENDPOINT_CLASS_STATUS: CONF_STATUS_TIMEOUT,
+    ENDPOINT_CLASS_SEND: CONF_SEND_TIMEOUT,
+    ENDPOINT_CLASS_POLL: CONF_POLL_TIMEOUT,
+    ENDPOINT_CLASS_STORAGE: CONF_STORAGE_TIMEOUT,
+}
+
+# Scan intervals a message pushed on MQTT stands in for polling its
+# endpoint; a hub that stops publishing is polled again after that
+TELEMETRY_MAX_AGE_INTERVALS = 2
+
+# Requests running at once on a hub, and waiting for their turn
+DEFAULT_MAX_CONCURRENT_REQUESTS = 3
+DEFAULT_REQUEST_QUEUE_DEPTH = 20
+
+# Learning sessions, in seconds
+DEFAULT_LEARNING_TIMEOUT = 30
+LEARNING_POLL_INTERVAL = 5
+
+# Commands of a whole-remote batch without names are called "button 1", ...
+DEFAULT_BATCH_NAME_PREFIX = "button"
+MAX_BATCH_COMMANDS = 200
+
+# Events carry their whole payload, or only references to it
+EVENT_MODE_FULL = "full"
+EVENT_MODE_SLIM = "slim"
+EVENT_MODES = (EVENT_MODE_FULL, EVENT_MODE_SLIM)
+
+# Slim events: seconds a burst of an operation on a device is merged over,
+# and number of payloads kept for fetching
+DEFAULT_COALESCE_WINDOW = 2.0
+MAX_EVENT_PAYLOADS = 32
+
+# Press-and-hold sends: safety timeout and length of one request's frames,
+# in seconds
+DEFAULT_HOLD_TIMEOUT = 10
+MAX_HOLD_TIMEOUT = 120
+HOLD_BATCH_SECS = 0.3
+
+# Generated air conditioner requests kept for setpoints sent again
+AC_FRAME_CACHE_SIZE = 128
+
+# Time budgets in seconds for a whole refresh and a whole send service call
+REFRESH_TIMEOUT = 20
+DEFAULT_SEND_TIMEOUT = 10
@@ -3,15 +3,20 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
+from collections import deque
+from collections.abc import Callable, Mapping
 from datetime import timedelta
 from typing import Any
 
 import aiohttp
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.util import dt as dt_util
 
+from .circuit_breaker import CircuitBreaker
+from .codec import json_dumps, json_loads
 from .const import (
     API_IR_LAST,
     API_IR_RXINFO,
@@ -19,12 +24,57 @@ from .const import (
     API_IR_SEND,
     API_STATUS,
     API_WIFI_STATUS,
+    CONF_LEARNING_POLL_INTERVAL,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_REFRESH_TIMEOUT,
+    CONF_REQUEST_QUEUE_DEPTH,
+    CONF_SCAN_INTERVAL,
+    DEFAULT_HOLD_TIMEOUT,
+    DEFAULT_LEARNING_TIMEOUT,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_REQUEST_QUEUE_DEPTH,
+    DEFAULT_REQUEST_TIMEOUTS,
+    DEFAULT_SCAN_INTERVAL,
+    DEVICE_SNAPSHOT_KEYS,
     DOMAIN,
+    LEARNING_POLL_INTERVAL,
+    REFRESH_TIMEOUT,
+    REQUEST_TIMEOUT_OPTIONS,
+    TELEMETRY_MAX_AGE_INTERVALS,
 )
+from .events import EVENT_IR_CAPTURED, EVENT_OPERATION, EventPublisher
+from .hold import HoldSession
+from .ir_signal import detect_repeat_frames, fingerprint, normalize_timings, timings_match
+from .learning import BatchLearning, LearningSession, LearningSessionManager
+from .metrics import HubMetrics
+from .request_limiter import RequestLimiter
+from .request_trace import ERROR_DEADLINE, RequestTrace, build_trace_config
+from .telemetry import MqttTelemetry
+from .timeouts import Deadline, cut_by_deadline, request_timeout
+
+LEARNING_HISTORY_SIZE = 20
 
 _LOGGER = logging.getLogger(__name__)
 
 
+class DataKeys(frozenset):
+    """Dotted data keys ("wifi.sta.rssi") a listener depends on.
+
+    Passed as the listener context, it makes the coordinator run the
+    listener only when one of these keys changed.
+    """
+
+
+def lookup_data_key(data: dict[str, Any] | None, key: str) -> Any:
+    """Return the value at a dotted key, None when a part is missing."""
+    value: Any = data
+    for part in key.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
 class HaptiqueCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     """Coordinator to manage fetching Haptique data."""
 
@@ -39,13 +89,40 @@ class HaptiqueCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(seconds=30),
+            update_interval=timedelta(seconds=DEFAULT_SCAN_INTERVAL),
+            # Listeners only run when a refresh brings different data
+            always_update=False,
         )
         self.host = host
         self.token = token
-        self.session = async_get_clientsession(hass)
+        # Dedicated session so connect times can be traced
+        self.session = async_create_clientsession(
+            hass, trace_configs=[build_trace_config()]
+        )
         self.base_url = f"http://{host}"
         
+        # Recent requests, kept for diagnostics and metric sensors
+        self.metrics = HubMetrics()
+        self.request_trace = RequestTrace(on_finish=self.metrics.record_request)
+        
+        # (connect, read, total) timeouts per endpoint class
+        self.request_timeouts = dict(DEFAULT_REQUEST_TIMEOUTS)
+        self.refresh_timeout: float = REFRESH_TIMEOUT
+        
+        # Requests in flight and waiting, shared with the firmware storage
+        self.request_limiter = RequestLimiter(host)
+        
+        # Answers pushed over MQTT, when the hub publishes them
+        self.telemetry: MqttTelemetry | None = None
+        self._telemetry_prefix: str | None = None
+        self._telemetry_task: asyncio.Task | None = None
+        
+        # Press-and-hold send running on this hub
+        self.hold_session: HoldSession | None = None
+        
+        # Fail fast while the hub is unreachable
+        self.circuit_breaker = CircuitBreaker(host)
+        
         # Device info
         self.device_info: dict[str, Any] = {}
         
@@ -55,189 +132,305 @@ class HaptiqueCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         # Storage info
         self.storage_info: dict[str, Any] = {}
         
-        # Learning state
-        self._learning_mode = False
-        self._learning_context: dict[str, Any] | None = None
-        self._learning_task: asyncio.Task | None = None
-        self._last_ir_data_captured: dict[str, Any] | None = None  # Track last captured data
+        # Learning state, sessions are run by the shared LearningSessionManager
+        self.learning_session: LearningSession | None = None
+        self.learning_poll_interval: float = LEARNING_POLL_INTERVAL
+        
+        # Recent learning sessions, kept for diagnostics
+        self.learning_history: deque[dict[str, Any]] = deque(maxlen=LEARNING_HISTORY_SIZE)
         
         # Last learned IR code
         self.last_learn_ir_code: dict[str, Any] | None = None
         self.last_learn_ir_timestamp: Any = None
+        
+        # Value of every data key at its last dispatch, for keyed listeners
+        self._key_values: dict[str, Any] = {}
+        self._dispatched_success: bool | None = None
 
-    @property
-    def learning_mode(self) -> bool:
-        """Return current learning mode state."""
-        return self._learning_mode
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> Callable[[], None]:
+        """Listen for data updates; keyed listeners start from the current data.
 
-    def set_learning_mode(self, enabled: bool) -> None:
-        """Set learning mode and start/stop polling."""
-        was_learning = self._learning_mode
-        self._learning_mode = enabled
-        
-        if enabled and not was_learning:
-            # Clear previous capture when starting new learning
-            self._last_ir_data_captured = None
-            
-            # Start learning polling
-            if self._learning_task:
-                self._learning_task.cancel()
-            self._learning_task = asyncio.create_task(self._learning_poll_loop())
-            _LOGGER.info("Learning mode enabled, started polling")
-        elif not enabled and was_learning:
-            # Stop learning polling
-            if self._learning_task:
-                self._learning_task.cancel()
-                self._learning_task = None
-            _LOGGER.info("Learning mode disabled, stopped polling")
-    
-    async def _learning_poll_loop(self) -> None:
-        """Poll for new IR codes while in learning mode."""
-        timeout_counter = 0
-        max_timeout = 30  # 30 seconds timeout
-        poll_interval = 5  # Poll every 5 seconds
+        Entities render their state when added, so the first dispatch after
+        that only wakes those whose keys changed since.
+        """
+        if isinstance(context, DataKeys):
+            for key in context:
+                self._key_values[key] = lookup_data_key(self.data, key)
+            if self._dispatched_success is None:
+                self._dispatched_success = self.last_update_success
+        return super().async_add_listener(update_callback, context)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Run the listeners whose data keys changed, and the unkeyed ones.
+
+        Every keyed listener runs when availability changed, since all
+        entities render it.
+        """
+        listeners = list(self._listeners.values())
+        keys = set().union(
+            *(context for _, context in listeners if isinstance(context, DataKeys))
+        )
+        changed: set[str] | None = set()
+        for key in keys:
+            value = lookup_data_key(self.data, key)
+            if key not in self._key_values or self._key_values[key] != value:
+                self._key_values[key] = value
+                changed.add(key)
+        if self.last_update_success != self._dispatched_success:
+            self._dispatched_success = self.last_update_success
+            changed = None
         
-        try:
-            while self._learning_mode and timeout_counter < max_timeout:
-                await asyncio.sleep(poll_interval)
-                timeout_counter += poll_interval
-                
-                try:
-                    # Poll /api/ir/last
-                    ir_data = await self._request("GET", API_IR_LAST)
-                    
-                    # Check if we have new data and it's different from last capture
-                    if ir_data and ir_data.get("combined"):
-                        # Check if this is new data (different from last captured)
-                        if self._is_new_ir_data(ir_data):
-                            _LOGGER.info("New IR code detected!")
-                            self._last_ir_data_captured = ir_data.copy()
-                            await self.handle_ir_learned(ir_data)
-                            # Stop learning after capturing
-                            self.set_learning_mode(False)
-                            return
-                        else:
-                            _LOGGER.debug("IR data unchanged, waiting for new capture...")
-                        
-                except Exception as err:
-                    _LOGGER.debug("Polling error: %s", err)
-                    continue
-            
-            # Timeout reached
-            if timeout_counter >= max_timeout:
-                _LOGGER.warning("Learning timeout reached")
-                self.set_learning_mode(False)
-                
-                # Fire unified event - TIMEOUT
-                self.hass.bus.async_fire(
-                    "haptique_operation",
-                    {
-                        "operation": "learn",
-                        "status": "timeout",
-                        "entity_type": "command",
-                        "device_name": self._learning_context.get("device_name") if self._learning_context else None,
-                        "command_name": self._learning_context.get("command_name") if self._learning_context else None,
-                    }
-                )
-                
-        except asyncio.CancelledError:
-            _LOGGER.debug("Learning poll loop cancelled")
-            raise
+        for update_callback, context in listeners:
+            if isinstance(context, DataKeys) and changed is not None and context.isdisjoint(changed):
+                # The entity would render the same state
+                self.metrics.record_avoided_write()
+                continue
+            update_callback()
 
-    def _is_new_ir_data(self, ir_data: dict[str, Any]) -> bool:
-        """Check if IR data is new (different from last captured)."""
-        if not self._last_ir_data_captured:
-            return True
+    def apply_options(self, options: Mapping[str, Any]) -> None:
+        """Apply the performance options of the config entry, while running."""
+        self.update_interval = timedelta(
+            seconds=options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+        )
+        self.refresh_timeout = options.get(CONF_REFRESH_TIMEOUT, REFRESH_TIMEOUT)
+        self.learning_poll_interval = options.get(
+            CONF_LEARNING_POLL_INTERVAL, LEARNING_POLL_INTERVAL
+        )
         
-        # Compare the combined array
-        new_combined = ir_data.get("combined", [])
-        old_combined = self._last_ir_data_captured.get("combined", [])
+        # Updated in place, the firmware storage shares the dict
+        for endpoint_class, option in REQUEST_TIMEOUT_OPTIONS.items():
+            connect, read, total = DEFAULT_REQUEST_TIMEOUTS[endpoint_class]
+            configured = float(options.get(option, total))
+            scale = configured / total
+            self.request_timeouts[endpoint_class] = (
+                round(connect * scale, 1),
+                round(read * scale, 1),
+                configured,
+            )
         
-        # If lengths differ, it's new data
-        if len(new_combined) != len(old_combined):
-            return True
+        self.request_limiter.configure(
+            options.get(CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS),
+            options.get(CONF_REQUEST_QUEUE_DEPTH, DEFAULT_REQUEST_QUEUE_DEPTH),
+        )
         
-        # If any value differs, it's new data
-        for i, val in enumerate(new_combined):
-            if i >= len(old_combined) or val != old_combined[i]:
-                return True
+        if self.telemetry:
+            self.telemetry.max_age = self.telemetry_max_age
         
-        # Data is identical
-        return False
+        # Reschedule the next poll on the new interval
+        if self._listeners:
+            self._schedule_refresh()
 
-    def set_learning_context(
-        self, device_name: str, command_name: str
-    ) -> None:
-        """Set learning context for service-based learning."""
-        self._learning_context = {
-            "device_name": device_name,
-            "command_name": command_name,
+    @property
+    def telemetry_max_age(self) -> float:
+        """Return the seconds a pushed answer stands in for polling.
+
+        A few scan intervals, so a hub that dies after publishing is seen
+        unavailable nearly as fast as one that is only polled.
+        """
+        return self.update_interval.total_seconds() * TELEMETRY_MAX_AGE_INTERVALS
+
+    @callback
+    def configure_telemetry(self, prefix: str | None) -> None:
+        """Follow the MQTT topics under `prefix`, or only poll without one.
+
+        Subscribing waits for the MQTT broker, so it runs in the background
+        while the hub is polled over HTTP.
+        """
+        prefix = (prefix or "").strip().rstrip("/") or None
+        if prefix == self._telemetry_prefix:
+            return
+        self._telemetry_prefix = prefix
+        if self._telemetry_task and not self._telemetry_task.done():
+            self._telemetry_task.cancel()
+        self._telemetry_task = None
+        if self.telemetry:
+            self.telemetry.async_stop()
+            self.telemetry = None
+        if prefix:
+            self._telemetry_task = self.hass.async_create_background_task(
+                self._async_start_telemetry(prefix), f"{DOMAIN}_telemetry_{self.host}"
+            )
+
+    async def _async_start_telemetry(self, prefix: str) -> None:
+        """Subscribe to the hub topics under `prefix`."""
+        telemetry = MqttTelemetry(
+            self.hass, prefix, self._handle_telemetry, self.telemetry_max_age
+        )
+        try:
+            started = await telemetry.async_start()
+        except asyncio.CancelledError:
+            # Reconfigured or unloaded while subscribing
+            telemetry.async_stop()
+            raise
+        if started:
+            self.telemetry = telemetry
+
+    @callback
+    def _handle_telemetry(self, endpoint: str) -> None:
+        """React at once to an answer pushed by the hub."""
+        if endpoint == API_IR_LAST:
+            if self.learning_session:
+                self._learning_manager.poll_now(self.host)
+            return
+        # Debounced, and served from the pushed answers
+        self.hass.async_create_task(self.async_request_refresh())
+
+    @property
+    def device_snapshot(self) -> dict[str, Any]:
+        """Return the device info worth persisting across restarts."""
+        return {key: self.device_info.get(key) for key in DEVICE_SNAPSHOT_KEYS}
+
+    def restore_snapshot(self, snapshot: dict[str, Any]) -> None:
+        """Serve a persisted device snapshot until the first live refresh."""
+        self.device_info = dict(snapshot)
+        self.data = {
+            "status": dict(snapshot),
+            "wifi": {},
+            "ir_rx_info": {},
+            "storage_info": {},
+            "last_learn_ir_code": None,
+            "last_learn_ir_timestamp": None,
+            "learning_mode": False,
         }
 
-    async def handle_ir_learned(self, ir_data: dict[str, Any]) -> None:
+    @property
+    def learning_mode(self) -> bool:
+        """Return current learning mode state."""
+        return self.learning_session is not None
+
+    def set_learning_mode(self, enabled: bool) -> None:
+        """Start or cancel a manual learning session."""
+        if enabled and not self.learning_mode:
+            self.start_learning()
+        elif not enabled and self.learning_session:
+            self._learning_manager.cancel(self.host, self.learning_session.session_id)
+
+    def start_learning(
+        self,
+        device_name: str | None = None,
+        command_name: str | None = None,
+        timeout: float = DEFAULT_LEARNING_TIMEOUT,
+        session_id: str | None = None,
+        batch: BatchLearning | None = None,
+    ) -> LearningSession | None:
+        """Start a learning session, None if this hub is already learning.
+
+        Without a device and command name the captured code is only fired
+        in a haptique_ir_captured event.
+        """
+        return self._learning_manager.start(
+            self, device_name, command_name, timeout, session_id, batch
+        )
+
+    @property
+    def _learning_manager(self) -> LearningSessionManager:
+        """Return the learning session manager shared by every hub."""
+        return self.hass.data[DOMAIN]["learning_sessions"]
+
+    @property
+    def _events(self) -> EventPublisher:
+        """Return the event publisher shared by every hub."""
+        return self.hass.data[DOMAIN]["events"]
+
+    async def async_poll_last_ir(self, deadline: Deadline | None = None) -> dict[str, Any]:
+        """Fetch the last IR code received by the hub."""
+        return await self._request("GET", API_IR_LAST, deadline=deadline)
+
+    def record_learning(self, session: LearningSession, status: str, **details: Any) -> None:
+        """Add a finished learning session to the history."""
+        self.learning_history.append(
+            {
+                "session_id": session.session_id,
+                "started_at": session.started_at,
+                "finished_at": dt_util.utcnow(),
+                "status": status,
+                "device_name": session.device_name,
+                "command_name": session.command_name,
+                **details,
+            }
+        )
+
+    async def handle_ir_learned(
+        self, ir_data: dict[str, Any], session: LearningSession
+    ) -> None:
         """Handle IR data learned from the device."""
         # Update learn sensor
         await self.update_learn_ir_code(ir_data)
         
-        # Check if there's a learning context (from learn_ir_command service)
-        learning_context = self._learning_context
-        
-        if learning_context:
+        # Sessions started by the learn_ir_command service name the command
+        if session.device_name and session.command_name:
             # Save to database
             from .ir_database import IRDatabase
             
             ir_db: IRDatabase = self.hass.data[DOMAIN]["ir_database"]
+            raw_data, repeat, quality = self._prepare_capture(ir_data)
             
             success = await ir_db.add_command(
-                device_name=learning_context["device_name"],
-                command_name=learning_context["command_name"],
+                device_name=session.device_name,
+                command_name=session.command_name,
                 freq_khz=ir_data.get("freq_khz", 38),
                 duty=33,
-                repeat=1,
-                raw_data=ir_data.get("combined", []),
+                repeat=repeat,
+                raw_data=raw_data,
+                quality=quality or None,
+            )
+            
+            self.record_learning(
+                session,
+                "success" if success else "error",
+                count=len(ir_data.get("combined", [])),
+                stored_count=len(raw_data),
+                repeat=repeat,
+                quality=quality,
             )
             
             if success:
                 _LOGGER.info(
                     "Command '%s' saved to database for device '%s'",
-                    learning_context["command_name"],
-                    learning_context["device_name"],
+                    session.command_name,
+                    session.device_name,
                 )
                 
                 # Fire unified event - SUCCESS
-                self.hass.bus.async_fire(
-                    "haptique_operation",
+                self._events.fire(
+                    EVENT_OPERATION,
                     {
                         "operation": "learn",
                         "status": "success",
                         "entity_type": "command",
-                        "device_name": learning_context["device_name"],
-                        "command_name": learning_context["command_name"],
+                        "device_name": session.device_name,
+                        "command_name": session.command_name,
                         "data": {
+                            **session.event_data(),
                             "freq_khz": ir_data.get("freq_khz", 38),
                             "count": len(ir_data.get("combined", [])),
                             "frames": ir_data.get("frames", 1),
+                            "stored_count": len(raw_data),
+                            "repeat": repeat,
+                            "quality": quality,
                         }
                     }
                 )
                 
-                # Clear learning context
-                self._learning_context = None
-                
                 # Force refresh to update storage sensors
                 await self.async_refresh()
             else:
                 _LOGGER.error("Failed to save command to database")
                 
                 # Fire unified event - ERROR
-                self.hass.bus.async_fire(
-                    "haptique_operation",
+                self._events.fire(
+                    EVENT_OPERATION,
                     {
                         "operation": "learn",
                         "status": "error",
                         "entity_type": "command",
-                        "device_name": learning_context["device_name"],
-                        "command_name": learning_context["command_name"],
+                        "device_name": session.device_name,
+                        "command_name": session.command_name,
+                        "data": session.event_data(),
                         "error": "Failed to save to database"
                     }
                 )
@@ -249,18 +442,139 @@ class HaptiqueCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             count = len(raw_data)
             
             _LOGGER.info("Manual learning captured: %d values", count)
+            self.record_learning(session, "captured", count=count)
             
             # Fire capture event (for manual raw capture)
-            self.hass.bus.async_fire(
-                "haptique_ir_captured",
+            self._events.fire(
+                EVENT_IR_CAPTURED,
                 {
-                    "raw_data": raw_data,
                     "freq_khz": freq_khz,
                     "frames": frames,
                     "count": count,
-                }
+                    "fingerprint": fingerprint(raw_data) if raw_data else None,
+                    **session.event_data(),
+                },
+                {"raw_data": raw_data},
             )
 
+    def _prepare_capture(self, ir_data: dict[str, Any]) -> tuple[list[int], int, int]:
+        """Return the raw array, repeat count and quality to store for a capture."""
+        # Remove receiver jitter so re-learns give identical arrays
+        raw_data, quality = normalize_timings(ir_data.get("combined", []))
+        if quality == 0:
+            raw_data = ir_data.get("combined", [])
+        
+        # Keep a single frame when the button was held during capture
+        raw_data, repeat = detect_repeat_frames(raw_data)
+        if repeat > 1:
+            _LOGGER.info(
+                "Detected %d repeated frames, storing %d of %d values",
+                repeat,
+                len(raw_data),
+                len(ir_data.get("combined", [])),
+            )
+        return raw_data, repeat, quality
+
+    def handle_batch_capture(self, ir_data: dict[str, Any], session: LearningSession) -> bool:
+        """Keep a code captured by a batch session, True once the batch is full.
+
+        Nothing is saved and no refresh is made until the batch is committed.
+        """
+        batch = session.batch
+        raw_data, repeat, quality = self._prepare_capture(ir_data)
+        code_fingerprint = fingerprint(raw_data)
+        
+        self.last_learn_ir_code = ir_data
+        self.last_learn_ir_timestamp = dt_util.utcnow()
+        if self.data is not None:
+            # No refresh before the commit, the learn sensor reads it from here
+            self.data = {
+                **self.data,
+                "last_learn_ir_code": self.last_learn_ir_code,
+                "last_learn_ir_timestamp": self.last_learn_ir_timestamp,
+            }
+        self.async_update_listeners()
+        
+        # A double press gives the same code twice in a row
+        previous = batch.captures[-1][1]["raw_data"] if batch.captures else None
+        if code_fingerprint in batch.fingerprints or (
+            previous is not None and timings_match(raw_data, previous)
+        ):
+            _LOGGER.info("Duplicate code %s ignored", code_fingerprint)
+            status = "duplicate"
+            command_name = None
+        else:
+            command_name = batch.next_name
+            command_data = {
+                "freq_khz": ir_data.get("freq_khz", 38),
+                "duty": 33,
+                "repeat": repeat,
+                "raw_data": raw_data,
+                "quality": quality or None,
+            }
+            batch.captures.append((command_name, command_data))
+            batch.fingerprints.add(code_fingerprint)
+            status = "captured"
+        
+        self._events.fire(
+            EVENT_OPERATION,
+            {
+                "operation": "learn_batch",
+                "status": status,
+                "entity_type": "command",
+                "device_name": session.device_name,
+                "command_name": command_name,
+                "data": {
+                    **session.event_data(),
+                    "fingerprint": code_fingerprint,
+                    "count": len(raw_data),
+                    "captured": len(batch.captures),
+                    "remaining": batch.remaining,
+                    "next_command_name": batch.next_name if batch.remaining else None,
+                },
+            }
+        )
+        return batch.remaining <= 0
+
+    async def async_commit_batch(self, session: LearningSession, status: str = "success") -> None:
+        """Save every command captured by a batch session at once."""
+        from .ir_database import IRDatabase
+        
+        ir_db: IRDatabase = self.hass.data[DOMAIN]["ir_database"]
+        batch = session.batch
+        saved: list[str] = []
+        
+        # One transaction, so one journal write and one change notification
+        async with ir_db.transaction():
+            for command_name, command_data in batch.captures:
+                if await ir_db.add_command(session.device_name, command_name, **command_data):
+                    saved.append(command_name)
+        
+        self.record_learning(session, status, commands=len(saved))
+        _LOGGER.info(
+            "Batch learning %s saved %d command(s) to device '%s'",
+            session.session_id,
+            len(saved),
+            session.device_name,
+        )
+        self._events.fire(
+            EVENT_OPERATION,
+            {
+                "operation": "learn_batch",
+                "status": status,
+                "entity_type": "device",
+                "device_name": session.device_name,
+                "data": {
+                    **session.event_data(),
+                    "command_names": saved,
+                    "missing": batch.remaining,
+                },
+            }
+        )
+        
+        # Force refresh to update storage sensors, once for the whole batch
+        await self.async_refresh()
+
     async def update_learn_ir_code(self, ir_data: dict[str, Any]) -> None:
         """Update the learned IR code."""
         self.last_learn_ir_code = ir_data
@@ -273,21 +587,23 @@ class HaptiqueCoordinator(DataUpdateCoordinator[dict[str, Any]]):
 
     async def _async_update_data(self) -> dict[str, Any]:
         """Fetch data from API."""
+        start = time.perf_counter()
+        deadline = Deadline(self.refresh_timeout)
         try:
             # Get main status
             _LOGGER.debug("Fetching main status from %s", API_STATUS)
-            status_data = await self._request("GET", API_STATUS)
+            status_data = await self._request("GET", API_STATUS, deadline=deadline)
             _LOGGER.debug("Status data type: %s, content: %s", type(status_data), status_data)
             
             # Get WiFi status
             _LOGGER.debug("Fetching WiFi status from %s", API_WIFI_STATUS)
-            wifi_data = await self._request("GET", API_WIFI_STATUS)
+            wifi_data = await self._request("GET", API_WIFI_STATUS, deadline=deadline)
             _LOGGER.debug("WiFi data type: %s, content: %s", type(wifi_data), wifi_data)
             
             # Get IR RX info
             try:
                 _LOGGER.debug("Fetching IR RX info from %s", API_IR_RXINFO)
-                ir_rx_info = await self._request("GET", API_IR_RXINFO)
+                ir_rx_info = await self._request("GET", API_IR_RXINFO, deadline=deadline)
                 _LOGGER.debug("IR RX info type: %s, content: %s", type(ir_rx_info), ir_rx_info)
                 self.ir_rx_info = ir_rx_info
             except Exception as err:
@@ -297,7 +613,7 @@ class HaptiqueCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             # Get storage info from /api/ir/saved
             try:
                 _LOGGER.debug("Fetching storage info from %s", API_IR_SAVED)
-                saved_data = await self._request("GET", API_IR_SAVED)
+                saved_data = await self._request("GET", API_IR_SAVED, deadline=deadline)
                 _LOGGER.debug("Saved data type: %s, content: %s", type(saved_data), saved_data)
                 
                 # Map the API response to expected format
@@ -327,35 +643,81 @@ class HaptiqueCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             }
             _LOGGER.debug("Device info updated: %s", self.device_info)
             
-            return {
+            data = {
                 "status": status_data,
                 "wifi": wifi_data,
                 "ir_rx_info": self.ir_rx_info,
                 "storage_info": self.storage_info,
                 "last_learn_ir_code": self.last_learn_ir_code,
                 "last_learn_ir_timestamp": self.last_learn_ir_timestamp,
-                "learning_mode": self._learning_mode,
+                "learning_mode": self.learning_mode,
             }
+            if data == self.data and self.last_update_success:
+                # No listener will run, so none of their state writes
+                self.metrics.record_unchanged_refresh(len(self._listeners))
+            return data
             
         except Exception as err:
             raise UpdateFailed(f"Error communicating with API: {err}") from err
+        finally:
+            self.metrics.record_refresh((time.perf_counter() - start) * 1000)
 
     async def _request(
-        self, method: str, endpoint: str, data: dict[str, Any] | None = None
+        self,
+        method: str,
+        endpoint: str,
+        data: dict[str, Any] | bytes | None = None,
+        deadline: Deadline | None = None,
+    ) -> dict[str, Any]:
+        """Make a request to the API once the hub has a free slot.
+
+        GET requests are answered from MQTT telemetry while it is fresh.
+        """
+        if method == "GET" and self.telemetry:
+            pushed = self.telemetry.get(endpoint)
+            if pushed is not None:
+                return pushed
+        
+        await self.request_limiter.acquire(deadline)
+        try:
+            return await self._do_request(method, endpoint, data, deadline)
+        finally:
+            self.request_limiter.release()
+
+    async def _do_request(
+        self,
+        method: str,
+        endpoint: str,
+        data: dict[str, Any] | bytes | None = None,
+        deadline: Deadline | None = None,
     ) -> dict[str, Any]:
-        """Make a request to the API."""
+        """Make a request to the API.
+
+        The timeouts come from the endpoint class, capped by what is left of
+        the caller's deadline.
+        """
         url = f"{self.base_url}{endpoint}"
+        timeout = request_timeout(endpoint, deadline, self.request_timeouts)
         
         # Prepare headers with authentication
         headers = {}
         if self.token:
             headers["Authorization"] = f"Bearer {self.token}"
         
+        # Raises HubUnavailableError without waiting while the circuit is open
+        self.circuit_breaker.before_request()
+        record = self.request_trace.start(method, endpoint)
+        
         try:
             if method == "GET":
-                async with self.session.get(url, headers=headers, timeout=10) as response:
+                async with self.session.get(
+                    url, headers=headers, timeout=timeout, trace_request_ctx=record
+                ) as response:
+                    record.status = response.status
                     response.raise_for_status()
-                    result = await response.json()
+                    raw = await response.read()
+                    record.response_bytes = len(raw)
+                    result = json_loads(raw) if raw.strip() else {}
                     # Ensure we always return a dict
                     if isinstance(result, dict):
                         return result
@@ -363,11 +725,18 @@ class HaptiqueCoordinator(DataUpdateCoordinator[dict[str, Any]]):
                         _LOGGER.warning("API %s returned non-dict: %s", endpoint, type(result))
                         return {}
             elif method == "POST":
+                # Bodies sent over and over come encoded already
+                body = data if isinstance(data, bytes) else json_dumps(data)
+                headers["Content-Type"] = "application/json"
+                record.request_bytes = len(body)
                 async with self.session.post(
-                    url, json=data, headers=headers, timeout=10
+                    url, data=body, headers=headers, timeout=timeout, trace_request_ctx=record
                 ) as response:
+                    record.status = response.status
                     response.raise_for_status()
-                    result = await response.json()
+                    raw = await response.read()
+                    record.response_bytes = len(raw)
+                    result = json_loads(raw) if raw.strip() else {}
                     # Ensure we always return a dict
                     if isinstance(result, dict):
                         return result
@@ -377,15 +746,24 @@ class HaptiqueCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             else:
                 raise ValueError(f"Unsupported method: {method}")
                 
-        except aiohttp.ClientError as err:
-            _LOGGER.error("Error requesting %s: %s", url, err)
-            raise
         except asyncio.TimeoutError as err:
+            if cut_by_deadline(endpoint, timeout, self.request_timeouts):
+                record.error = ERROR_DEADLINE
+            else:
+                record.error = "Timeout"
             _LOGGER.error("Timeout requesting %s", url)
             raise
+        except aiohttp.ClientError as err:
+            record.error = type(err).__name__
+            _LOGGER.error("Error requesting %s: %s", url, err)
+            raise
         except Exception as err:
+            record.error = type(err).__name__
             _LOGGER.error("Unexpected error requesting %s: %s", url, err)
             raise
+        finally:
+            self.request_trace.finish(record)
+            self.circuit_breaker.record_request(record)
     
     async def send_ir_code(
         self,
@@ -393,6 +771,7 @@ class HaptiqueCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         freq_khz: int = 38,
         duty: int = 33,
         repeat: int = 1,
+        deadline: Deadline | None = None,
     ) -> bool:
         """Send an IR code to the device."""
         try:
@@ -437,10 +816,70 @@ class HaptiqueCoordinator(DataUpdateCoordinator[dict[str, Any]]):
                 API_IR_SEND
             )
             
-            await self._request("POST", API_IR_SEND, payload)
+            await self._request("POST", API_IR_SEND, payload, deadline=deadline)
             _LOGGER.info("IR code sent successfully")
+            self.metrics.record_send(True)
             return True
             
         except Exception as err:
             _LOGGER.error("Failed to send IR code: %s", err)
+            self.metrics.record_send(False)
             return False
+
+    async def async_send_prepared(self, body: bytes, deadline: Deadline | None = None) -> bool:
+        """Send an already encoded /api/ir/send request."""
+        try:
+            await self._request("POST", API_IR_SEND, body, deadline=deadline)
+        except Exception as err:
+            _LOGGER.error("Failed to send IR code: %s", err)
+            self.metrics.record_send(False)
+            return False
+        self.metrics.record_send(True)
+        return True
+
+    def start_hold(
+        self,
+        command: dict[str, Any],
+        hold_secs: float = DEFAULT_HOLD_TIMEOUT,
+        session_id: str | None = None,
+        device_name: str | None = None,
+        command_name: str | None = None,
+    ) -> HoldSession:
+        """Repeat a stored command until released, releasing any held one."""
+        if self.hold_session:
+            self.hold_session.release()
+        
+        session = HoldSession(self, command, hold_secs, session_id, device_name, command_name)
+        self.hold_session = session
+        session.start()
+        self._fire_hold(session, "started")
+        return session
+
+    def release_hold(self, session_id: str | None = None) -> HoldSession | None:
+        """Release the held command, None if nothing (matching) is held."""
+        session = self.hold_session
+        if session is None or (session_id and session.session_id != session_id):
+            return None
+        session.release()
+        return session
+
+    @callback
+    def finish_hold(self, session: HoldSession) -> None:
+        """Forget an ended hold session and report how it went."""
+        if self.hold_session is session:
+            self.hold_session = None
+        self._fire_hold(session, session.status or "released")
+
+    def _fire_hold(self, session: HoldSession, status: str) -> None:
+        """Fire the event of a hold session."""
+        event = {
+            "operation": "hold",
+            "status": status,
+            "entity_type": "command",
+            "device_name": session.device_name,
+            "command_name": session.command_name,
+            "data": {**session.event_data(), "hold_secs": session.hold_secs},
+        }
+        if status == "error":
+            event["error"] = "Failed to send IR code"
+        self._events.fire(EVENT_OPERATION, event)
@@ -0,0 +1,68 @@
+"""Diagnostics support for Haptique Extender."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_TOKEN
+from homeassistant.core import HomeAssistant
+
+from .ac_codes import frame_cache_statistics
+from .const import DOMAIN
+from .coordinator import HaptiqueCoordinator
+from .ir_database import IRDatabase
+
+TO_REDACT = {CONF_TOKEN, "Authorization"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: HaptiqueCoordinator = hass.data[DOMAIN][entry.entry_id]
+    ir_db: IRDatabase = hass.data[DOMAIN]["ir_database"]
+
+    database = ir_db.get_statistics()
+    database["file_size"] = await hass.async_add_executor_job(ir_db.get_file_size)
+
+    return async_redact_data(
+        {
+            "entry": {
+                "title": entry.title,
+                "data": dict(entry.data),
+                "options": dict(entry.options),
+            },
+            "device_info": coordinator.device_info,
+            "coordinator": {
+                "last_update_success": coordinator.last_update_success,
+                "update_interval": str(coordinator.update_interval),
+                "learning_mode": coordinator.learning_mode,
+                "storage_info": coordinator.storage_info,
+                "ir_rx_info": coordinator.ir_rx_info,
+                "unchanged_refreshes": coordinator.metrics.unchanged_refreshes,
+                "avoided_writes": coordinator.metrics.avoided_writes,
+            },
+            "requests": coordinator.request_trace.as_dicts(),
+            "telemetry": {
+                "topic": coordinator.telemetry.prefix,
+                "connected": coordinator.telemetry.connected,
+                "received": coordinator.telemetry.received,
+            } if coordinator.telemetry else None,
+            "limits": {
+                "request_timeouts": coordinator.request_timeouts,
+                "refresh_timeout": coordinator.refresh_timeout,
+                "learning_poll_interval": coordinator.learning_poll_interval,
+                "max_concurrent_requests": coordinator.request_limiter.concurrency,
+                "request_queue_depth": coordinator.request_limiter.queue_depth,
+                "requests_active": coordinator.request_limiter.active,
+                "requests_waiting": coordinator.request_limiter.waiting,
+                "requests_rejected": coordinator.request_limiter.rejected,
+            },
+            "learning_history": list(coordinator.learning_history),
+            "database": database,
+            "ac_frame_cache": frame_cache_statistics(),
+            "events": hass.data[DOMAIN]["events"].get_statistics(),
+        },
+        TO_REDACT,
+    )
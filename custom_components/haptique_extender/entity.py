@@ -0,0 +1,82 @@
+"""Base entity of Haptique Extender coordinator entities."""
+from __future__ import annotations
+
+from collections.abc import Callable
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN
+from .coordinator import DataKeys, HaptiqueCoordinator
+
+# hass.data keys of the entities following the IR database device selected
+# on each hub, and of that device
+DEVICE_SELECTORS = "device_selectors"
+SELECTED_DEVICES = "selected_devices"
+
+
+@callback
+def async_add_device_selector(
+    hass: HomeAssistant, entry_id: str, set_device: Callable[[str | None], None]
+) -> Callable[[], None]:
+    """Call `set_device` with the device selected on a hub, now and on changes.
+
+    Returns a remover.
+    """
+    selectors = hass.data[DOMAIN].setdefault(DEVICE_SELECTORS, {}).setdefault(entry_id, [])
+    selectors.append(set_device)
+    selected = hass.data[DOMAIN].get(SELECTED_DEVICES, {}).get(entry_id)
+    if selected is not None:
+        set_device(selected)
+    return lambda: selectors.remove(set_device)
+
+
+@callback
+def async_select_device(
+    hass: HomeAssistant, device_name: str | None, entry_id: str | None = None
+) -> int:
+    """Select a device on one hub, or on all; return the entities told."""
+    selectors = hass.data[DOMAIN].get(DEVICE_SELECTORS, {})
+    selected = hass.data[DOMAIN].setdefault(SELECTED_DEVICES, {})
+    entry_ids = [entry_id] if entry_id else list(selectors)
+    told = 0
+    for selected_entry_id in entry_ids:
+        selected[selected_entry_id] = device_name
+        for set_device in list(selectors.get(selected_entry_id, ())):
+            set_device(device_name)
+            told += 1
+    return told
+
+
+class HaptiqueEntity(CoordinatorEntity[HaptiqueCoordinator]):
+    """Coordinator entity that only writes its state when it changed.
+
+    A refresh usually changes a few values (the RSSI) and leaves the other
+    entities as they were; those skip the write and count it as avoided.
+    Entities given `data_keys` are not even woken up unless one of those
+    keys changed.
+    """
+
+    _last_state: tuple | None = None
+
+    def __init__(
+        self, coordinator: HaptiqueCoordinator, data_keys: tuple[str, ...] | None = None
+    ) -> None:
+        """Initialize the entity, listening to all data or to some keys."""
+        super().__init__(coordinator, DataKeys(data_keys) if data_keys is not None else None)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only when the coordinator update changed it."""
+        state = (self.available, self.state, self.extra_state_attributes)
+        if state == self._last_state:
+            self.coordinator.metrics.record_avoided_write()
+            return
+        self.async_write_ha_state()
+        self._last_state = state
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state; it may have changed outside a coordinator update."""
+        self._last_state = None
+        super().async_write_ha_state()
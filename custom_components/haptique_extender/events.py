@@ -0,0 +1,185 @@
+"""Operation events of the Haptique Extender integration."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import uuid
+from collections import OrderedDict
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    DEFAULT_COALESCE_WINDOW,
+    EVENT_MODE_FULL,
+    EVENT_MODE_SLIM,
+    MAX_EVENT_PAYLOADS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+EVENT_OPERATION = "haptique_operation"
+EVENT_IR_CAPTURED = "haptique_ir_captured"
+
+# Names listed in a coalesced summary event
+MAX_SUMMARY_NAMES = 50
+
+
+class EventPublisher:
+    """Fire integration events, with their full payload or slim.
+
+    Every event of the integration goes through here. In full mode events
+    carry their whole payload, as they always did. In slim mode large
+    payloads (raw timings, command lists) are kept here under a reference
+    and the event only carries identifiers, fingerprints and sizes; the
+    payload can be fetched with `get_payload` while it is among the last
+    `max_payloads` ones.
+
+    Slim mode also rate-limits bursty operations: the first event of an
+    operation on a device fires at once, the following ones within
+    `coalesce_window` seconds are merged into one summary event fired at
+    the end of the window, carrying the data of the last one merged. Only
+    events fired with `coalesce` are merged; full mode fires every event
+    at once.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        mode: str = EVENT_MODE_FULL,
+        coalesce_window: float = DEFAULT_COALESCE_WINDOW,
+        max_payloads: int = MAX_EVENT_PAYLOADS,
+    ) -> None:
+        """Initialize the publisher."""
+        self.hass = hass
+        self.mode = mode
+        self.coalesce_window = coalesce_window
+        self.max_payloads = max_payloads
+        self.fired = 0
+        self.coalesced = 0
+
+        self._payloads: OrderedDict[str, Any] = OrderedDict()
+        # Summary being built for each (operation, status, entity type,
+        # device) in its window, None while nothing was merged yet
+        self._windows: dict[tuple, dict[str, Any] | None] = {}
+        self._timers: dict[tuple, asyncio.TimerHandle] = {}
+
+    @property
+    def slim(self) -> bool:
+        """Return True when events only carry references to large payloads."""
+        return self.mode == EVENT_MODE_SLIM
+
+    def get_payload(self, ref: str) -> Any | None:
+        """Return the payload behind a reference, None once it was dropped."""
+        return self._payloads.get(ref)
+
+    def _store(self, payload: Any) -> str:
+        """Keep a payload and return its reference."""
+        ref = uuid.uuid4().hex[:12]
+        self._payloads[ref] = payload
+        while len(self._payloads) > self.max_payloads:
+            self._payloads.popitem(last=False)
+        return ref
+
+    @callback
+    def fire(
+        self,
+        event_type: str,
+        event: dict[str, Any],
+        payload: dict[str, Any] | None = None,
+        coalesce: bool = False,
+    ) -> None:
+        """Fire an event, with its large payload inlined or by reference.
+
+        The payload goes where the event keeps its data: under "data" for
+        operation events, at the top level otherwise.
+        """
+        if payload is not None:
+            target = event.setdefault("data", {}) if event_type == EVENT_OPERATION else event
+            if self.slim:
+                target["ref"] = self._store(payload)
+            else:
+                target.update(payload)
+
+        if coalesce and self.slim:
+            key = (
+                event_type,
+                event.get("operation"),
+                event.get("status"),
+                event.get("entity_type"),
+                event.get("device_name"),
+            )
+            if key in self._windows:
+                self._merge(key, event)
+                return
+            self._open_window(key)
+
+        self.fired += 1
+        self.hass.bus.async_fire(event_type, event)
+
+    def _open_window(self, key: tuple) -> None:
+        """Start merging the events of a key for one window."""
+        self._windows[key] = None
+        self._timers[key] = self.hass.loop.call_later(
+            self.coalesce_window, self._flush, key
+        )
+
+    def _merge(self, key: tuple, event: dict[str, Any]) -> None:
+        """Add an event to the summary of its window.
+
+        The summary is the last event merged, its data extended with the
+        count and the command names of the whole window.
+        """
+        self.coalesced += 1
+        previous = self._windows[key]
+        count = previous["data"]["coalesced"] if previous else 0
+        names = previous["data"]["names"] if previous else []
+        name = event.get("command_name")
+        if name and len(names) < MAX_SUMMARY_NAMES:
+            names.append(name)
+
+        summary = self._windows[key] = {
+            **event,
+            "data": {**event.get("data", {}), "coalesced": count + 1, "names": names},
+        }
+        if previous and previous.get("command_name") != name:
+            summary["command_name"] = None
+
+    @callback
+    def _flush(self, key: tuple) -> None:
+        """Fire the summary of a window; keep limiting while the burst goes on."""
+        self._timers.pop(key, None)
+        summary = self._windows.pop(key, None)
+        if summary is None:
+            return
+
+        _LOGGER.debug(
+            "%d %s events coalesced for '%s'",
+            summary["data"]["coalesced"],
+            key[1] or key[0],
+            key[4],
+        )
+        self.fired += 1
+        self.hass.bus.async_fire(key[0], summary)
+        self._open_window(key)
+
+    @callback
+    def async_flush(self) -> None:
+        """Fire every pending summary now."""
+        for key, timer in list(self._timers.items()):
+            timer.cancel()
+            self._timers.pop(key)
+            summary = self._windows.pop(key, None)
+            if summary is not None:
+                self.fired += 1
+                self.hass.bus.async_fire(key[0], summary)
+
+    def get_statistics(self) -> dict[str, Any]:
+        """Return counters for diagnostics."""
+        return {
+            "mode": self.mode,
+            "coalesce_window": self.coalesce_window,
+            "fired": self.fired,
+            "coalesced": self.coalesced,
+            "payloads": len(self._payloads),
+        }
@@ -1,59 +1,132 @@
 """Firmware IR Storage API Helper for Haptique Extender."""
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import Any
 
 import aiohttp
 
+from .circuit_breaker import CircuitBreaker
+from .codec import json_dumps, json_loads
+from .const import (
+    API_IR_CLEAR,
+    API_IR_DELETE,
+    API_IR_SAVE,
+    API_IR_SAVED,
+    API_IR_SEND_NAME,
+    DEFAULT_REQUEST_TIMEOUTS,
+)
+from .request_limiter import RequestLimiter
+from .request_trace import ERROR_DEADLINE, RequestTrace
+from .timeouts import Deadline, cut_by_deadline, request_timeout
+
 _LOGGER = logging.getLogger(__name__)
 
 
 class FirmwareIRStorage:
     """Helper class to interact with firmware's IR command storage API."""
 
-    def __init__(self, host: str, token: str, session: aiohttp.ClientSession) -> None:
+    def __init__(
+        self,
+        host: str,
+        token: str,
+        session: aiohttp.ClientSession,
+        request_trace: RequestTrace | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        request_timeouts: dict[str, tuple[float, float, float]] | None = None,
+        request_limiter: RequestLimiter | None = None,
+    ) -> None:
         """Initialize the firmware storage helper."""
         self.host = host
         self.token = token
         self.session = session
         self.base_url = f"http://{host}"
+        self.request_trace = request_trace or RequestTrace()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker(host)
+        self.request_timeouts = (
+            request_timeouts if request_timeouts is not None else dict(DEFAULT_REQUEST_TIMEOUTS)
+        )
+        self.request_limiter = request_limiter or RequestLimiter(host)
 
     async def _request(
         self,
         method: str,
         endpoint: str,
-        data: dict[str, Any] | None = None
+        data: dict[str, Any] | None = None,
+        deadline: Deadline | None = None,
+    ) -> dict[str, Any]:
+        """Make a request to the firmware API once the hub has a free slot."""
+        await self.request_limiter.acquire(deadline)
+        try:
+            return await self._do_request(method, endpoint, data, deadline)
+        finally:
+            self.request_limiter.release()
+
+    async def _do_request(
+        self,
+        method: str,
+        endpoint: str,
+        data: dict[str, Any] | None = None,
+        deadline: Deadline | None = None,
     ) -> dict[str, Any]:
         """Make a request to the firmware API."""
         url = f"{self.base_url}{endpoint}"
+        timeout = request_timeout(endpoint, deadline, self.request_timeouts)
         headers = {"Authorization": f"Bearer {self.token}"} if self.token else {}
         
+        self.circuit_breaker.before_request()
+        record = self.request_trace.start(method, endpoint)
+        body = None
+        if data is not None:
+            body = json_dumps(data)
+            headers["Content-Type"] = "application/json"
+            record.request_bytes = len(body)
+        
         try:
             async with self.session.request(
                 method,
                 url,
-                json=data,
+                data=body,
                 headers=headers,
-                timeout=aiohttp.ClientTimeout(total=10)
+                timeout=timeout,
+                trace_request_ctx=record,
             ) as resp:
+                record.status = resp.status
+                raw = await resp.read()
+                record.response_bytes = len(raw)
                 if resp.status == 401:
                     raise Exception("Authentication failed")
                 if resp.status != 200:
                     # Try to get error details from response
                     try:
-                        error_data = await resp.json()
+                        error_data = json_loads(raw)
                         error_msg = error_data.get("error", error_data.get("message", "Unknown error"))
                         raise Exception(f"HTTP {resp.status}: {error_msg}")
                     except:
                         # If JSON parsing fails, get text response
                         error_text = await resp.text()
                         raise Exception(f"HTTP {resp.status}: {error_text[:200]}")
-                return await resp.json()
+                return json_loads(raw)
+        except asyncio.TimeoutError as err:
+            if cut_by_deadline(endpoint, timeout, self.request_timeouts):
+                record.error = ERROR_DEADLINE
+            else:
+                record.error = type(err).__name__
+            if isinstance(err, aiohttp.ClientError):
+                raise Exception(f"Request failed: {err}") from err
+            raise
         except aiohttp.ClientError as err:
+            record.error = type(err).__name__
             raise Exception(f"Request failed: {err}") from err
+        except Exception as err:
+            record.error = type(err).__name__
+            raise
+        finally:
+            self.request_trace.finish(record)
+            self.circuit_breaker.record_request(record)
 
-    async def save_last_ir(self, name: str) -> bool:
+    async def save_last_ir(self, name: str, deadline: Deadline | None = None) -> bool:
         """Save the last received IR code with a name."""
         try:
             payload = {"name": name}
@@ -61,17 +134,18 @@ class FirmwareIRStorage:
             # Debug: Log complete request details
             _LOGGER.debug(
                 "=== FIRMWARE SAVE REQUEST ===\n"
-                "URL: %s/api/ir/save\n"
+                "URL: %s%s\n"
                 "Method: POST\n"
                 "Headers: Authorization: Bearer %s...\n"
                 "Payload: %s\n"
                 "=============================",
                 self.base_url,
+                API_IR_SAVE,
                 self.token[:20] if self.token else "None",
                 payload
             )
             
-            result = await self._request("POST", "/api/ir/save", payload)
+            result = await self._request("POST", API_IR_SAVE, payload, deadline)
             
             # Debug: Log response
             _LOGGER.debug(
@@ -87,37 +161,37 @@ class FirmwareIRStorage:
             _LOGGER.error("Failed to save IR command '%s': %s", name, err)
             return False
 
-    async def list_saved_ir(self) -> list[str]:
+    async def list_saved_ir(self, deadline: Deadline | None = None) -> list[str]:
         """List all saved IR command names."""
         try:
-            result = await self._request("GET", "/api/ir/saved")
+            result = await self._request("GET", API_IR_SAVED, deadline=deadline)
             return result.get("names", [])
         except Exception as err:
             _LOGGER.error("Failed to list saved IR commands: %s", err)
             return []
 
-    async def send_ir_by_name(self, name: str) -> bool:
+    async def send_ir_by_name(self, name: str, deadline: Deadline | None = None) -> bool:
         """Send a saved IR command by name."""
         try:
-            result = await self._request("POST", "/api/ir/send/name", {"name": name})
+            result = await self._request("POST", API_IR_SEND_NAME, {"name": name}, deadline)
             return result.get("status") == "sent"
         except Exception as err:
             _LOGGER.error("Failed to send IR command '%s': %s", name, err)
             return False
 
-    async def delete_ir_command(self, name: str) -> bool:
+    async def delete_ir_command(self, name: str, deadline: Deadline | None = None) -> bool:
         """Delete a saved IR command."""
         try:
-            result = await self._request("DELETE", "/api/ir/delete", {"name": name})
+            result = await self._request("DELETE", API_IR_DELETE, {"name": name}, deadline)
             return result.get("status") == "deleted"
         except Exception as err:
             _LOGGER.error("Failed to delete IR command '%s': %s", name, err)
             return False
 
-    async def clear_all_ir(self) -> bool:
+    async def clear_all_ir(self, deadline: Deadline | None = None) -> bool:
         """Clear all saved IR commands."""
         try:
-            result = await self._request("POST", "/api/ir/clear")
+            result = await self._request("POST", API_IR_CLEAR, deadline=deadline)
             return result.get("status") == "cleared"
         except Exception as err:
             _LOGGER.error("Failed to clear IR commands: %s", err)
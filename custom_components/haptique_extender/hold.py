@@ -0,0 +1,151 @@
+"""Press-and-hold sends of Haptique Extender hubs."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import uuid
+from typing import TYPE_CHECKING, Any
+
+from .codec import json_dumps
+from .const import DEFAULT_HOLD_TIMEOUT, DEFAULT_SEND_TIMEOUT, HOLD_BATCH_SECS
+from .ir_signal import DEFAULT_REPEAT_GAP_US, frame_period_ms, split_frames
+from .timeouts import Deadline
+
+if TYPE_CHECKING:
+    from .coordinator import HaptiqueCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Repeat intervals below this are not realistic, a capture without gaps
+MIN_FRAME_PERIOD_MS = 20.0
+
+
+class HoldSession:
+    """A command repeated at its native rate while its button is held.
+
+    Rather than one request per frame, every request asks the hub for the
+    frames of the next HOLD_BATCH_SECS through the `repeat` field, and the
+    next request is due when those frames are out, on a fixed schedule so
+    timing errors do not add up. Only the first frame of the command is
+    repeated, so a capture holding several frames keeps to the schedule.
+    Request bodies are encoded once and reused over the coordinator's
+    keep-alive connection. The session ends when released, after
+    `hold_secs`, or on the first failed send.
+    """
+
+    def __init__(
+        self,
+        coordinator: HaptiqueCoordinator,
+        command: dict[str, Any],
+        hold_secs: float = DEFAULT_HOLD_TIMEOUT,
+        session_id: str | None = None,
+        device_name: str | None = None,
+        command_name: str | None = None,
+    ) -> None:
+        """Initialize the session, encoding the full-batch request."""
+        self.coordinator = coordinator
+        self.session_id = session_id or uuid.uuid4().hex[:8]
+        self.device_name = device_name
+        self.command_name = command_name
+        self.hold_secs = hold_secs
+        frame = split_frames(command["raw"])[0]
+        if len(frame) % 2:
+            # Ends on a mark, repeats need a gap in between
+            frame = [*frame, DEFAULT_REPEAT_GAP_US]
+        self.frame_period = max(frame_period_ms(frame), MIN_FRAME_PERIOD_MS) / 1000
+        self.batch_frames = max(1, round(HOLD_BATCH_SECS / self.frame_period))
+
+        self.frames_sent = 0
+        self.requests = 0
+        self.max_lateness_ms = 0.0
+        self.status: str | None = None
+
+        self._request = {
+            "freq": command["freq_khz"] * 1000,
+            "duty": command["duty"],
+            "raw": frame,
+        }
+        self._bodies: dict[int, bytes] = {}
+        self._body(self.batch_frames)
+        self._released = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def hub(self) -> str:
+        """Return the hub the session sends on."""
+        return self.coordinator.host
+
+    def event_data(self) -> dict[str, Any]:
+        """Return the fields describing the session in events."""
+        return {
+            "session_id": self.session_id,
+            "hub": self.hub,
+            "frame_period_ms": round(self.frame_period * 1000, 1),
+            "frames_sent": self.frames_sent,
+            "requests": self.requests,
+            "max_lateness_ms": round(self.max_lateness_ms, 1),
+        }
+
+    def start(self) -> None:
+        """Start sending."""
+        self._task = self.coordinator.hass.async_create_background_task(
+            self._async_run(), f"haptique_hold_{self.session_id}"
+        )
+
+    def release(self) -> None:
+        """Stop after the frames already requested."""
+        self._released.set()
+
+    async def async_wait(self) -> None:
+        """Wait for the session to end."""
+        if self._task:
+            await asyncio.shield(self._task)
+
+    def _body(self, frames: int) -> bytes:
+        """Return the encoded request for `frames` repeats, built once."""
+        body = self._bodies.get(frames)
+        if body is None:
+            body = self._bodies[frames] = json_dumps({**self._request, "repeat": frames})
+        return body
+
+    async def _async_run(self) -> None:
+        """Send batches on schedule until released or timed out."""
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        end = start + self.hold_secs
+        due = start
+
+        while True:
+            frames = min(self.batch_frames, math.ceil((end - due) / self.frame_period))
+            if frames <= 0:
+                self.status = "timeout"
+                break
+
+            self.max_lateness_ms = max(self.max_lateness_ms, (loop.time() - due) * 1000)
+            self.requests += 1
+            if not await self.coordinator.async_send_prepared(
+                self._body(frames), Deadline(DEFAULT_SEND_TIMEOUT)
+            ):
+                self.status = "error"
+                break
+            self.frames_sent += frames
+
+            # Due when the hub is done sending this batch
+            due += frames * self.frame_period
+            try:
+                await asyncio.wait_for(self._released.wait(), max(0.0, due - loop.time()))
+            except asyncio.TimeoutError:
+                continue
+            self.status = "released"
+            break
+
+        _LOGGER.info(
+            "Hold %s on %s %s after %d frames in %d requests",
+            self.session_id,
+            self.hub,
+            self.status,
+            self.frames_sent,
+            self.requests,
+        )
+        self.coordinator.finish_hold(self)
@@ -1,17 +1,53 @@
 """IR Database for Haptique Extender - Case-Insensitive Version."""
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
+import os
 import re
+import time
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
 from homeassistant.core import HomeAssistant
 from homeassistant.util import dt as dt_util
 
+from .codec import json_dumps, json_dumps_pretty, json_loads
+from .ir_signal import normalize_command, timings_match, trim_repeated_command
+
 _LOGGER = logging.getLogger(__name__)
 
+# The journal is compacted into the database file once it grows past half
+# the file size, so rewriting the file costs at most twice the changes made
+JOURNAL_MIN_COMPACT_BYTES = 256 * 1024
+JOURNAL_COMPACT_RATIO = 0.5
+
+JOURNAL_PUT_DEVICE = "put_device"
+JOURNAL_PUT_COMMAND = "put_command"
+JOURNAL_DELETE_COMMAND = "delete_command"
+JOURNAL_DELETE_DEVICE = "delete_device"
+JOURNAL_PUT_AC = "put_ac"
+
+
+@dataclass(slots=True)
+class _Transaction:
+    """Working copy of the database held by the task running a transaction."""
+
+    database: IRDatabase
+    data: dict[str, Any]
+    records: list[dict[str, Any]] = field(default_factory=list)
+    copied_devices: set[str] = field(default_factory=set)
+    full_save: bool = False
+
+
+_TRANSACTION: ContextVar[_Transaction | None] = ContextVar(
+    "haptique_ir_transaction", default=None
+)
+
 
 class InvalidNameError(Exception):
     """Exception raised when a name contains invalid characters."""
@@ -56,61 +92,253 @@ class IRDatabase:
         self.hass = hass
         self._data: dict[str, Any] = {"devices": {}}
         self._file_path = Path(hass.config.path("haptique_ir_database.json"))
+        self._journal_path = Path(hass.config.path("haptique_ir_database.journal"))
+        
+        # Mutations are appended to the journal instead of rewriting the file
+        self._journal_lock = asyncio.Lock()
+        self._journal_bytes = 0
+        self._journal_records = 0
+        self._file_bytes = 0
+        self._compact_task: asyncio.Task | None = None
+        
+        # Writers are serialized; readers see the last committed data
+        self._write_lock = asyncio.Lock()
+        self._listeners: list[Callable[[list[dict[str, Any]]], None]] = []
+        
+        # Duration of the last load and save, in milliseconds
+        self.last_load_ms: float | None = None
+        self.last_save_ms: float | None = None
+        
+        # Shared by every entry waiting for the first load
+        self._load_task: asyncio.Task | None = None
+
+    @property
+    def _devices(self) -> dict[str, Any]:
+        """Return the devices as seen by the current task."""
+        transaction = _TRANSACTION.get()
+        if transaction and transaction.database is self:
+            return transaction.data["devices"]
+        return self._data["devices"]
+
+    def add_listener(
+        self, listener: Callable[[list[dict[str, Any]]], None]
+    ) -> Callable[[], None]:
+        """Call `listener` with the records of every commit; return a remover."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[IRDatabase]:
+        """Apply several mutations atomically, with one write and one notification.
+
+        Writers wait for each other. Until the transaction commits, other
+        tasks keep reading the last committed data; an exception inside the
+        block discards every change. Mutations made inside a transaction
+        join it.
+        """
+        current = _TRANSACTION.get()
+        if current and current.database is self:
+            yield self
+            return
+        
+        async with self._write_lock:
+            # Devices are copied on their first change, the rest is shared
+            transaction = _Transaction(
+                self, {**self._data, "devices": dict(self._data["devices"])}
+            )
+            token = _TRANSACTION.set(transaction)
+            try:
+                yield self
+            finally:
+                _TRANSACTION.reset(token)
+            
+            if not transaction.records:
+                return
+            self._data = transaction.data
+            if transaction.full_save:
+                await self.async_save()
+            else:
+                await self._async_journal(transaction.records)
+        
+        for listener in list(self._listeners):
+            listener(transaction.records)
+
+    def _stage(self, operation: str, device: str, **fields: Any) -> None:
+        """Apply a mutation to the working copy of the current transaction."""
+        transaction = _TRANSACTION.get()
+        if not transaction or transaction.database is not self:
+            raise RuntimeError("IR database mutations need a transaction")
+        
+        devices = transaction.data["devices"]
+        if (
+            operation in (JOURNAL_PUT_COMMAND, JOURNAL_DELETE_COMMAND, JOURNAL_PUT_AC)
+            and device in devices
+            and device not in transaction.copied_devices
+        ):
+            devices[device] = {**devices[device], "commands": dict(devices[device]["commands"])}
+        transaction.copied_devices.add(device)
+        
+        record = {"op": operation, "device": device, **fields}
+        self._apply(transaction.data, record)
+        transaction.records.append(record)
 
     def _find_device_key(self, device_name: str) -> str | None:
         """Find the actual device key (case-insensitive)."""
         device_lower = device_name.lower()
-        for key in self._data["devices"].keys():
+        for key in self._devices.keys():
             if key.lower() == device_lower:
                 return key
         return None
 
     def _find_command_key(self, device_key: str, command_name: str) -> str | None:
         """Find the actual command key (case-insensitive)."""
-        if device_key not in self._data["devices"]:
+        if device_key not in self._devices:
             return None
         command_lower = command_name.lower()
-        for key in self._data["devices"][device_key]["commands"].keys():
+        for key in self._devices[device_key]["commands"].keys():
             if key.lower() == command_lower:
                 return key
         return None
 
     async def async_load(self) -> None:
-        """Load database from file."""
+        """Load database from file, then replay the journal on top of it."""
         try:
-            if self._file_path.exists():
-                await self.hass.async_add_executor_job(self._load_sync)
-                _LOGGER.info("IR database loaded: %d devices", len(self._data["devices"]))
-            else:
-                _LOGGER.info("No existing IR database found, starting fresh")
+            start = time.perf_counter()
+            await self.hass.async_add_executor_job(self._load_sync)
+            self.last_load_ms = round((time.perf_counter() - start) * 1000, 1)
+            _LOGGER.info(
+                "IR database loaded: %d devices, %d journal record(s) replayed",
+                len(self._data["devices"]),
+                self._journal_records,
+            )
         except Exception as err:
             _LOGGER.error("Error loading IR database: %s", err)
             self._data = {"devices": {}}
+            return
+        
+        self._async_schedule_compaction()
+
+    async def async_ensure_loaded(self) -> None:
+        """Load the database once, however many entries are being set up."""
+        if self._load_task is None:
+            self._load_task = self.hass.async_create_task(self.async_load())
+        # A cancelled entry setup must not cancel the load for the others
+        await asyncio.shield(self._load_task)
 
     def _load_sync(self) -> None:
         """Synchronous load operation."""
-        with open(self._file_path, encoding="utf-8") as file:
-            self._data = json.load(file)
+        if self._file_path.exists():
+            payload = self._file_path.read_bytes()
+            self._file_bytes = len(payload)
+            self._data = json_loads(payload)
+        else:
+            _LOGGER.info("No existing IR database found, starting fresh")
+        
+        self._journal_bytes = 0
+        self._journal_records = 0
+        if not self._journal_path.exists():
+            return
+        
+        with open(self._journal_path, "rb") as file:
+            for line in file:
+                self._journal_bytes += len(line)
+                try:
+                    record = json_loads(line)
+                except ValueError:
+                    # Torn write from a crash, only ever the last line
+                    _LOGGER.warning("Skipping unreadable IR database journal record")
+                    continue
+                self._apply(self._data, record)
+                self._journal_records += 1
+
+    @staticmethod
+    def _apply(data: dict[str, Any], record: dict[str, Any]) -> None:
+        """Apply one journal record; replaying a record twice is harmless."""
+        devices = data["devices"]
+        operation = record["op"]
+        
+        if operation == JOURNAL_PUT_DEVICE:
+            # Copied, so later commands do not end up in the record
+            device_data = record["data"]
+            devices[record["device"]] = {**device_data, "commands": dict(device_data["commands"])}
+        elif operation == JOURNAL_PUT_COMMAND:
+            device = devices.setdefault(record["device"], {"created_at": None, "commands": {}})
+            device["commands"][record["command"]] = record["data"]
+        elif operation == JOURNAL_DELETE_COMMAND:
+            if record["device"] in devices:
+                devices[record["device"]]["commands"].pop(record["command"], None)
+        elif operation == JOURNAL_DELETE_DEVICE:
+            devices.pop(record["device"], None)
+        elif operation == JOURNAL_PUT_AC:
+            device = devices.setdefault(record["device"], {"created_at": None, "commands": {}})
+            device["ac"] = record["data"]
+        else:
+            _LOGGER.warning("Unknown IR database journal operation: %s", operation)
 
-    def _save_sync(self) -> None:
-        """Synchronous save operation."""
-        with open(self._file_path, "w", encoding="utf-8") as file:
-            json.dump(self._data, file, indent=2, ensure_ascii=False)
+    def _append_sync(self, line: bytes) -> None:
+        """Append an encoded record to the journal."""
+        with open(self._journal_path, "ab") as file:
+            file.write(line)
+
+    async def _async_journal(self, records: list[dict[str, Any]]) -> None:
+        """Append committed records to the journal in a single write."""
+        # Encoded in the event loop, committed data is never changed in place
+        lines = b"".join(json_dumps(record) + b"\n" for record in records)
+        try:
+            async with self._journal_lock:
+                await self.hass.async_add_executor_job(self._append_sync, lines)
+                self._journal_bytes += len(lines)
+                self._journal_records += len(records)
+        except Exception as err:
+            _LOGGER.error("Error writing IR database journal: %s", err)
+            return
+        
+        self._async_schedule_compaction()
+
+    def _async_schedule_compaction(self) -> None:
+        """Compact the journal in the background once it has grown enough."""
+        threshold = max(JOURNAL_MIN_COMPACT_BYTES, self._file_bytes * JOURNAL_COMPACT_RATIO)
+        if self._journal_bytes < threshold:
+            return
+        if self._compact_task and not self._compact_task.done():
+            return
+        self._compact_task = self.hass.async_create_background_task(
+            self.async_save(), "haptique_ir_database_compaction"
+        )
+
+    def _write_sync(self, payload: bytes) -> None:
+        """Replace the database file and empty the journal it now includes."""
+        temp_path = self._file_path.with_suffix(".tmp")
+        temp_path.write_bytes(payload)
+        os.replace(temp_path, self._file_path)
+        if self._journal_path.exists():
+            self._journal_path.unlink()
+        self._file_bytes = len(payload)
+        self._journal_bytes = 0
+        self._journal_records = 0
+
+    def _save_sync(self, data: dict[str, Any] | None = None) -> None:
+        """Encode and write the database, or a snapshot of it."""
+        self._write_sync(json_dumps_pretty(self._data if data is None else data))
         _LOGGER.debug("IR database saved")
     
     async def async_save(self) -> None:
-        """Save database to file asynchronously."""
+        """Save the whole database to file and compact the journal."""
         try:
-            await self.hass.async_add_executor_job(self._save_sync)
+            async with self._journal_lock:
+                start = time.perf_counter()
+                # Committed data is never changed in place, so the current
+                # data stays a consistent snapshot while encoded off the loop
+                await self.hass.async_add_executor_job(self._save_sync, self._data)
+                self.last_save_ms = round((time.perf_counter() - start) * 1000, 1)
+            _LOGGER.debug("IR database saved")
         except Exception as err:
             _LOGGER.error("Error saving IR database: %s", err)
     
     def _save(self) -> None:
         """Save database to file (deprecated - use async_save)."""
         try:
-            with open(self._file_path, "w", encoding="utf-8") as file:
-                json.dump(self._data, file, indent=2, ensure_ascii=False)
-            _LOGGER.debug("IR database saved")
+            self._save_sync()
         except Exception as err:
             _LOGGER.error("Error saving IR database: %s", err)
 
@@ -123,18 +351,21 @@ class IRDatabase:
             _LOGGER.error("Cannot add device: %s", err)
             return False
         
-        # Check if device already exists (case-insensitive)
-        existing_key = self._find_device_key(device_name)
-        if existing_key:
-            _LOGGER.info("Device '%s' already exists (found as '%s')", device_name, existing_key)
-            return True
-        
-        # Create new device
-        self._data["devices"][device_name] = {
-            "created_at": dt_util.utcnow().isoformat(),
-            "commands": {},
-        }
-        await self.async_save()
+        async with self.transaction():
+            # Check if device already exists (case-insensitive)
+            existing_key = self._find_device_key(device_name)
+            if existing_key:
+                _LOGGER.info(
+                    "Device '%s' already exists (found as '%s')", device_name, existing_key
+                )
+                return True
+            
+            # Create new device
+            device_data = {
+                "created_at": dt_util.utcnow().isoformat(),
+                "commands": {},
+            }
+            self._stage(JOURNAL_PUT_DEVICE, device_name, data=device_data)
         _LOGGER.info("Device '%s' added to database", device_name)
         return True
 
@@ -146,6 +377,7 @@ class IRDatabase:
         duty: int,
         repeat: int,
         raw_data: list[int],
+        quality: int | None = None,
     ) -> bool:
         """Add or update a command for a device."""
         try:
@@ -156,23 +388,35 @@ class IRDatabase:
             _LOGGER.error("Cannot add command: %s", err)
             return False
         
-        # Find actual device key (case-insensitive)
-        device_key = self._find_device_key(device_name)
-        if not device_key:
-            # Device doesn't exist, create it
-            await self.add_device(device_name)
-            device_key = device_name
-
-        _LOGGER.info("Adding command '%s' to device '%s'", command_name, device_key)
-
-        self._data["devices"][device_key]["commands"][command_name] = {
-            "freq_khz": freq_khz,
-            "duty": duty,
-            "repeat": repeat,
-            "raw": raw_data,
-            "learned_at": dt_util.utcnow().isoformat(),
-        }
-        await self.async_save()
+        async with self.transaction():
+            # Find actual device key (case-insensitive)
+            device_key = self._find_device_key(device_name)
+            if not device_key:
+                # Device doesn't exist, create it
+                await self.add_device(device_name)
+                device_key = device_name
+
+            _LOGGER.info("Adding command '%s' to device '%s'", command_name, device_key)
+
+            # Re-learning the same button keeps the stored timings, jitter
+            # across a rounding step would change the code for nothing
+            command_key = self._find_command_key(device_key, command_name)
+            if command_key:
+                stored_raw = self._devices[device_key]["commands"][command_key].get("raw", [])
+                if timings_match(stored_raw, raw_data):
+                    raw_data = stored_raw
+
+            command_data = {
+                "freq_khz": freq_khz,
+                "duty": duty,
+                "repeat": repeat,
+                "raw": raw_data,
+                "learned_at": dt_util.utcnow().isoformat(),
+            }
+            if quality is not None:
+                command_data["quality"] = quality
+
+            self._stage(JOURNAL_PUT_COMMAND, device_key, command=command_name, data=command_data)
         _LOGGER.info("Command '%s' added to device '%s'", command_name, device_key)
         return True
 
@@ -205,20 +449,61 @@ class IRDatabase:
             return None
         
         _LOGGER.debug("Found command '%s' for device '%s'", command_key, device_key)
-        return self._data["devices"][device_key]["commands"][command_key]
+        return self._devices[device_key]["commands"][command_key]
+
+    async def set_ac(self, device_name: str, protocol: str, state: dict[str, Any]) -> bool:
+        """Store the AC protocol of a device and the state last sent to it.
+
+        The codes of an AC are generated from this descriptor, none of them
+        is stored.
+        """
+        try:
+            device_name = validate_name(device_name)
+        except InvalidNameError as err:
+            _LOGGER.error("Cannot set AC protocol: %s", err)
+            return False
+        
+        async with self.transaction():
+            device_key = self._find_device_key(device_name)
+            if not device_key:
+                await self.add_device(device_name)
+                device_key = device_name
+            
+            self._stage(
+                JOURNAL_PUT_AC, device_key, data={"protocol": protocol, "state": dict(state)}
+            )
+        return True
+
+    def get_ac(self, device_name: str) -> dict[str, Any] | None:
+        """Return the AC descriptor of a device (case-insensitive), None if it has none."""
+        device_key = self._find_device_key(device_name)
+        if not device_key:
+            return None
+        return self._devices[device_key].get("ac")
 
     def list_devices(self) -> list[dict[str, Any]]:
         """List all devices."""
         devices = []
-        for device_name in self._data["devices"]:
-            device_data = self._data["devices"][device_name]
+        for device_name, device_data in self._devices.items():
             devices.append({
                 "name": device_name,
                 "created_at": device_data.get("created_at"),
                 "command_count": len(device_data.get("commands", {})),
+                "ac_protocol": device_data.get("ac", {}).get("protocol"),
             })
         return devices
 
+    def device_names(self) -> list[str]:
+        """Return the names of all devices."""
+        return list(self._devices)
+
+    def command_names(self, device_name: str) -> list[str]:
+        """Return the command names of a device (case-insensitive), [] if unknown."""
+        device_key = self._find_device_key(device_name)
+        if not device_key:
+            return []
+        return list(self._devices[device_key]["commands"])
+
     def list_commands(self, device_name: str) -> list[dict[str, Any]]:
         """List all commands for a device (case-insensitive)."""
         try:
@@ -235,7 +520,7 @@ class IRDatabase:
             return []
 
         commands = []
-        device_commands = self._data["devices"][device_key]["commands"]
+        device_commands = self._devices[device_key]["commands"]
         
         for command_name, command_data in device_commands.items():
             commands.append({
@@ -244,6 +529,7 @@ class IRDatabase:
                 "duty": command_data.get("duty"),
                 "repeat": command_data.get("repeat"),
                 "learned_at": command_data.get("learned_at"),
+                "tags": command_data.get("tags", []),
             })
         
         return commands
@@ -258,37 +544,37 @@ class IRDatabase:
             _LOGGER.error("Cannot delete command: %s", err)
             return False
         
-        # Find actual device key (case-insensitive)
-        device_key = self._find_device_key(device_name)
-        if not device_key:
-            _LOGGER.warning("Device '%s' not found", device_name)
-            return False
-        
-        # Find actual command key (case-insensitive)
-        command_key = self._find_command_key(device_key, command_name)
-        if not command_key:
-            _LOGGER.warning(
-                "Command '%s' not found in device '%s'",
-                command_name,
-                device_key,
-            )
-            return False
+        async with self.transaction():
+            # Find actual device key (case-insensitive)
+            device_key = self._find_device_key(device_name)
+            if not device_key:
+                _LOGGER.warning("Device '%s' not found", device_name)
+                return False
+            
+            # Find actual command key (case-insensitive)
+            command_key = self._find_command_key(device_key, command_name)
+            if not command_key:
+                _LOGGER.warning(
+                    "Command '%s' not found in device '%s'",
+                    command_name,
+                    device_key,
+                )
+                return False
+            
+            self._stage(JOURNAL_DELETE_COMMAND, device_key, command=command_key)
+            
+            # If no more commands, optionally delete device
+            if not self._devices[device_key]["commands"]:
+                _LOGGER.info(
+                    "Device '%s' has no more commands",
+                    device_key,
+                )
         
-        del self._data["devices"][device_key]["commands"][command_key]
-        await self.async_save()
         _LOGGER.info(
             "Command '%s' deleted from device '%s'",
             command_key,
             device_key,
         )
-        
-        # If no more commands, optionally delete device
-        if not self._data["devices"][device_key]["commands"]:
-            _LOGGER.info(
-                "Device '%s' has no more commands",
-                device_key,
-            )
-        
         return True
 
     async def delete_device(self, device_name: str) -> bool:
@@ -300,17 +586,260 @@ class IRDatabase:
             _LOGGER.error("Cannot delete device: %s", err)
             return False
         
-        # Find actual device key (case-insensitive)
-        device_key = self._find_device_key(device_name)
-        if not device_key:
-            _LOGGER.warning("Device '%s' not found", device_name)
-            return False
-        
-        del self._data["devices"][device_key]
-        await self.async_save()
+        async with self.transaction():
+            # Find actual device key (case-insensitive)
+            device_key = self._find_device_key(device_name)
+            if not device_key:
+                _LOGGER.warning("Device '%s' not found", device_name)
+                return False
+            
+            self._stage(JOURNAL_DELETE_DEVICE, device_key)
         _LOGGER.info("Device '%s' deleted", device_key)
         return True
 
+    async def delete_commands(
+        self, device_name: str, command_names: list[str]
+    ) -> dict[str, list[str]] | None:
+        """Delete several commands of a device, None if the device is unknown."""
+        try:
+            device_name = validate_name(device_name)
+        except InvalidNameError as err:
+            _LOGGER.error("Cannot delete commands: %s", err)
+            return None
+        
+        deleted: list[str] = []
+        missing: list[str] = []
+        async with self.transaction():
+            device_key = self._find_device_key(device_name)
+            if not device_key:
+                _LOGGER.warning("Device '%s' not found", device_name)
+                return None
+            
+            # One lookup table instead of a key scan per command
+            command_keys = {key.lower(): key for key in self._devices[device_key]["commands"]}
+            for command_name in command_names:
+                command_key = command_keys.pop(str(command_name).strip().lower(), None)
+                if command_key is None:
+                    missing.append(command_name)
+                    continue
+                self._stage(JOURNAL_DELETE_COMMAND, device_key, command=command_key)
+                deleted.append(command_key)
+        
+        _LOGGER.info(
+            "%d command(s) deleted from device '%s', %d not found",
+            len(deleted),
+            device_key,
+            len(missing),
+        )
+        return {"deleted": deleted, "missing": missing}
+
+    async def rename_device(
+        self, device_name: str, new_name: str, merge: bool = False
+    ) -> dict[str, Any] | None:
+        """Rename a device, or merge it into an existing one if `merge` is set.
+
+        When merging, commands already on the target device are kept.
+        Returns None if the device is unknown or the target exists without
+        `merge`.
+        """
+        return await self._transfer_device(device_name, new_name, merge, keep_source=False)
+
+    async def copy_device(
+        self, device_name: str, new_name: str, merge: bool = False
+    ) -> dict[str, Any] | None:
+        """Copy the commands of a device to a new device, or merge into one."""
+        return await self._transfer_device(device_name, new_name, merge, keep_source=True)
+
+    async def _transfer_device(
+        self, device_name: str, new_name: str, merge: bool, keep_source: bool
+    ) -> dict[str, Any] | None:
+        """Move or copy every command of a device to another device."""
+        try:
+            device_name = validate_name(device_name)
+            new_name = validate_name(new_name)
+        except InvalidNameError as err:
+            _LOGGER.error("Cannot transfer device: %s", err)
+            return None
+        
+        async with self.transaction():
+            source_key = self._find_device_key(device_name)
+            if not source_key:
+                _LOGGER.warning("Device '%s' not found", device_name)
+                return None
+            
+            source = self._devices[source_key]
+            target_key = self._find_device_key(new_name)
+            if target_key == source_key:
+                if keep_source:
+                    _LOGGER.warning("Cannot copy device '%s' onto itself", source_key)
+                    return None
+                # Renaming to the same name with a different case
+                target_key = None
+            
+            transferred = 0
+            skipped: list[str] = []
+            if target_key is None:
+                target_key = new_name
+                created_at = source.get("created_at")
+                if keep_source:
+                    created_at = dt_util.utcnow().isoformat()
+                else:
+                    self._stage(JOURNAL_DELETE_DEVICE, source_key)
+                self._stage(
+                    JOURNAL_PUT_DEVICE,
+                    target_key,
+                    data={**source, "created_at": created_at, "commands": dict(source["commands"])},
+                )
+                transferred = len(source["commands"])
+            elif not merge:
+                _LOGGER.warning(
+                    "Device '%s' already exists, set merge to add commands to it", target_key
+                )
+                return None
+            else:
+                target_keys = {key.lower() for key in self._devices[target_key]["commands"]}
+                for command_key, command_data in source["commands"].items():
+                    if command_key.lower() in target_keys:
+                        skipped.append(command_key)
+                        continue
+                    self._stage(
+                        JOURNAL_PUT_COMMAND, target_key, command=command_key, data=command_data
+                    )
+                    transferred += 1
+                if not keep_source:
+                    self._stage(JOURNAL_DELETE_DEVICE, source_key)
+        
+        _LOGGER.info(
+            "%d command(s) %s from device '%s' to '%s'",
+            transferred,
+            "copied" if keep_source else "moved",
+            source_key,
+            target_key,
+        )
+        return {"device_name": target_key, "transferred": transferred, "skipped": skipped}
+
+    async def retag_commands(
+        self,
+        device_name: str,
+        command_names: list[str] | None = None,
+        add_tags: list[str] | None = None,
+        remove_tags: list[str] | None = None,
+    ) -> int | None:
+        """Add and remove tags on commands of a device, all of them by default.
+
+        Returns the number of commands changed, None if the device is unknown.
+        """
+        try:
+            device_name = validate_name(device_name)
+            add = {validate_name(tag).lower() for tag in add_tags or []}
+            remove = {validate_name(tag).lower() for tag in remove_tags or []}
+        except InvalidNameError as err:
+            _LOGGER.error("Cannot retag commands: %s", err)
+            return None
+        
+        changed = 0
+        async with self.transaction():
+            device_key = self._find_device_key(device_name)
+            if not device_key:
+                _LOGGER.warning("Device '%s' not found", device_name)
+                return None
+            
+            commands = self._devices[device_key]["commands"]
+            if command_names:
+                wanted = {str(name).strip().lower() for name in command_names}
+                command_keys = [key for key in commands if key.lower() in wanted]
+            else:
+                command_keys = list(commands)
+            
+            for command_key in command_keys:
+                command_data = commands[command_key]
+                tags = sorted((set(command_data.get("tags", [])) | add) - remove)
+                if tags == command_data.get("tags", []):
+                    continue
+                self._stage(
+                    JOURNAL_PUT_COMMAND,
+                    device_key,
+                    command=command_key,
+                    data={**command_data, "tags": tags},
+                )
+                changed += 1
+        
+        _LOGGER.info("%d command(s) of device '%s' retagged", changed, device_key)
+        return changed
+
+    async def optimize(
+        self, normalize: bool = True, trim_repeats: bool = True
+    ) -> dict[str, int]:
+        """Normalize timings and trim repeated frames of every stored command."""
+        commands_normalized = 0
+        commands_trimmed = 0
+        bytes_saved = 0
+
+        async with self.transaction():
+            for device_key, device_data in list(self._devices.items()):
+                for command_key, stored_data in list(device_data["commands"].items()):
+                    # Committed commands are never changed in place
+                    command_data = dict(stored_data)
+                    if normalize:
+                        bytes_saved += normalize_command(command_data)
+                        if command_data.get("raw") != stored_data.get("raw"):
+                            commands_normalized += 1
+                    if trim_repeats:
+                        saved = trim_repeated_command(command_data)
+                        if saved:
+                            commands_trimmed += 1
+                            bytes_saved += saved
+                    if command_data != stored_data:
+                        self._stage(
+                            JOURNAL_PUT_COMMAND,
+                            device_key,
+                            command=command_key,
+                            data=command_data,
+                        )
+            
+            # Touches most commands, a full save is smaller than the records
+            _TRANSACTION.get().full_save = True
+
+        _LOGGER.info(
+            "IR database optimized: %d command(s) normalized, %d trimmed, %d bytes saved",
+            commands_normalized,
+            commands_trimmed,
+            bytes_saved,
+        )
+        return {
+            "commands_normalized": commands_normalized,
+            "commands_trimmed": commands_trimmed,
+            "bytes_saved": bytes_saved,
+        }
+
+    def get_statistics(self) -> dict[str, Any]:
+        """Get size statistics of the database."""
+        command_count = 0
+        raw_values = 0
+        largest_command = 0
+
+        for device_data in self._devices.values():
+            for command_data in device_data["commands"].values():
+                values = len(command_data.get("raw", []))
+                command_count += 1
+                raw_values += values
+                largest_command = max(largest_command, values)
+
+        return {
+            "device_count": len(self._devices),
+            "command_count": command_count,
+            "raw_values": raw_values,
+            "largest_command_values": largest_command,
+            "journal_records": self._journal_records,
+            "journal_bytes": self._journal_bytes,
+        }
+
+    def get_file_size(self) -> int:
+        """Get the size of the database file (blocking)."""
+        if not self._file_path.exists():
+            return 0
+        return self._file_path.stat().st_size
+
     def get_all_data(self) -> dict[str, Any]:
         """Get all database data."""
         return self._data
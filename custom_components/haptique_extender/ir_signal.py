@@ -0,0 +1,268 @@
+"""IR signal analysis helpers for Haptique Extender."""
+from __future__ import annotations
+
+import hashlib
+import json
+from collections import Counter
+from typing import Any
+
+# A space longer than this separates two frames (microseconds)
+FRAME_GAP_US = 10000
+
+# Two timings match if they differ by less than the larger of these bounds
+TIMING_TOLERANCE_US = 150
+TIMING_TOLERANCE_RATIO = 0.2
+
+# Durations closer than this to the shortest member of a cluster join it
+CLUSTER_TOLERANCE_US = 200
+CLUSTER_TOLERANCE_RATIO = 0.25
+
+# Pulses shorter than this at the end of a capture are receiver noise
+NOISE_US = 100
+
+# Captures shorter than this cannot be a real IR command
+MIN_CAPTURE_VALUES = 4
+
+# Gap assumed after a frame that was captured without one (microseconds)
+DEFAULT_REPEAT_GAP_US = 40000
+
+
+def raw_size_bytes(raw_data: list[int]) -> int:
+    """Return the size of a raw array as sent to /api/ir/send."""
+    return len(json.dumps(raw_data, separators=(",", ":")))
+
+
+def split_frames(raw_data: list[int], gap_us: int = FRAME_GAP_US) -> list[list[int]]:
+    """Split a raw mark/space array into frames at long spaces.
+
+    Marks are at even indexes and spaces at odd indexes. Every frame keeps
+    its trailing gap, so concatenating the frames gives back the input.
+    """
+    frames: list[list[int]] = []
+    start = 0
+    last_index = len(raw_data) - 1
+
+    for index in range(1, len(raw_data), 2):
+        if raw_data[index] >= gap_us and index < last_index:
+            frames.append(raw_data[start:index + 1])
+            start = index + 1
+
+    frames.append(raw_data[start:])
+    return frames
+
+
+def frame_period_ms(raw_data: list[int]) -> float:
+    """Return the time between two repeats of a code, its native repeat rate.
+
+    This is the length of the first frame, trailing gap included.
+    """
+    frame = split_frames(raw_data)[0]
+    period_us = sum(frame)
+    # Frames alternate mark/space, an odd length ends on a mark
+    if len(frame) % 2:
+        period_us += DEFAULT_REPEAT_GAP_US
+    return period_us / 1000
+
+
+def fingerprint(raw_data: list[int]) -> str:
+    """Return a short identifier of a code, the same for held-button captures.
+
+    Only the first frame counts, without its trailing gap. Codes should be
+    normalized first so receiver jitter does not change the result.
+    """
+    frames = split_frames(raw_data)
+    frame = frames[0][:-1] if len(frames) > 1 else frames[0]
+    return hashlib.blake2b(
+        ",".join(map(str, frame)).encode(), digest_size=6
+    ).hexdigest()
+
+
+def timings_match(first: list[int], second: list[int]) -> bool:
+    """Check if two timing arrays are the same within receiver tolerance."""
+    if len(first) != len(second):
+        return False
+
+    for a, b in zip(first, second):
+        tolerance = max(TIMING_TOLERANCE_US, TIMING_TOLERANCE_RATIO * max(a, b))
+        if abs(a - b) > tolerance:
+            return False
+
+    return True
+
+
+def _quantize(value: float) -> int:
+    """Round a centroid to a grid that scales with its magnitude.
+
+    Durations under a frame gap stay under it, and none gets short enough
+    to be taken for noise.
+    """
+    if value < 2000:
+        step = 50
+    elif value < FRAME_GAP_US:
+        step = 250
+    else:
+        step = 1000
+    snapped = max(NOISE_US, int(round(value / step)) * step)
+    if value < FRAME_GAP_US:
+        snapped = min(snapped, FRAME_GAP_US - step)
+    return snapped
+
+
+def _cluster_limit(value: int) -> float:
+    """Return the longest duration that joins a cluster starting at `value`."""
+    return value + max(CLUSTER_TOLERANCE_US, CLUSTER_TOLERANCE_RATIO * value)
+
+
+def _cluster_centroids(values: list[int]) -> dict[int, int]:
+    """Map every distinct duration to the centroid of its cluster.
+
+    Durations are sorted once and grouped while they stay within tolerance
+    of the shortest member, so a cluster can not drift by chaining.
+    Neighbouring clusters whose centroids are within tolerance of each
+    other are merged, so the centroids of a normalized array are each a
+    cluster of their own and normalizing it again changes nothing.
+    """
+    # Members, weight and weighted total of every cluster, shortest first
+    clusters: list[tuple[list[int], int, int]] = []
+    for value, count in sorted(Counter(values).items()):
+        if clusters and value <= _cluster_limit(clusters[-1][0][0]):
+            members, weight, total = clusters.pop()
+            clusters.append((members + [value], weight + count, total + value * count))
+        else:
+            clusters.append(([value], count, value * count))
+
+    merged: list[tuple[list[int], int, int]] = []
+    for cluster in clusters:
+        merged.append(cluster)
+        # A merge only moves a centroid up, away from the clusters before
+        while len(merged) > 1:
+            low_members, low_weight, low_total = merged[-2]
+            high_members, high_weight, high_total = merged[-1]
+            if _quantize(high_total / high_weight) > _cluster_limit(
+                _quantize(low_total / low_weight)
+            ):
+                break
+            merged[-2:] = [
+                (
+                    low_members + high_members,
+                    low_weight + high_weight,
+                    low_total + high_total,
+                )
+            ]
+
+    mapping: dict[int, int] = {}
+    for members, weight, total in merged:
+        centroid = _quantize(total / weight)
+        for member in members:
+            mapping[member] = centroid
+    return mapping
+
+
+def strip_trailing_noise(raw_data: list[int]) -> list[int]:
+    """Drop glitch pulses and a dangling short space at the end of a capture."""
+    end = len(raw_data)
+    while end and raw_data[end - 1] < NOISE_US:
+        end -= 1
+
+    # A capture ends on a mark; only a frame gap may follow it
+    if end % 2 == 0 and end and raw_data[end - 1] < FRAME_GAP_US:
+        end -= 1
+
+    return list(raw_data[:end])
+
+
+def normalize_timings(raw_data: list[int]) -> tuple[list[int], int]:
+    """Snap a raw capture to clustered timings and score its quality.
+
+    Marks and spaces are clustered separately and every duration is
+    replaced by its cluster centroid, so two captures of the same button
+    usually give identical arrays. A normalized array is returned as is.
+    The quality score is 0-100 and drops with the spread of durations
+    around their centroids.
+    """
+    cleaned = strip_trailing_noise(raw_data)
+    if len(cleaned) < MIN_CAPTURE_VALUES:
+        return cleaned, 0
+
+    marks = _cluster_centroids(cleaned[0::2])
+    # Frame gaps never join the spaces inside frames, or frames would merge
+    spaces = _cluster_centroids([value for value in cleaned[1::2] if value < FRAME_GAP_US])
+    spaces.update(
+        _cluster_centroids([value for value in cleaned[1::2] if value >= FRAME_GAP_US])
+    )
+
+    normalized = [
+        marks[value] if index % 2 == 0 else spaces[value]
+        for index, value in enumerate(cleaned)
+    ]
+
+    deviation = sum(
+        abs(value - snapped) / snapped
+        for value, snapped in zip(cleaned, normalized)
+    ) / len(cleaned)
+    quality = 100 * max(0.0, 1 - deviation / CLUSTER_TOLERANCE_RATIO)
+
+    # Stripped noise means the receiver saw more than the remote sent
+    if len(cleaned) < len(raw_data):
+        quality *= 0.9
+
+    return normalized, int(round(quality))
+
+
+def detect_repeat_frames(raw_data: list[int]) -> tuple[list[int], int]:
+    """Detect a frame repeated while the button was held.
+
+    Returns the canonical frame (with its trailing gap) and the number of
+    times it was captured. Captures that are not a plain repetition of one
+    frame are returned unchanged with a count of 1.
+    """
+    frames = split_frames(raw_data)
+    if len(frames) < 2:
+        return list(raw_data), 1
+
+    first = frames[0]
+    body = first[:-1]
+
+    for frame in frames[1:]:
+        # The last frame usually ends on a mark and has no trailing gap
+        if len(frame) not in (len(body), len(first)):
+            return list(raw_data), 1
+        if not timings_match(frame[:len(body)], body):
+            return list(raw_data), 1
+
+    return list(first), len(frames)
+
+
+def normalize_command(command: dict[str, Any]) -> int:
+    """Normalize the timings of a stored command in place.
+
+    Commands normalized already are left alone, quality included, as their
+    score is the one of the original capture. Returns the number of bytes
+    saved on the raw array.
+    """
+    raw_data = command.get("raw", [])
+    normalized, quality = normalize_timings(raw_data)
+    if quality == 0 or normalized == raw_data:
+        return 0
+
+    saved = raw_size_bytes(raw_data) - raw_size_bytes(normalized)
+    command["raw"] = normalized
+    command["quality"] = quality
+    return saved
+
+
+def trim_repeated_command(command: dict[str, Any]) -> int:
+    """Trim repeated frames of a stored command in place.
+
+    The repeat count is folded into the command's `repeat` field.
+    Returns the number of bytes saved on the raw array.
+    """
+    raw_data = command.get("raw", [])
+    frame, count = detect_repeat_frames(raw_data)
+    if count < 2:
+        return 0
+
+    saved = raw_size_bytes(raw_data) - raw_size_bytes(frame)
+    command["raw"] = frame
+    command["repeat"] = command.get("repeat", 1) * count
+    return saved
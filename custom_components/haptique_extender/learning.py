@@ -0,0 +1,259 @@
+"""Learning sessions of Haptique Extender hubs."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import API_IR_LAST, DEFAULT_BATCH_NAME_PREFIX, DEFAULT_LEARNING_TIMEOUT, DOMAIN
+from .events import EVENT_OPERATION, EventPublisher
+from .timeouts import Deadline
+
+if TYPE_CHECKING:
+    from .coordinator import HaptiqueCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class BatchLearning:
+    """Commands captured by a whole-remote learning session, not yet saved."""
+
+    command_names: list[str]
+    count: int
+    name_prefix: str = DEFAULT_BATCH_NAME_PREFIX
+    captures: list[tuple[str, dict[str, Any]]] = field(default_factory=list)
+    fingerprints: set[str] = field(default_factory=set)
+
+    @property
+    def next_name(self) -> str:
+        """Return the name of the next command to capture."""
+        index = len(self.captures)
+        if index < len(self.command_names):
+            return self.command_names[index]
+        return f"{self.name_prefix} {index + 1}"
+
+    @property
+    def remaining(self) -> int:
+        """Return the number of commands left to capture."""
+        return self.count - len(self.captures)
+
+
+@dataclass(slots=True)
+class LearningSession:
+    """One learning session on one hub."""
+
+    session_id: str
+    coordinator: HaptiqueCoordinator
+    device_name: str | None = None
+    command_name: str | None = None
+    timeout: float = DEFAULT_LEARNING_TIMEOUT
+    started_at: datetime = field(default_factory=dt_util.utcnow)
+    deadline: Deadline = field(init=False)
+    next_poll: float = field(init=False)
+    polling: bool = False
+    last_combined: list[int] | None = None
+    batch: BatchLearning | None = None
+
+    def __post_init__(self) -> None:
+        """Start the session clock."""
+        self.deadline = Deadline(self.timeout)
+        self.next_poll = time.monotonic() + self.poll_delay()
+
+    @property
+    def hub(self) -> str:
+        """Return the hub the session learns on."""
+        return self.coordinator.host
+
+    def poll_delay(self) -> float:
+        """Return the seconds until the next poll, never past the timeout."""
+        return min(self.coordinator.learning_poll_interval, self.deadline.remaining())
+
+    def event_data(self) -> dict[str, Any]:
+        """Return the fields identifying the session in events."""
+        return {"session_id": self.session_id, "hub": self.hub}
+
+
+class LearningSessionManager:
+    """Learning sessions of every hub, polled by one shared scheduler.
+
+    Sessions are keyed by hub and session id; a hub runs one session at a
+    time since it only keeps the last code it received, but any number of
+    hubs can learn in parallel. The scheduler task only runs while there
+    are sessions and polls each hub on its own cadence.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the manager."""
+        self.hass = hass
+        self._sessions: dict[tuple[str, str], LearningSession] = {}
+        self._scheduler: asyncio.Task | None = None
+        self._wakeup = asyncio.Event()
+
+    @property
+    def sessions(self) -> list[LearningSession]:
+        """Return the running sessions."""
+        return list(self._sessions.values())
+
+    def get(self, hub: str) -> LearningSession | None:
+        """Return the session running on a hub."""
+        for session in self._sessions.values():
+            if session.hub == hub:
+                return session
+        return None
+
+    def start(
+        self,
+        coordinator: HaptiqueCoordinator,
+        device_name: str | None = None,
+        command_name: str | None = None,
+        timeout: float = DEFAULT_LEARNING_TIMEOUT,
+        session_id: str | None = None,
+        batch: BatchLearning | None = None,
+    ) -> LearningSession | None:
+        """Start learning on a hub, None if the hub is already learning.
+
+        A batch session keeps capturing until every command of the batch
+        is captured or no button is pressed for `timeout` seconds.
+        """
+        if self.get(coordinator.host):
+            return None
+
+        session = LearningSession(
+            session_id or uuid.uuid4().hex[:8],
+            coordinator,
+            device_name,
+            command_name,
+            timeout,
+            batch=batch,
+        )
+        self._sessions[(session.hub, session.session_id)] = session
+        coordinator.learning_session = session
+        coordinator.async_update_listeners()
+        _LOGGER.info("Learning session %s started on %s", session.session_id, session.hub)
+
+        self._wakeup.set()
+        if self._scheduler is None or self._scheduler.done():
+            self._scheduler = self.hass.async_create_background_task(
+                self._async_run(), "haptique_learning_scheduler"
+            )
+        return session
+
+    def poll_now(self, hub: str) -> None:
+        """Poll the session of a hub right away, a capture was announced."""
+        session = self.get(hub)
+        if session and not session.polling:
+            session.next_poll = time.monotonic()
+            self._wakeup.set()
+
+    def cancel(
+        self, hub: str | None = None, session_id: str | None = None
+    ) -> list[LearningSession]:
+        """Cancel the sessions matching a hub and/or session id."""
+        cancelled = [
+            session
+            for session in self._sessions.values()
+            if (hub is None or session.hub == hub)
+            and (session_id is None or session.session_id == session_id)
+        ]
+        for session in cancelled:
+            self._finish(session)
+            session.coordinator.record_learning(session, "cancelled")
+            self._fire(session, "cancelled")
+        return cancelled
+
+    def _finish(self, session: LearningSession) -> None:
+        """Forget a session."""
+        self._sessions.pop((session.hub, session.session_id), None)
+        if session.coordinator.learning_session is session:
+            session.coordinator.learning_session = None
+            session.coordinator.async_update_listeners()
+
+    def _fire(self, session: LearningSession, status: str) -> None:
+        """Fire the event of a session ending without a capture."""
+        events: EventPublisher = self.hass.data[DOMAIN]["events"]
+        events.fire(
+            EVENT_OPERATION,
+            {
+                "operation": "learn_batch" if session.batch else "learn",
+                "status": status,
+                "entity_type": "command",
+                "device_name": session.device_name,
+                "command_name": session.command_name,
+                "data": session.event_data(),
+            }
+        )
+
+    async def _async_run(self) -> None:
+        """Dispatch the polls of every session as they fall due."""
+        while self._sessions:
+            now = time.monotonic()
+            for session in self.sessions:
+                if session.polling or session.next_poll > now:
+                    continue
+                session.polling = True
+                self.hass.async_create_background_task(
+                    self._async_poll(session),
+                    f"haptique_learning_poll_{session.session_id}",
+                )
+
+            waiting = [session.next_poll for session in self.sessions if not session.polling]
+            delay = max(0.0, min(waiting) - now) if waiting else None
+            # Woken up early when a session starts or a poll finishes
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _async_poll(self, session: LearningSession) -> None:
+        """Poll a hub for a new code, or end its session on timeout."""
+        try:
+            if session.deadline.expired:
+                self._finish(session)
+                _LOGGER.warning("Learning timeout reached on %s", session.hub)
+                if session.batch and session.batch.captures:
+                    # Buttons left unpressed, keep what was captured
+                    await session.coordinator.async_commit_batch(session, "timeout")
+                    return
+                session.coordinator.record_learning(session, "timeout")
+                self._fire(session, "timeout")
+                return
+
+            try:
+                ir_data = await session.coordinator.async_poll_last_ir(session.deadline)
+            except Exception as err:
+                _LOGGER.debug("Polling error on %s: %s", session.hub, err)
+                return
+
+            if (session.hub, session.session_id) not in self._sessions:
+                # Cancelled while the request was in flight
+                return
+
+            combined = ir_data.get("combined") if ir_data else None
+            if not combined or combined == session.last_combined:
+                _LOGGER.debug("IR data unchanged, waiting for new capture...")
+                return
+
+            _LOGGER.info("New IR code detected on %s", session.hub)
+            session.last_combined = list(combined)
+            if session.batch:
+                # The timeout counts from the last button press
+                session.deadline = Deadline(session.timeout)
+                if session.coordinator.handle_batch_capture(ir_data, session):
+                    self._finish(session)
+                    await session.coordinator.async_commit_batch(session)
+                return
+            self._finish(session)
+            await session.coordinator.handle_ir_learned(ir_data, session)
+        finally:
+            session.polling = False
+            session.next_poll = time.monotonic() + session.poll_delay()
+            self._wakeup.set()
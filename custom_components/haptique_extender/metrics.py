@@ -0,0 +1,113 @@
+"""Fixed-memory latency and reliability metrics for Haptique Extender hubs."""
+from __future__ import annotations
+
+import bisect
+import math
+from collections import deque
+
+from .request_trace import ERROR_DEADLINE, RequestRecord
+
+# Histogram buckets grow by 25% from 1 ms to about 70 s
+BUCKET_MIN_MS = 1.0
+BUCKET_GROWTH = 1.25
+BUCKET_COUNT = 50
+
+# Past this many samples all counts are halved, so recent requests weigh more
+HISTOGRAM_DECAY_COUNT = 1000
+
+SEND_WINDOW = 100
+
+
+class StreamingHistogram:
+    """Log-bucketed histogram with a fixed number of counters."""
+
+    _bounds = [BUCKET_MIN_MS * BUCKET_GROWTH ** index for index in range(BUCKET_COUNT)]
+
+    def __init__(self) -> None:
+        """Initialize the histogram."""
+        # One extra bucket for values above the last bound
+        self._counts = [0] * (BUCKET_COUNT + 1)
+        self._total = 0
+
+    @property
+    def count(self) -> int:
+        """Return the (decayed) number of samples."""
+        return self._total
+
+    def record(self, value_ms: float) -> None:
+        """Add a sample in milliseconds."""
+        self._counts[bisect.bisect_left(self._bounds, value_ms)] += 1
+        self._total += 1
+
+        if self._total >= HISTOGRAM_DECAY_COUNT:
+            self._counts = [count // 2 for count in self._counts]
+            self._total = sum(self._counts)
+
+    def percentile(self, fraction: float) -> float | None:
+        """Estimate a percentile in milliseconds, None without samples."""
+        if not self._total:
+            return None
+
+        rank = max(1, math.ceil(fraction * self._total))
+        seen = 0
+        for index, count in enumerate(self._counts):
+            if not count:
+                continue
+            if seen + count >= rank:
+                lower = self._bounds[index - 1] if index else 0.0
+                upper = self._bounds[min(index, BUCKET_COUNT - 1)]
+                # Assume samples are spread evenly inside the bucket
+                return round(lower + (upper - lower) * (rank - seen) / count, 1)
+            seen += count
+
+        return round(self._bounds[-1], 1)
+
+
+class HubMetrics:
+    """Latency and reliability metrics of one hub."""
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self.request_latency = StreamingHistogram()
+        self.consecutive_failures = 0
+        self.last_refresh_ms: float | None = None
+        self.unchanged_refreshes = 0
+        self.avoided_writes = 0
+        self._sends: deque[bool] = deque(maxlen=SEND_WINDOW)
+
+    def record_request(self, record: RequestRecord) -> None:
+        """Account for a finished request."""
+        if record.total_ms is not None:
+            self.request_latency.record(record.total_ms)
+
+        if record.error == ERROR_DEADLINE:
+            # The caller gave up first, the hub may well be fine
+            return
+        if record.error:
+            self.consecutive_failures += 1
+        else:
+            self.consecutive_failures = 0
+
+    def record_send(self, success: bool) -> None:
+        """Account for an IR send."""
+        self._sends.append(success)
+
+    def record_refresh(self, duration_ms: float) -> None:
+        """Account for a coordinator refresh."""
+        self.last_refresh_ms = round(duration_ms, 1)
+
+    def record_unchanged_refresh(self, listeners: int) -> None:
+        """Account for a refresh whose data was the same, so no listener ran."""
+        self.unchanged_refreshes += 1
+        self.avoided_writes += listeners
+
+    def record_avoided_write(self) -> None:
+        """Account for an entity that kept its state on a coordinator update."""
+        self.avoided_writes += 1
+
+    @property
+    def send_success_rate(self) -> float | None:
+        """Return the success rate of the recent sends in percent."""
+        if not self._sends:
+            return None
+        return round(100 * sum(self._sends) / len(self._sends), 1)
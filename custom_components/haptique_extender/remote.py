@@ -0,0 +1,272 @@
+"""Remote platform for Haptique Extender."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Iterable
+from typing import Any
+
+from homeassistant.components.remote import (
+    ATTR_ALTERNATIVE,
+    ATTR_COMMAND,
+    ATTR_COMMAND_TYPE,
+    ATTR_DELAY_SECS,
+    ATTR_DEVICE,
+    ATTR_HOLD_SECS,
+    ATTR_NUM_REPEATS,
+    ATTR_TIMEOUT,
+    DEFAULT_DELAY_SECS,
+    DEFAULT_HOLD_SECS,
+    DEFAULT_NUM_REPEATS,
+    RemoteEntity,
+    RemoteEntityFeature,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .codec import json_dumps
+from .const import DEFAULT_LEARNING_TIMEOUT, DEFAULT_SEND_TIMEOUT, DOMAIN, MAX_HOLD_TIMEOUT
+from .coordinator import HaptiqueCoordinator
+from .entity import SELECTED_DEVICES, HaptiqueEntity
+from .events import EVENT_OPERATION, EventPublisher
+from .ir_database import IRDatabase
+from .timeouts import Deadline
+
+_LOGGER = logging.getLogger(__name__)
+
+# Commands are "device/command"; the device is optional when given as the
+# `device` parameter or selected on the hub
+COMMAND_SEPARATOR = "/"
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up Haptique remotes."""
+    coordinator: HaptiqueCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    entities = [
+        HaptiqueRemote(coordinator, entry),
+    ]
+
+    async_add_entities(entities)
+
+
+class HaptiqueRemote(HaptiqueEntity, RemoteEntity):
+    """Remote sending the commands of the IR database through a hub.
+
+    `remote.send_command` resolves all its commands against the database
+    once, then sends the sequence from a single task: `num_repeats` times,
+    `delay_secs` apart, each command held for `hold_secs` if set. Request
+    bodies are encoded once per command and reused until the database
+    changes that device. Sequences on the same hub never interleave.
+
+    Learning and deleting go through the learn_ir_command, learn_ir_batch
+    and delete_ir_commands services, so they report the usual events.
+    """
+
+    _attr_supported_features = (
+        RemoteEntityFeature.LEARN_COMMAND | RemoteEntityFeature.DELETE_COMMAND
+    )
+
+    def __init__(
+        self,
+        coordinator: HaptiqueCoordinator,
+        entry: ConfigEntry,
+    ) -> None:
+        """Initialize the remote."""
+        # Coordinator data only matters for availability
+        super().__init__(coordinator, ())
+
+        hostname = coordinator.device_info.get("hostname", "haptique_extender")
+
+        self._entry_id = entry.entry_id
+        self._attr_name = "Remote"
+        self._attr_unique_id = f"{entry.entry_id}_remote"
+        self._attr_icon = "mdi:remote"
+        self._attr_has_entity_name = True
+        self._attr_is_on = True
+
+        # Encoded send requests by (device, command), lower case
+        self._bodies: dict[tuple[str, str], bytes] = {}
+        self._send_lock = asyncio.Lock()
+
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, coordinator.device_info["mac"])},
+            "name": hostname,
+            "manufacturer": "KINCONY",
+            "model": "KC868-AG",
+            "sw_version": coordinator.device_info["fw_ver"],
+        }
+
+    async def async_added_to_hass(self) -> None:
+        """Forget the encoded requests of devices changed in the database."""
+        await super().async_added_to_hass()
+        ir_db: IRDatabase = self.hass.data[DOMAIN]["ir_database"]
+        self.async_on_remove(ir_db.add_listener(self._handle_database_change))
+
+    @callback
+    def _handle_database_change(self, records: list[dict[str, Any]]) -> None:
+        """Drop the cached requests of the devices in a commit."""
+        devices = {record["device"].lower() for record in records}
+        for key in [key for key in self._bodies if key[0] in devices]:
+            del self._bodies[key]
+
+    async def async_turn_on(self, **kwargs: Any) -> None:
+        """Allow sending commands."""
+        self._attr_is_on = True
+        self.async_write_ha_state()
+
+    async def async_turn_off(self, **kwargs: Any) -> None:
+        """Ignore sent commands until turned on again."""
+        self._attr_is_on = False
+        self.async_write_ha_state()
+
+    def _split_command(self, command: str, device: str | None) -> tuple[str | None, str]:
+        """Return the device and command name of a "device/command" string."""
+        if COMMAND_SEPARATOR in command:
+            device, command = command.split(COMMAND_SEPARATOR, 1)
+        elif device is None:
+            device = self.hass.data[DOMAIN].get(SELECTED_DEVICES, {}).get(self._entry_id)
+        return (device.strip() if device else None), command.strip()
+
+    def _resolve(
+        self, commands: Iterable[str], device: str | None
+    ) -> list[tuple[str, str, dict[str, Any], bytes]] | None:
+        """Look every command up once, None if one of them is unknown."""
+        ir_db: IRDatabase = self.hass.data[DOMAIN]["ir_database"]
+        resolved = []
+        for item in commands:
+            device_name, command_name = self._split_command(item, device)
+            command = ir_db.get_command(device_name, command_name) if device_name else None
+            if not command:
+                _LOGGER.error(
+                    "Command '%s' not found for device '%s'", command_name, device_name
+                )
+                self._fire_send(device_name, command_name, "Command not found in database")
+                return None
+
+            key = (device_name.lower(), command_name.lower())
+            body = self._bodies.get(key)
+            if body is None:
+                body = self._bodies[key] = json_dumps(
+                    {
+                        "freq": command["freq_khz"] * 1000,
+                        "duty": command["duty"],
+                        "repeat": command["repeat"],
+                        "raw": command["raw"],
+                    }
+                )
+            resolved.append((device_name, command_name, command, body))
+        return resolved
+
+    async def async_send_command(self, command: Iterable[str], **kwargs: Any) -> None:
+        """Send a sequence of database commands."""
+        if not self.is_on:
+            _LOGGER.warning("Remote of %s is off, commands not sent", self.coordinator.host)
+            return
+
+        num_repeats = kwargs.get(ATTR_NUM_REPEATS, DEFAULT_NUM_REPEATS)
+        delay_secs = kwargs.get(ATTR_DELAY_SECS, DEFAULT_DELAY_SECS)
+        hold_secs = min(kwargs.get(ATTR_HOLD_SECS, DEFAULT_HOLD_SECS), MAX_HOLD_TIMEOUT)
+
+        resolved = self._resolve(command, kwargs.get(ATTR_DEVICE))
+        if not resolved:
+            return
+
+        if self.coordinator.circuit_breaker.is_open:
+            _LOGGER.error("Hub %s unavailable, commands not sent", self.coordinator.host)
+            self._fire_send(resolved[0][0], resolved[0][1], "Hub unavailable")
+            return
+
+        async with self._send_lock:
+            first = True
+            for _ in range(num_repeats):
+                for device_name, command_name, command_data, body in resolved:
+                    if not first and delay_secs:
+                        await asyncio.sleep(delay_secs)
+                    first = False
+
+                    if hold_secs:
+                        session = self.coordinator.start_hold(
+                            command_data, hold_secs, None, device_name, command_name
+                        )
+                        await session.async_wait()
+                        success = session.status != "error"
+                    else:
+                        success = await self.coordinator.async_send_prepared(
+                            body, Deadline(DEFAULT_SEND_TIMEOUT)
+                        )
+                        self._fire_send(
+                            device_name,
+                            command_name,
+                            None if success else "Failed to send IR code",
+                        )
+                    if not success:
+                        # The hub is not taking commands, the rest would fail too
+                        return
+
+    def _fire_send(self, device_name: str | None, command_name: str, error: str | None) -> None:
+        """Fire the send event of one command, as send_ir_command does."""
+        event = {
+            "operation": "send",
+            "status": "error" if error else "success",
+            "entity_type": "command",
+            "device_name": device_name,
+            "command_name": command_name,
+        }
+        if error:
+            event["error"] = error
+        events: EventPublisher = self.hass.data[DOMAIN]["events"]
+        events.fire(EVENT_OPERATION, event, coalesce=True)
+
+    async def async_learn_command(self, **kwargs: Any) -> None:
+        """Learn one command, or several in one batch session."""
+        if kwargs.get(ATTR_COMMAND_TYPE, "ir") != "ir":
+            _LOGGER.error("Haptique Extender hubs only learn IR commands")
+            return
+        if kwargs.get(ATTR_ALTERNATIVE):
+            _LOGGER.warning("Alternative codes are not supported, learning one code")
+
+        device_name, _ = self._split_command("", kwargs.get(ATTR_DEVICE))
+        commands = list(kwargs.get(ATTR_COMMAND, []))
+        if not commands:
+            raise ServiceValidationError("No command name given to learn")
+        if not device_name:
+            raise ServiceValidationError("No device given to learn into, and none selected")
+        data = {
+            "hub": self._entry_id,
+            "device_name": device_name,
+            "timeout": kwargs.get(ATTR_TIMEOUT) or DEFAULT_LEARNING_TIMEOUT,
+        }
+        if len(commands) == 1:
+            await self.hass.services.async_call(
+                DOMAIN, "learn_ir_command", {**data, "command_name": commands[0]}, blocking=True
+            )
+        else:
+            await self.hass.services.async_call(
+                DOMAIN, "learn_ir_batch", {**data, "command_names": commands}, blocking=True
+            )
+
+    async def async_delete_command(self, **kwargs: Any) -> None:
+        """Delete commands of a device from the database."""
+        commands_by_device: dict[str, list[str]] = {}
+        for item in kwargs.get(ATTR_COMMAND, []):
+            device_name, command_name = self._split_command(item, kwargs.get(ATTR_DEVICE))
+            if not device_name:
+                raise ServiceValidationError(
+                    f"No device given to delete '{command_name}' from, and none selected"
+                )
+            commands_by_device.setdefault(device_name, []).append(command_name)
+
+        for device_name, command_names in commands_by_device.items():
+            await self.hass.services.async_call(
+                DOMAIN,
+                "delete_ir_commands",
+                {"device_name": device_name, "command_names": command_names},
+                blocking=True,
+            )
@@ -0,0 +1,99 @@
+"""Concurrency limit for requests to a Haptique Extender hub."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+
+from .const import DEFAULT_MAX_CONCURRENT_REQUESTS, DEFAULT_REQUEST_QUEUE_DEPTH
+from .timeouts import Deadline, DeadlineExceededError
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class HubBusyError(Exception):
+    """Exception raised when the request queue of a hub is full."""
+    pass
+
+
+class RequestLimiter:
+    """Let at most `concurrency` requests reach a hub at once.
+
+    Further requests wait in line, first come first served, at most
+    `queue_depth` of them; past that they are rejected with HubBusyError
+    instead of piling up on a hub that cannot keep up. Both limits can be
+    changed while requests are running.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        concurrency: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+        queue_depth: int = DEFAULT_REQUEST_QUEUE_DEPTH,
+    ) -> None:
+        """Initialize the limiter."""
+        self.name = name
+        self.concurrency = concurrency
+        self.queue_depth = queue_depth
+        self.rejected = 0
+        self._active = 0
+        self._waiters: deque[asyncio.Future] = deque()
+
+    @property
+    def active(self) -> int:
+        """Return the number of requests holding a slot."""
+        return self._active
+
+    @property
+    def waiting(self) -> int:
+        """Return the number of requests waiting for a slot."""
+        return len(self._waiters)
+
+    def configure(self, concurrency: int, queue_depth: int) -> None:
+        """Change the limits, waking up waiters if there is more room."""
+        self.concurrency = concurrency
+        self.queue_depth = queue_depth
+        self._wake()
+
+    async def acquire(self, deadline: Deadline | None = None) -> None:
+        """Wait for a slot, raise HubBusyError if the queue is full."""
+        if self._active < self.concurrency and not self._waiters:
+            self._active += 1
+            return
+
+        if len(self._waiters) >= self.queue_depth:
+            self.rejected += 1
+            raise HubBusyError(
+                f"Hub {self.name} busy, {self._active} requests running "
+                f"and {len(self._waiters)} waiting"
+            )
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(
+                asyncio.shield(waiter), deadline.remaining() if deadline else None
+            )
+        except (asyncio.CancelledError, asyncio.TimeoutError) as err:
+            if waiter.done() and not waiter.cancelled():
+                # Given a slot just as the caller gave up
+                self.release()
+            else:
+                waiter.cancel()
+                self._waiters.remove(waiter)
+            if isinstance(err, asyncio.TimeoutError):
+                raise DeadlineExceededError(
+                    f"No slot to request {self.name} before the deadline"
+                ) from err
+            raise
+
+    def release(self) -> None:
+        """Give a slot back."""
+        self._active -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        """Hand free slots to the oldest waiters."""
+        while self._waiters and self._active < self.concurrency:
+            self._active += 1
+            self._waiters.popleft().set_result(None)
@@ -0,0 +1,92 @@
+"""Request tracing for Haptique Extender hubs."""
+from __future__ import annotations
+
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+import aiohttp
+
+DEFAULT_TRACE_SIZE = 100
+
+# Error of a request that timed out on its caller's deadline, before the
+# timeout of its endpoint
+ERROR_DEADLINE = "DeadlineExceeded"
+
+
+@dataclass(slots=True)
+class RequestRecord:
+    """One request made to a hub."""
+
+    method: str
+    endpoint: str
+    timestamp: float = field(default_factory=time.time)
+    status: int | None = None
+    request_bytes: int = 0
+    response_bytes: int = 0
+    connect_ms: float | None = None
+    total_ms: float | None = None
+    error: str | None = None
+    _start: float = field(default_factory=time.perf_counter, repr=False)
+
+
+class RequestTrace:
+    """Bounded ring buffer of recent requests made to one hub."""
+
+    def __init__(
+        self,
+        size: int = DEFAULT_TRACE_SIZE,
+        on_finish: Callable[[RequestRecord], None] | None = None,
+    ) -> None:
+        """Initialize the trace."""
+        self._records: deque[RequestRecord] = deque(maxlen=size)
+        self._on_finish = on_finish
+
+    def start(self, method: str, endpoint: str) -> RequestRecord:
+        """Start recording a request."""
+        return RequestRecord(method, endpoint)
+
+    def finish(self, record: RequestRecord) -> None:
+        """Store a finished request."""
+        record.total_ms = round((time.perf_counter() - record._start) * 1000, 2)
+        self._records.append(record)
+        if self._on_finish:
+            self._on_finish(record)
+
+    def as_dicts(self) -> list[dict[str, Any]]:
+        """Return the recorded requests, oldest first."""
+        records = []
+        for record in self._records:
+            data = asdict(record)
+            data.pop("_start")
+            records.append(data)
+        return records
+
+
+async def _on_connection_create_start(
+    session: aiohttp.ClientSession, context: Any, params: Any
+) -> None:
+    """Remember when a new connection is opened."""
+    context.connect_start = time.perf_counter()
+
+
+async def _on_connection_create_end(
+    session: aiohttp.ClientSession, context: Any, params: Any
+) -> None:
+    """Store the connect time on the request being recorded."""
+    record = context.trace_request_ctx
+    if isinstance(record, RequestRecord):
+        record.connect_ms = round((time.perf_counter() - context.connect_start) * 1000, 2)
+
+
+def build_trace_config() -> aiohttp.TraceConfig:
+    """Build the aiohttp trace config measuring connect time.
+
+    Requests reusing a pooled connection keep a connect time of None.
+    """
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_connection_create_start.append(_on_connection_create_start)
+    trace_config.on_connection_create_end.append(_on_connection_create_end)
+    return trace_config
@@ -0,0 +1,228 @@
+"""Select platform for Haptique Extender."""
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from homeassistant.components.select import SelectEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN
+from .coordinator import HaptiqueCoordinator
+from .entity import HaptiqueEntity, async_add_device_selector, async_select_device
+from .ir_database import (
+    JOURNAL_DELETE_COMMAND,
+    JOURNAL_DELETE_DEVICE,
+    JOURNAL_PUT_COMMAND,
+    JOURNAL_PUT_DEVICE,
+    IRDatabase,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up Haptique selects."""
+    coordinator: HaptiqueCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    entities = [
+        HaptiqueDeviceSelect(coordinator, entry),
+        HaptiqueCommandSelect(coordinator, entry),
+    ]
+
+    async_add_entities(entities)
+
+
+class HaptiqueDeviceSelect(HaptiqueEntity, SelectEntity):
+    """Select of a device of the IR database.
+
+    The options follow the database commit records, one device added or
+    removed at a time, instead of being rebuilt from the devices sensor.
+    Selecting a device selects it for the command select and the commands
+    sensor of the hub as well.
+    """
+
+    def __init__(
+        self,
+        coordinator: HaptiqueCoordinator,
+        entry: ConfigEntry,
+    ) -> None:
+        """Initialize the device select."""
+        # Follows the IR database, the coordinator only for availability
+        super().__init__(coordinator, ())
+
+        hostname = coordinator.device_info.get("hostname", "haptique_extender")
+
+        self._entry_id = entry.entry_id
+        self._attr_name = "IR Device"
+        self._attr_unique_id = f"{entry.entry_id}_ir_device_select"
+        self._attr_icon = "mdi:devices"
+        self._attr_has_entity_name = True
+        self._attr_options = []
+        self._attr_current_option = None
+
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, coordinator.device_info["mac"])},
+            "name": hostname,
+            "manufacturer": "KINCONY",
+            "model": "KC868-AG",
+            "sw_version": coordinator.device_info["fw_ver"],
+        }
+
+    async def async_added_to_hass(self) -> None:
+        """Load the devices and follow IR database commits."""
+        await super().async_added_to_hass()
+        ir_db: IRDatabase = self.hass.data[DOMAIN]["ir_database"]
+        self._attr_options = ir_db.device_names()
+        self.async_on_remove(ir_db.add_listener(self._handle_database_change))
+        self.async_on_remove(
+            async_add_device_selector(self.hass, self._entry_id, self.set_device)
+        )
+        if self._attr_current_option is None and self._attr_options:
+            async_select_device(self.hass, self._attr_options[0], self._entry_id)
+
+    @callback
+    def _handle_database_change(self, records: list[dict[str, Any]]) -> None:
+        """Add and remove the devices of a commit."""
+        # A new list, the written state keeps a reference to the old one
+        options = list(self._attr_options)
+        changed = False
+        for record in records:
+            device = record["device"]
+            if record["op"] == JOURNAL_DELETE_DEVICE:
+                if device in options:
+                    options.remove(device)
+                    changed = True
+            elif device not in options:
+                options.append(device)
+                changed = True
+
+        if not changed:
+            return
+        self._attr_options = options
+        if self._attr_current_option not in options:
+            # The selected device is gone, fall back on the first one
+            async_select_device(self.hass, options[0] if options else None, self._entry_id)
+        else:
+            self.async_write_ha_state()
+
+    @callback
+    def set_device(self, device_name: str | None) -> None:
+        """Show a device selected elsewhere, matched case-insensitively."""
+        if device_name is not None:
+            device_lower = device_name.lower()
+            device_name = next(
+                (option for option in self._attr_options if option.lower() == device_lower),
+                None,
+            )
+        self._attr_current_option = device_name
+        self.async_write_ha_state()
+
+    async def async_select_option(self, option: str) -> None:
+        """Select a device for the whole hub."""
+        async_select_device(self.hass, option, self._entry_id)
+
+
+class HaptiqueCommandSelect(HaptiqueEntity, SelectEntity):
+    """Select of a command of the selected IR database device.
+
+    Only commit records of the selected device change the options.
+    """
+
+    def __init__(
+        self,
+        coordinator: HaptiqueCoordinator,
+        entry: ConfigEntry,
+    ) -> None:
+        """Initialize the command select."""
+        # Follows the IR database, the coordinator only for availability
+        super().__init__(coordinator, ())
+
+        hostname = coordinator.device_info.get("hostname", "haptique_extender")
+
+        self._entry_id = entry.entry_id
+        self._attr_name = "IR Command"
+        self._attr_unique_id = f"{entry.entry_id}_ir_command_select"
+        self._attr_icon = "mdi:gesture-tap-button"
+        self._attr_has_entity_name = True
+        self._attr_options = []
+        self._attr_current_option = None
+        self._selected_device: str | None = None
+
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, coordinator.device_info["mac"])},
+            "name": hostname,
+            "manufacturer": "KINCONY",
+            "model": "KC868-AG",
+            "sw_version": coordinator.device_info["fw_ver"],
+        }
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the device the commands belong to."""
+        return {"selected_device": self._selected_device}
+
+    async def async_added_to_hass(self) -> None:
+        """Follow IR database commits and the selected device."""
+        await super().async_added_to_hass()
+        ir_db: IRDatabase = self.hass.data[DOMAIN]["ir_database"]
+        self.async_on_remove(ir_db.add_listener(self._handle_database_change))
+        self.async_on_remove(
+            async_add_device_selector(self.hass, self._entry_id, self.set_device)
+        )
+
+    @callback
+    def _handle_database_change(self, records: list[dict[str, Any]]) -> None:
+        """Add and remove the commands of the selected device in a commit."""
+        if self._selected_device is None:
+            return
+
+        selected = self._selected_device.lower()
+        options = list(self._attr_options)
+        changed = False
+        for record in records:
+            if record["device"].lower() != selected:
+                continue
+            operation = record["op"]
+            if operation == JOURNAL_PUT_DEVICE:
+                options[:] = list(record["data"]["commands"])
+            elif operation == JOURNAL_DELETE_DEVICE:
+                options.clear()
+            elif operation == JOURNAL_PUT_COMMAND:
+                if record["command"] in options:
+                    continue
+                options.append(record["command"])
+            elif operation == JOURNAL_DELETE_COMMAND:
+                if record["command"] not in options:
+                    continue
+                options.remove(record["command"])
+            else:
+                continue
+            changed = True
+
+        if not changed:
+            return
+        self._attr_options = options
+        if self._attr_current_option not in options:
+            self._attr_current_option = options[0] if options else None
+        self.async_write_ha_state()
+
+    @callback
+    def set_device(self, device_name: str | None) -> None:
+        """Show the commands of a device, the first one selected."""
+        ir_db: IRDatabase = self.hass.data[DOMAIN]["ir_database"]
+        self._selected_device = device_name
+        self._attr_options = ir_db.command_names(device_name) if device_name else []
+        self._attr_current_option = self._attr_options[0] if self._attr_options else None
+        self.async_write_ha_state()
+
+    async def async_select_option(self, option: str) -> None:
+        """Select a command."""
+        self._attr_current_option = option
+        self.async_write_ha_state()
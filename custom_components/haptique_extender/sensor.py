@@ -3,6 +3,7 @@ from __future__ import annotations
 
 from collections.abc import Callable
 from dataclasses import dataclass
+from datetime import timedelta
 from typing import Any
 
 from homeassistant.components.sensor import (
@@ -12,15 +13,24 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import SIGNAL_STRENGTH_DECIBELS_MILLIWATT
-from homeassistant.core import HomeAssistant
+from homeassistant.const import (
+    PERCENTAGE,
+    SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
+    UnitOfTime,
+)
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
 from .coordinator import HaptiqueCoordinator
+from .entity import HaptiqueEntity, async_add_device_selector
+from .ir_database import IRDatabase
+from .metrics import HubMetrics
+
+# Metric sensors are polled at this cadence instead of on every request
+SCAN_INTERVAL = timedelta(seconds=60)
 
 
 @dataclass
@@ -28,6 +38,14 @@ class HaptiqueSensorEntityDescription(SensorEntityDescription):
     """Describes Haptique sensor entity."""
 
     value_fn: Callable[[dict[str, Any]], StateType] | None = None
+    data_keys: tuple[str, ...] | None = None
+
+
+@dataclass
+class HaptiqueMetricSensorEntityDescription(SensorEntityDescription):
+    """Describes Haptique metric sensor entity."""
+
+    value_fn: Callable[[HubMetrics, IRDatabase], StateType] | None = None
 
 
 SENSOR_TYPES: tuple[HaptiqueSensorEntityDescription, ...] = (
@@ -37,24 +55,28 @@ SENSOR_TYPES: tuple[HaptiqueSensorEntityDescription, ...] = (
         name="Firmware Version",
         icon="mdi:chip",
         value_fn=lambda data: data.get("status", {}).get("fw_ver", "unknown"),
+        data_keys=("status.fw_ver",),
     ),
     HaptiqueSensorEntityDescription(
         key="hostname",
         name="Hostname",
         icon="mdi:network",
         value_fn=lambda data: data.get("status", {}).get("hostname", "unknown"),
+        data_keys=("status.hostname",),
     ),
     HaptiqueSensorEntityDescription(
         key="mac_address",
         name="MAC Address",
         icon="mdi:identifier",
         value_fn=lambda data: data.get("status", {}).get("mac", "unknown"),
+        data_keys=("status.mac",),
     ),
     HaptiqueSensorEntityDescription(
         key="sta_ip",
         name="IP Address",
         icon="mdi:ip-network",
         value_fn=lambda data: data.get("status", {}).get("sta_ip", "unknown"),
+        data_keys=("status.sta_ip",),
     ),
     
     # WiFi Sensors
@@ -63,6 +85,7 @@ SENSOR_TYPES: tuple[HaptiqueSensorEntityDescription, ...] = (
         name="WiFi SSID",
         icon="mdi:wifi",
         value_fn=lambda data: data.get("status", {}).get("sta_ssid", "unknown"),
+        data_keys=("status.sta_ssid",),
     ),
     HaptiqueSensorEntityDescription(
         key="wifi_signal",
@@ -72,6 +95,7 @@ SENSOR_TYPES: tuple[HaptiqueSensorEntityDescription, ...] = (
         device_class=SensorDeviceClass.SIGNAL_STRENGTH,
         state_class=SensorStateClass.MEASUREMENT,
         value_fn=lambda data: data.get("wifi", {}).get("sta", {}).get("rssi"),
+        data_keys=("wifi.sta.rssi",),
     ),
     
     # Hub Storage Info Sensors (firmware)
@@ -81,12 +105,14 @@ SENSOR_TYPES: tuple[HaptiqueSensorEntityDescription, ...] = (
         icon="mdi:database",
         state_class=SensorStateClass.MEASUREMENT,
         value_fn=lambda data: data.get("storage_info", {}).get("ir_count", 0),
+        data_keys=("storage_info.ir_count",),
     ),
     HaptiqueSensorEntityDescription(
         key="ir_storage_max",
         name="Hub IR Storage Max",
         icon="mdi:database-settings",
         value_fn=lambda data: data.get("storage_info", {}).get("ir_max", 50),
+        data_keys=("storage_info.ir_max",),
     ),
     HaptiqueSensorEntityDescription(
         key="ir_storage_percent",
@@ -99,6 +125,7 @@ SENSOR_TYPES: tuple[HaptiqueSensorEntityDescription, ...] = (
                    data.get("storage_info", {}).get("ir_max", 50)) * 100, 1)
             if data.get("storage_info", {}).get("ir_max", 50) > 0 else 0
         ),
+        data_keys=("storage_info",),
     ),
     
     # Last Learned IR Code Sensor
@@ -108,6 +135,78 @@ SENSOR_TYPES: tuple[HaptiqueSensorEntityDescription, ...] = (
         icon="mdi:remote-tv",
         device_class=SensorDeviceClass.TIMESTAMP,
         value_fn=lambda data: data.get("last_learn_ir_timestamp"),
+        data_keys=("last_learn_ir_timestamp", "last_learn_ir_code"),
+    ),
+)
+
+
+METRIC_SENSOR_TYPES: tuple[HaptiqueMetricSensorEntityDescription, ...] = (
+    HaptiqueMetricSensorEntityDescription(
+        key="request_latency_p50",
+        name="Request Latency p50",
+        icon="mdi:timer-outline",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda metrics, ir_db: metrics.request_latency.percentile(0.50),
+    ),
+    HaptiqueMetricSensorEntityDescription(
+        key="request_latency_p95",
+        name="Request Latency p95",
+        icon="mdi:timer-alert-outline",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda metrics, ir_db: metrics.request_latency.percentile(0.95),
+    ),
+    HaptiqueMetricSensorEntityDescription(
+        key="send_success_rate",
+        name="Send Success Rate",
+        icon="mdi:send-check",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda metrics, ir_db: metrics.send_success_rate,
+    ),
+    HaptiqueMetricSensorEntityDescription(
+        key="refresh_duration",
+        name="Refresh Duration",
+        icon="mdi:refresh",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda metrics, ir_db: metrics.last_refresh_ms,
+    ),
+    HaptiqueMetricSensorEntityDescription(
+        key="consecutive_failures",
+        name="Consecutive Request Failures",
+        icon="mdi:alert-circle-outline",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda metrics, ir_db: metrics.consecutive_failures,
+    ),
+    HaptiqueMetricSensorEntityDescription(
+        key="avoided_state_writes",
+        name="Avoided State Writes",
+        icon="mdi:content-save-off-outline",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda metrics, ir_db: metrics.avoided_writes,
+    ),
+    HaptiqueMetricSensorEntityDescription(
+        key="db_load_time",
+        name="Database Load Time",
+        icon="mdi:database-arrow-up",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda metrics, ir_db: ir_db.last_load_ms,
+    ),
+    HaptiqueMetricSensorEntityDescription(
+        key="db_save_time",
+        name="Database Save Time",
+        icon="mdi:database-arrow-down",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda metrics, ir_db: ir_db.last_save_ms,
     ),
 )
 
@@ -128,11 +227,17 @@ async def async_setup_entry(
     # Add DB sensors
     entities.append(HaptiqueDevicesSensor(coordinator, entry))
     entities.append(HaptiqueCommandsSensor(coordinator, entry))
+    
+    # Add metric sensors (disabled by default)
+    entities.extend(
+        HaptiqueMetricSensor(coordinator, entry, description)
+        for description in METRIC_SENSOR_TYPES
+    )
 
     async_add_entities(entities)
 
 
-class HaptiqueSensor(CoordinatorEntity[HaptiqueCoordinator], SensorEntity):
+class HaptiqueSensor(HaptiqueEntity, SensorEntity):
     """Representation of a Haptique sensor."""
 
     entity_description: HaptiqueSensorEntityDescription
@@ -144,7 +249,7 @@ class HaptiqueSensor(CoordinatorEntity[HaptiqueCoordinator], SensorEntity):
         description: HaptiqueSensorEntityDescription,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, description.data_keys)
         self.entity_description = description
         
         # Use hostname for entity naming
@@ -183,16 +288,20 @@ class HaptiqueSensor(CoordinatorEntity[HaptiqueCoordinator], SensorEntity):
         return None
 
 
-class HaptiqueDevicesSensor(CoordinatorEntity[HaptiqueCoordinator], SensorEntity):
+class HaptiqueDevicesSensor(HaptiqueEntity, SensorEntity):
     """Sensor that lists all devices in the IR database."""
 
+    # The lists are in the IR database already, the recorder skips them
+    _unrecorded_attributes = frozenset({"devices", "device_names"})
+
     def __init__(
         self,
         coordinator: HaptiqueCoordinator,
         entry: ConfigEntry,
     ) -> None:
         """Initialize the devices sensor."""
-        super().__init__(coordinator)
+        # Follows the IR database, the coordinator only for availability
+        super().__init__(coordinator, ())
         
         hostname = coordinator.device_info.get("hostname", "haptique_extender")
         
@@ -209,6 +318,17 @@ class HaptiqueDevicesSensor(CoordinatorEntity[HaptiqueCoordinator], SensorEntity
             "sw_version": coordinator.device_info["fw_ver"],
         }
 
+    async def async_added_to_hass(self) -> None:
+        """Follow IR database commits as well as coordinator updates."""
+        await super().async_added_to_hass()
+        ir_db: IRDatabase = self.hass.data[DOMAIN]["ir_database"]
+        self.async_on_remove(ir_db.add_listener(self._handle_database_change))
+
+    @callback
+    def _handle_database_change(self, records: list[dict[str, Any]]) -> None:
+        """Write the new state once per committed transaction."""
+        self.async_write_ha_state()
+
     @property
     def native_value(self) -> int:
         """Return the number of devices."""
@@ -232,8 +352,10 @@ class HaptiqueDevicesSensor(CoordinatorEntity[HaptiqueCoordinator], SensorEntity
         }
 
 
-class HaptiqueCommandsSensor(CoordinatorEntity[HaptiqueCoordinator], SensorEntity):
-    """Sensor that lists commands (requires device selection via service call)."""
+class HaptiqueCommandsSensor(HaptiqueEntity, SensorEntity):
+    """Sensor that lists the commands of the device selected on the hub."""
+
+    _unrecorded_attributes = frozenset({"commands", "command_names"})
 
     def __init__(
         self,
@@ -241,7 +363,8 @@ class HaptiqueCommandsSensor(CoordinatorEntity[HaptiqueCoordinator], SensorEntit
         entry: ConfigEntry,
     ) -> None:
         """Initialize the commands sensor."""
-        super().__init__(coordinator)
+        # Follows the IR database, the coordinator only for availability
+        super().__init__(coordinator, ())
         
         hostname = coordinator.device_info.get("hostname", "haptique_extender")
         
@@ -249,6 +372,7 @@ class HaptiqueCommandsSensor(CoordinatorEntity[HaptiqueCoordinator], SensorEntit
         self._attr_unique_id = f"{entry.entry_id}_ir_commands"
         self._attr_icon = "mdi:code-braces"
         self._attr_has_entity_name = True
+        self._entry_id = entry.entry_id
         self._selected_device: str | None = None
         
         self._attr_device_info = {
@@ -259,6 +383,24 @@ class HaptiqueCommandsSensor(CoordinatorEntity[HaptiqueCoordinator], SensorEntit
             "sw_version": coordinator.device_info["fw_ver"],
         }
 
+    async def async_added_to_hass(self) -> None:
+        """Follow IR database commits and the device selected on the hub."""
+        await super().async_added_to_hass()
+        ir_db: IRDatabase = self.hass.data[DOMAIN]["ir_database"]
+        self.async_on_remove(ir_db.add_listener(self._handle_database_change))
+        self.async_on_remove(
+            async_add_device_selector(self.hass, self._entry_id, self.set_device)
+        )
+
+    @callback
+    def _handle_database_change(self, records: list[dict[str, Any]]) -> None:
+        """Write the new state when a commit touched the selected device."""
+        if not self._selected_device:
+            return
+        selected = self._selected_device.lower()
+        if any(record["device"].lower() == selected for record in records):
+            self.async_write_ha_state()
+
     @property
     def native_value(self) -> int:
         """Return the number of commands for selected device."""
@@ -292,7 +434,48 @@ class HaptiqueCommandsSensor(CoordinatorEntity[HaptiqueCoordinator], SensorEntit
             "command_names": [c["name"] for c in commands],
         }
     
-    def set_device(self, device_name: str) -> None:
+    @callback
+    def set_device(self, device_name: str | None) -> None:
         """Set the device to query commands for."""
         self._selected_device = device_name
         self.async_write_ha_state()
+
+
+class HaptiqueMetricSensor(SensorEntity):
+    """Latency or reliability metric of a hub, polled on SCAN_INTERVAL."""
+
+    entity_description: HaptiqueMetricSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: HaptiqueCoordinator,
+        entry: ConfigEntry,
+        description: HaptiqueMetricSensorEntityDescription,
+    ) -> None:
+        """Initialize the metric sensor."""
+        self.coordinator = coordinator
+        self.entity_description = description
+        
+        hostname = coordinator.device_info.get("hostname", "haptique_extender")
+        
+        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+        self._attr_has_entity_name = True
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._attr_entity_registry_enabled_default = False
+        self._attr_should_poll = True
+        
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, coordinator.device_info["mac"])},
+            "name": hostname,
+            "manufacturer": "KINCONY",
+            "model": "KC868-AG",
+            "sw_version": coordinator.device_info["fw_ver"],
+        }
+
+    async def async_update(self) -> None:
+        """Read the current metric value."""
+        ir_db: IRDatabase = self.hass.data[DOMAIN]["ir_database"]
+        if self.entity_description.value_fn:
+            self._attr_native_value = self.entity_description.value_fn(
+                self.coordinator.metrics, ir_db
+            )
@@ -8,10 +8,10 @@ from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
 from .coordinator import HaptiqueCoordinator
+from .entity import HaptiqueEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -31,7 +31,7 @@ async def async_setup_entry(
     async_add_entities(entities)
 
 
-class HaptiqueIRLearningSwitch(CoordinatorEntity[HaptiqueCoordinator], SwitchEntity):
+class HaptiqueIRLearningSwitch(HaptiqueEntity, SwitchEntity):
     """Switch to enable/disable IR learning mode."""
 
     def __init__(
@@ -0,0 +1,113 @@
+"""MQTT telemetry of Haptique Extender hubs."""
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Callable
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+
+from .codec import json_loads
+from .const import (
+    API_IR_LAST,
+    API_IR_RXINFO,
+    API_IR_SAVED,
+    API_STATUS,
+    API_WIFI_STATUS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Endpoints a hub can publish instead of being polled; the topic is the
+# endpoint path without "/api" under the hub prefix, "<prefix>/ir/last"
+TELEMETRY_ENDPOINTS = (API_STATUS, API_WIFI_STATUS, API_IR_RXINFO, API_IR_SAVED, API_IR_LAST)
+
+
+class MqttTelemetry:
+    """Hub answers pushed on a local MQTT broker.
+
+    The hub publishes the same JSON it serves over HTTP. A message younger
+    than `max_age` stands in for the HTTP request of its endpoint; any
+    endpoint the hub does not publish, or stopped publishing, is still
+    polled over HTTP.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        prefix: str,
+        on_message: Callable[[str], None],
+        max_age: float,
+    ) -> None:
+        """Initialize the telemetry of one hub."""
+        self.hass = hass
+        self.prefix = prefix.rstrip("/")
+        self.max_age = max_age
+        self.received: dict[str, int] = dict.fromkeys(TELEMETRY_ENDPOINTS, 0)
+        self._on_message = on_message
+        self._values: dict[str, tuple[dict[str, Any], float]] = {}
+        self._unsubscribes: list[Callable[[], None]] = []
+
+    @property
+    def connected(self) -> bool:
+        """Return True while subscribed to the hub topics."""
+        return bool(self._unsubscribes)
+
+    def topic(self, endpoint: str) -> str:
+        """Return the topic an endpoint is published on."""
+        return f"{self.prefix}{endpoint.removeprefix('/api')}"
+
+    async def async_start(self) -> bool:
+        """Subscribe to the hub topics, False without an MQTT integration."""
+        if "mqtt" not in self.hass.config.components:
+            _LOGGER.warning("MQTT is not set up, %s stays on HTTP polling", self.prefix)
+            return False
+
+        from homeassistant.components import mqtt
+
+        if not await mqtt.async_wait_for_mqtt_client(self.hass):
+            _LOGGER.warning("MQTT broker unavailable, %s stays on HTTP polling", self.prefix)
+            return False
+
+        for endpoint in TELEMETRY_ENDPOINTS:
+            self._unsubscribes.append(
+                await mqtt.async_subscribe(
+                    self.hass, self.topic(endpoint), self._message_handler(endpoint)
+                )
+            )
+        _LOGGER.info("Subscribed to hub telemetry under %s/#", self.prefix)
+        return True
+
+    @callback
+    def async_stop(self) -> None:
+        """Unsubscribe and forget the pushed values."""
+        for unsubscribe in self._unsubscribes:
+            unsubscribe()
+        self._unsubscribes.clear()
+        self._values.clear()
+
+    def get(self, endpoint: str) -> dict[str, Any] | None:
+        """Return the last pushed answer of an endpoint, None if too old."""
+        pushed = self._values.get(endpoint)
+        if pushed is None or time.monotonic() - pushed[1] > self.max_age:
+            return None
+        return pushed[0]
+
+    def _message_handler(self, endpoint: str) -> Callable[[Any], None]:
+        """Return the handler of the messages of one endpoint."""
+
+        @callback
+        def _handle_message(message: Any) -> None:
+            try:
+                value = json_loads(message.payload)
+            except ValueError:
+                _LOGGER.debug("Malformed telemetry on %s", message.topic)
+                return
+            if not isinstance(value, dict):
+                return
+            self._values[endpoint] = (value, time.monotonic())
+            self.received[endpoint] += 1
+            self._on_message(endpoint)
+
+        return _handle_message
@@ -0,0 +1,76 @@
+"""Request timeouts and deadlines for Haptique Extender hubs."""
+from __future__ import annotations
+
+import asyncio
+import time
+
+import aiohttp
+
+from .const import DEFAULT_REQUEST_TIMEOUTS, ENDPOINT_CLASS_STATUS, ENDPOINT_CLASSES
+
+
+class DeadlineExceededError(asyncio.TimeoutError):
+    """Exception raised when a caller's time budget is spent."""
+    pass
+
+
+class Deadline:
+    """Absolute point in time by which a caller needs an answer.
+
+    A deadline is created once by a service or loop and passed down to
+    every request it makes, so later requests only get what is left.
+    """
+
+    def __init__(self, seconds: float) -> None:
+        """Initialize a deadline `seconds` from now."""
+        self._expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        """Return the seconds left, never below zero."""
+        return max(0.0, self._expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        """Return True once the deadline has passed."""
+        return self.remaining() <= 0
+
+
+def request_timeout(
+    endpoint: str,
+    deadline: Deadline | None = None,
+    timeouts: dict[str, tuple[float, float, float]] | None = None,
+) -> aiohttp.ClientTimeout:
+    """Build the timeout of a request to `endpoint`.
+
+    The endpoint class gives the connect, read and total timeouts; the total
+    is capped by what is left of the deadline.
+    """
+    timeouts = timeouts or DEFAULT_REQUEST_TIMEOUTS
+    endpoint_class = ENDPOINT_CLASSES.get(endpoint, ENDPOINT_CLASS_STATUS)
+    connect, read, total = timeouts[endpoint_class]
+
+    if deadline is not None:
+        remaining = deadline.remaining()
+        if remaining <= 0:
+            raise DeadlineExceededError(f"No time left to request {endpoint}")
+        total = min(total, remaining)
+
+    return aiohttp.ClientTimeout(
+        total=total,
+        connect=min(connect, total),
+        sock_read=min(read, total),
+    )
+
+
+def cut_by_deadline(
+    endpoint: str,
+    timeout: aiohttp.ClientTimeout,
+    timeouts: dict[str, tuple[float, float, float]] | None = None,
+) -> bool:
+    """Check if a deadline left a request less time than its endpoint allows.
+
+    A request timing out then says nothing about the hub.
+    """
+    timeouts = timeouts or DEFAULT_REQUEST_TIMEOUTS
+    endpoint_class = ENDPOINT_CLASSES.get(endpoint, ENDPOINT_CLASS_STATUS)
+    return timeout.total < timeouts[endpoint_class][2]
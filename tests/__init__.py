@@ -0,0 +1 @@
+"""Tests for the Haptique Extender integration."""
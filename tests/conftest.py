@@ -0,0 +1,80 @@
+"""Fixtures for Haptique Extender tests."""
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.test_util.aiohttp import AiohttpClientMocker
+
+from custom_components.haptique_extender.const import (
+    API_IR_LAST,
+    API_IR_RXINFO,
+    API_IR_SAVED,
+    API_IR_SEND,
+    API_STATUS,
+    API_WIFI_STATUS,
+    DOMAIN,
+)
+from custom_components.haptique_extender.ir_database import IRDatabase
+
+HUB_HOST = "192.168.1.50"
+HUB_MAC = "AA:BB:CC:DD:EE:FF"
+
+HUB_ANSWERS: dict[str, dict[str, Any]] = {
+    API_STATUS: {
+        "hostname": "haptique-test",
+        "instance": "Haptique Extender",
+        "mac": HUB_MAC,
+        "fw_ver": "1.1.2",
+        "ap_on": False,
+        "sta_ok": True,
+        "sta_ssid": "home",
+    },
+    API_WIFI_STATUS: {"sta": {"ssid": "home", "rssi": -55, "ip": HUB_HOST}},
+    API_IR_RXINFO: {"enabled": True},
+    API_IR_SAVED: {"count": 0, "max": 50, "available": 50},
+    API_IR_LAST: {},
+}
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Load the integration from custom_components in every test."""
+    yield
+
+
+@pytest.fixture
+async def hass(hass: HomeAssistant, tmp_path) -> HomeAssistant:
+    """Keep the files of each test, such as the IR database, apart."""
+    hass.config.config_dir = str(tmp_path)
+    return hass
+
+
+@pytest.fixture
+def hub(aioclient_mock: AiohttpClientMocker) -> AiohttpClientMocker:
+    """Answer the hub REST API on HUB_HOST."""
+    for endpoint, answer in HUB_ANSWERS.items():
+        aioclient_mock.get(f"http://{HUB_HOST}{endpoint}", json=answer)
+    aioclient_mock.post(f"http://{HUB_HOST}{API_IR_SEND}", json={"ok": True})
+    return aioclient_mock
+
+
+@pytest.fixture
+def config_entry() -> MockConfigEntry:
+    """Return the config entry of a hub, not added yet."""
+    return MockConfigEntry(
+        domain=DOMAIN,
+        title="Haptique Test",
+        unique_id=HUB_MAC,
+        data={"host": HUB_HOST, "name": "Haptique Test", "token": "test-token"},
+    )
+
+
+@pytest.fixture
+async def ir_database(hass: HomeAssistant) -> IRDatabase:
+    """Return an empty IR database kept in a temporary directory."""
+    database = IRDatabase(hass)
+    await database.async_ensure_loaded()
+    return database
@@ -0,0 +1,99 @@
+"""Tests for the air conditioner codes of Haptique Extender."""
+from __future__ import annotations
+
+import pytest
+
+from custom_components.haptique_extender.ac_codes import (
+    AC_PROTOCOLS,
+    COOLIX_BIT_MARK,
+    COOLIX_ONE_SPACE,
+    GREE_ONE_SPACE,
+    ACState,
+    build_request,
+    frame_cache_statistics,
+    update_state,
+)
+from custom_components.haptique_extender.codec import json_loads
+
+
+def _bytes(pairs: list[int], one_space: int, msb_first: bool) -> list[int]:
+    """Decode mark/space pairs back to bytes."""
+    bits = [int(space == one_space) for space in pairs[1::2]]
+    values = []
+    for index in range(0, len(bits), 8):
+        byte = bits[index:index + 8]
+        if not msb_first:
+            byte.reverse()
+        values.append(int("".join(map(str, byte)), 2))
+    return values
+
+
+def _coolix(state: ACState) -> list[int]:
+    raw = AC_PROTOCOLS["coolix"].encode(state)
+    assert len(raw) == 200
+    # Sent twice, the copy only differs by its trailing gap
+    assert raw[:99] == raw[100:199]
+    return _bytes(raw[2:98], COOLIX_ONE_SPACE, msb_first=True)
+
+
+def test_coolix_cool() -> None:
+    """Cool at 24 C with the fan on auto."""
+    assert _coolix(ACState("cool", 24, "auto")) == [0xB2, 0x4D, 0xBF, 0x40, 0x40, 0xBF]
+
+
+def test_coolix_off() -> None:
+    """Off is a code of its own, whatever the rest of the state."""
+    assert _coolix(ACState("off", 19, "high")) == [0xB2, 0x4D, 0x7B, 0x84, 0xE0, 0x1F]
+
+
+def test_coolix_marks() -> None:
+    """Every bit starts with the same mark."""
+    raw = AC_PROTOCOLS["coolix"].encode(ACState())
+    assert set(raw[2:98:2]) == {COOLIX_BIT_MARK}
+
+
+def test_gree_cool_with_swing() -> None:
+    """Cool at 25 C with swing, checksum in the high nibble of the last byte."""
+    raw = AC_PROTOCOLS["gree"].encode(ACState("cool", 25, "auto", "on"))
+
+    assert len(raw) == 140
+    assert _bytes(raw[2:66], GREE_ONE_SPACE, msb_first=False) == [0x49, 0x09, 0x60, 0x50]
+    assert _bytes(raw[74:138], GREE_ONE_SPACE, msb_first=False) == [0x01, 0x20, 0x00, 0xE0]
+
+
+def test_update_state_clamps_the_temperature() -> None:
+    """Setpoints out of the protocol range are clamped."""
+    state = update_state("coolix", ACState(), temperature=35)
+    assert state.temperature == 30
+    assert update_state("gree", state, temperature=10.4).temperature == 16
+    # Values left out stay as they were
+    assert update_state("gree", state, hvac_mode="heat", fan_mode=None).fan_mode == "auto"
+
+
+@pytest.mark.parametrize(
+    ("protocol", "changes"),
+    [
+        ("daikin", {}),
+        ("coolix", {"hvac_mode": "turbo"}),
+        ("coolix", {"fan_mode": "max"}),
+        ("gree", {"swing_mode": "sideways"}),
+        ("coolix", {"swing_mode": "on"}),
+    ],
+)
+def test_update_state_rejects_invalid_values(protocol: str, changes: dict) -> None:
+    """Unknown protocols and settings raise ValueError."""
+    with pytest.raises(ValueError):
+        update_state(protocol, ACState(), **changes)
+
+
+def test_build_request_is_cached() -> None:
+    """A state is encoded once, then served from the cache."""
+    state = ACState("heat", 21, "low", "on")
+    request = build_request("gree", state)
+    hits = frame_cache_statistics()["hits"]
+
+    assert build_request("gree", ACState("heat", 21, "low", "on")) is request
+    assert frame_cache_statistics()["hits"] == hits + 1
+    body = json_loads(request)
+    assert body["freq"] == 38000
+    assert body["raw"] == AC_PROTOCOLS["gree"].encode(state)
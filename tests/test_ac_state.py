@@ -0,0 +1,40 @@
+"""Tests for the set_ac_state service of Haptique Extender."""
+from __future__ import annotations
+
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_capture_events,
+)
+
+from custom_components.haptique_extender.const import DOMAIN
+from custom_components.haptique_extender.events import EVENT_OPERATION
+
+
+async def test_slider_drag_reports_the_last_state(
+    hass: HomeAssistant, hub, config_entry: MockConfigEntry
+) -> None:
+    """Coalesced setpoints still report the state the AC ended up in."""
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    await hass.services.async_call(DOMAIN, "set_event_mode", {"mode": "slim"}, blocking=True)
+    events = async_capture_events(hass, EVENT_OPERATION)
+
+    for temperature in (22, 23, 24, 25):
+        await hass.services.async_call(
+            DOMAIN,
+            "set_ac_state",
+            {"device_name": "Living AC", "protocol": "gree", "temperature": temperature},
+            blocking=True,
+        )
+    hass.data[DOMAIN]["events"].async_flush()
+    await hass.async_block_till_done()
+
+    assert len(events) == 2
+    assert events[0].data["data"]["temperature"] == 22
+    summary = events[1].data["data"]
+    assert summary["coalesced"] == 3
+    assert summary["protocol"] == "gree"
+    assert summary["temperature"] == 25
+    assert hass.data[DOMAIN]["ir_database"].get_ac("Living AC")["state"]["temperature"] == 25
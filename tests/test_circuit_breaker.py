@@ -0,0 +1,167 @@
+"""Tests for the circuit breaker and request deadlines of Haptique Extender hubs."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_capture_events,
+)
+
+from custom_components.haptique_extender.circuit_breaker import (
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    CircuitBreaker,
+    HubUnavailableError,
+)
+from custom_components.haptique_extender.const import (
+    API_IR_SEND,
+    API_STATUS,
+    DEFAULT_REQUEST_TIMEOUTS,
+    DOMAIN,
+)
+from custom_components.haptique_extender.request_trace import ERROR_DEADLINE, RequestRecord
+from custom_components.haptique_extender.timeouts import (
+    Deadline,
+    DeadlineExceededError,
+    cut_by_deadline,
+    request_timeout,
+)
+
+from .conftest import HUB_HOST
+
+
+def _record(status: int | None = None, error: str | None = None) -> RequestRecord:
+    record = RequestRecord("GET", API_STATUS)
+    record.status = status
+    record.error = error
+    return record
+
+
+def test_opens_after_consecutive_failures() -> None:
+    """Requests are rejected once the failure threshold is reached."""
+    breaker = CircuitBreaker("hub", failure_threshold=3)
+    for _ in range(2):
+        breaker.record_request(_record(error="Timeout"))
+    assert breaker.state == STATE_CLOSED
+
+    breaker.record_request(_record(error="Timeout"))
+    assert breaker.state == STATE_OPEN
+    assert breaker.is_open
+    with pytest.raises(HubUnavailableError):
+        breaker.before_request()
+
+
+def test_answers_below_500_reset_the_failures() -> None:
+    """Any answer from the hub proves it is reachable."""
+    breaker = CircuitBreaker("hub", failure_threshold=2)
+    breaker.record_request(_record(error="Timeout"))
+    breaker.record_request(_record(status=404))
+    breaker.record_request(_record(status=503))
+
+    assert breaker.failures == 1
+    assert breaker.state == STATE_CLOSED
+
+
+def test_half_open_probe() -> None:
+    """One probe goes out after the reset timeout, its result decides."""
+    breaker = CircuitBreaker("hub", failure_threshold=1, reset_timeout=0)
+    breaker.record_request(_record(error="Timeout"))
+    assert breaker.state == STATE_OPEN
+
+    breaker.before_request()
+    assert breaker.state == STATE_HALF_OPEN
+    with pytest.raises(HubUnavailableError):
+        breaker.before_request()
+
+    breaker.record_request(_record(status=200))
+    assert breaker.state == STATE_CLOSED
+    assert not breaker.is_open
+
+
+def test_failed_probe_doubles_the_reset_timeout() -> None:
+    """The circuit reopens for longer after every failed probe."""
+    breaker = CircuitBreaker("hub", failure_threshold=1, reset_timeout=0.001)
+    breaker.record_request(_record(error="Timeout"))
+    breaker._opened_at -= 1
+    breaker.before_request()
+    breaker.record_request(_record(error="Timeout"))
+
+    assert breaker.state == STATE_OPEN
+    assert breaker._current_timeout == 0.002
+
+
+def test_deadline_timeouts_are_not_failures() -> None:
+    """A caller giving up before the endpoint timeout says nothing of the hub."""
+    breaker = CircuitBreaker("hub", failure_threshold=1)
+    breaker.record_request(_record(error=ERROR_DEADLINE))
+
+    assert breaker.state == STATE_CLOSED
+    assert breaker.failures == 0
+
+
+def test_request_timeout_is_capped_by_the_deadline() -> None:
+    """The deadline bounds the total and every other timeout."""
+    own = request_timeout(API_IR_SEND)
+    assert own.total == DEFAULT_REQUEST_TIMEOUTS["send"][2]
+    assert not cut_by_deadline(API_IR_SEND, own)
+
+    capped = request_timeout(API_IR_SEND, Deadline(0.05))
+    assert capped.total <= 0.05
+    assert capped.connect <= capped.total
+    assert cut_by_deadline(API_IR_SEND, capped)
+
+
+def test_expired_deadline_raises() -> None:
+    """No request is made once the deadline has passed."""
+    deadline = Deadline(0)
+    assert deadline.expired
+    with pytest.raises(DeadlineExceededError):
+        request_timeout(API_STATUS, deadline)
+
+
+async def _setup(hass: HomeAssistant, entry: MockConfigEntry):
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return hass.data[DOMAIN][entry.entry_id]
+
+
+async def test_sends_cut_by_the_caller_deadline_keep_the_circuit_closed(
+    hass: HomeAssistant, hub, config_entry: MockConfigEntry
+) -> None:
+    """Only timeouts within the hub's own budget open the circuit."""
+    coordinator = await _setup(hass, config_entry)
+    hub.clear_requests()
+    hub.post(f"http://{HUB_HOST}{API_IR_SEND}", exc=asyncio.TimeoutError())
+
+    for _ in range(coordinator.circuit_breaker.failure_threshold):
+        assert not await coordinator.send_ir_code([9000, 4500, 560], deadline=Deadline(0.5))
+    assert coordinator.circuit_breaker.state == STATE_CLOSED
+    assert coordinator.request_trace.as_dicts()[-1]["error"] == ERROR_DEADLINE
+
+    for _ in range(coordinator.circuit_breaker.failure_threshold):
+        assert not await coordinator.send_ir_code([9000, 4500, 560])
+    assert coordinator.circuit_breaker.state == STATE_OPEN
+
+
+async def test_send_ir_code_reports_an_open_circuit(
+    hass: HomeAssistant, hub, config_entry: MockConfigEntry
+) -> None:
+    """Raw sends rejected by the circuit fire the unavailable event."""
+    coordinator = await _setup(hass, config_entry)
+    for _ in range(coordinator.circuit_breaker.failure_threshold):
+        coordinator.circuit_breaker.record_request(_record(error="Timeout"))
+    events = async_capture_events(hass, "haptique_operation")
+
+    await hass.services.async_call(
+        DOMAIN, "send_ir_code", {"raw_data": [9000, 4500, 560]}, blocking=True
+    )
+    await hass.async_block_till_done()
+
+    assert len(events) == 1
+    assert events[0].data["operation"] == "send"
+    assert events[0].data["error_code"] == "unavailable"
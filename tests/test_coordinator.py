@@ -0,0 +1,117 @@
+"""Tests for the keyed listener dispatch of the Haptique Extender coordinator."""
+from __future__ import annotations
+
+from collections.abc import Iterator
+from unittest.mock import patch
+
+import pytest
+from homeassistant.const import STATE_UNAVAILABLE
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.test_util.aiohttp import AiohttpClientMocker
+
+from custom_components.haptique_extender.const import API_STATUS, API_WIFI_STATUS, DOMAIN
+from custom_components.haptique_extender.coordinator import DataKeys, HaptiqueCoordinator
+from custom_components.haptique_extender.entity import HaptiqueEntity
+
+from .conftest import HUB_ANSWERS, HUB_HOST
+
+RSSI_SENSOR = "sensor.haptique_test_wifi_signal"
+
+
+@pytest.fixture
+def woken() -> Iterator[list[HaptiqueEntity]]:
+    """Record the entities every coordinator update wakes up."""
+    entities: list[HaptiqueEntity] = []
+    handle_update = HaptiqueEntity._handle_coordinator_update
+
+    def _handle_coordinator_update(self: HaptiqueEntity) -> None:
+        entities.append(self)
+        handle_update(self)
+
+    with patch.object(HaptiqueEntity, "_handle_coordinator_update", _handle_coordinator_update):
+        yield entities
+
+
+def _answer(hub: AiohttpClientMocker, **answers: dict | int) -> None:
+    """Answer the hub endpoints, some with other JSON or an HTTP status."""
+    hub.clear_requests()
+    for endpoint, answer in {**HUB_ANSWERS, **answers}.items():
+        if isinstance(answer, int):
+            hub.get(f"http://{HUB_HOST}{endpoint}", status=answer)
+        else:
+            hub.get(f"http://{HUB_HOST}{endpoint}", json=answer)
+
+
+def _keyed(entities: list[HaptiqueEntity]) -> set[str]:
+    return {
+        entity.entity_id for entity in entities if isinstance(entity.coordinator_context, DataKeys)
+    }
+
+
+async def _setup(hass: HomeAssistant, entry: MockConfigEntry) -> HaptiqueCoordinator:
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return hass.data[DOMAIN][entry.entry_id]
+
+
+async def test_rssi_change_wakes_only_the_rssi_sensor(
+    hass: HomeAssistant, hub, config_entry: MockConfigEntry, woken: list[HaptiqueEntity]
+) -> None:
+    """Keyed entities whose keys kept their value are left alone."""
+    coordinator = await _setup(hass, config_entry)
+    assert hass.states.get(RSSI_SENSOR).state == "-55"
+    woken.clear()
+
+    _answer(hub, **{API_WIFI_STATUS: {"sta": {"ssid": "home", "rssi": -70, "ip": HUB_HOST}}})
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert _keyed(woken) == {RSSI_SENSOR}
+    assert hass.states.get(RSSI_SENSOR).state == "-70"
+    # Entities without data keys are woken by any change
+    assert all(
+        not isinstance(entity.coordinator_context, DataKeys)
+        for entity in woken
+        if entity.entity_id != RSSI_SENSOR
+    )
+
+
+async def test_same_data_wakes_no_keyed_entity(
+    hass: HomeAssistant, hub, config_entry: MockConfigEntry, woken: list[HaptiqueEntity]
+) -> None:
+    """Listeners are told only of data that changed."""
+    coordinator = await _setup(hass, config_entry)
+    woken.clear()
+
+    coordinator.async_update_listeners()
+
+    assert _keyed(woken) == set()
+
+
+async def test_failed_refresh_wakes_every_keyed_entity(
+    hass: HomeAssistant, hub, config_entry: MockConfigEntry, woken: list[HaptiqueEntity]
+) -> None:
+    """Availability is rendered by every entity, so all of them are woken."""
+    coordinator = await _setup(hass, config_entry)
+    keyed = {
+        context for _, context in coordinator._listeners.values() if isinstance(context, DataKeys)
+    }
+    woken.clear()
+
+    _answer(hub, **{API_STATUS: 500})
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert not coordinator.last_update_success
+    assert {entity.coordinator_context for entity in woken} >= keyed
+    assert hass.states.get(RSSI_SENSOR).state == STATE_UNAVAILABLE
+
+    # Back online, every entity renders its state again
+    woken.clear()
+    _answer(hub)
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert {entity.coordinator_context for entity in woken} >= keyed
+    assert hass.states.get(RSSI_SENSOR).state == "-55"
@@ -0,0 +1,156 @@
+"""Tests for the operation events of Haptique Extender."""
+from __future__ import annotations
+
+import pytest
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_capture_events,
+)
+
+from custom_components.haptique_extender.const import DOMAIN, EVENT_MODE_FULL, EVENT_MODE_SLIM
+from custom_components.haptique_extender.events import (
+    EVENT_IR_CAPTURED,
+    EVENT_OPERATION,
+    EventPublisher,
+)
+
+RAW = [9000, 4500, 560]
+
+
+def _send(name: str) -> dict:
+    return {
+        "operation": "send",
+        "status": "success",
+        "entity_type": "command",
+        "device_name": "TV",
+        "command_name": name,
+    }
+
+
+async def test_full_events_carry_the_payload(hass: HomeAssistant) -> None:
+    """Full mode inlines the payload where the event keeps its data."""
+    events = async_capture_events(hass, EVENT_OPERATION)
+    captures = async_capture_events(hass, EVENT_IR_CAPTURED)
+    publisher = EventPublisher(hass, EVENT_MODE_FULL)
+
+    publisher.fire(EVENT_OPERATION, _send("Power"), {"raw_data": RAW})
+    publisher.fire(EVENT_IR_CAPTURED, {"host": "hub"}, {"raw_data": RAW})
+    await hass.async_block_till_done()
+
+    assert events[0].data["data"] == {"raw_data": RAW}
+    assert captures[0].data["raw_data"] == RAW
+
+
+async def test_slim_events_carry_a_reference(hass: HomeAssistant) -> None:
+    """Slim mode keeps the payload behind a reference."""
+    events = async_capture_events(hass, EVENT_OPERATION)
+    publisher = EventPublisher(hass, EVENT_MODE_SLIM, max_payloads=1)
+
+    publisher.fire(EVENT_OPERATION, _send("Power"), {"raw_data": RAW})
+    await hass.async_block_till_done()
+
+    data = events[0].data["data"]
+    assert "raw_data" not in data
+    assert publisher.get_payload(data["ref"]) == {"raw_data": RAW}
+
+    publisher.fire(EVENT_OPERATION, _send("Mute"), {"raw_data": RAW})
+    assert publisher.get_payload(data["ref"]) is None
+
+
+async def test_slim_bursts_are_coalesced(hass: HomeAssistant) -> None:
+    """The first event fires at once, the rest of the burst as one summary."""
+    events = async_capture_events(hass, EVENT_OPERATION)
+    publisher = EventPublisher(hass, EVENT_MODE_SLIM)
+
+    for name in ("Power", "Mute", "Mute"):
+        publisher.fire(EVENT_OPERATION, _send(name), coalesce=True)
+    await hass.async_block_till_done()
+    assert len(events) == 1
+    assert events[0].data["command_name"] == "Power"
+
+    publisher.async_flush()
+    await hass.async_block_till_done()
+    assert len(events) == 2
+    assert events[1].data["command_name"] == "Mute"
+    assert events[1].data["data"] == {"coalesced": 2, "names": ["Mute", "Mute"]}
+    assert publisher.get_statistics()["coalesced"] == 2
+
+
+async def test_full_events_are_never_coalesced(hass: HomeAssistant) -> None:
+    """Full mode fires every event of a burst at once."""
+    events = async_capture_events(hass, EVENT_OPERATION)
+    publisher = EventPublisher(hass, EVENT_MODE_FULL)
+
+    for name in ("Power", "Mute", "Mute"):
+        publisher.fire(EVENT_OPERATION, _send(name), coalesce=True)
+    await hass.async_block_till_done()
+
+    assert [event.data["command_name"] for event in events] == ["Power", "Mute", "Mute"]
+    assert publisher.get_statistics()["coalesced"] == 0
+
+
+async def test_summary_keeps_the_last_data(hass: HomeAssistant) -> None:
+    """A merged event still carries its own data, counts included."""
+    events = async_capture_events(hass, EVENT_OPERATION)
+    publisher = EventPublisher(hass, EVENT_MODE_SLIM)
+
+    for deleted in (1, 2, 3):
+        publisher.fire(
+            EVENT_OPERATION,
+            {
+                "operation": "delete",
+                "status": "success",
+                "entity_type": "command",
+                "device_name": "TV",
+                "data": {"deleted": deleted, "missing": 0},
+            },
+            coalesce=True,
+        )
+    publisher.async_flush()
+    await hass.async_block_till_done()
+
+    assert len(events) == 2
+    assert events[1].data["data"] == {"deleted": 3, "missing": 0, "coalesced": 2, "names": []}
+
+
+async def test_only_coalesced_events_are_merged(hass: HomeAssistant) -> None:
+    """Events fired without coalesce, or on another device, are not merged."""
+    events = async_capture_events(hass, EVENT_OPERATION)
+    publisher = EventPublisher(hass, EVENT_MODE_SLIM)
+
+    publisher.fire(EVENT_OPERATION, _send("Power"), coalesce=True)
+    publisher.fire(EVENT_OPERATION, _send("Power"))
+    publisher.fire(EVENT_OPERATION, {**_send("Power"), "device_name": "Radio"}, coalesce=True)
+    await hass.async_block_till_done()
+
+    assert len(events) == 3
+    publisher.async_flush()
+
+
+async def test_bulk_results_fire_at_once(
+    hass: HomeAssistant, hub, config_entry: MockConfigEntry
+) -> None:
+    """Back-to-back bulk calls each get their own result, even in slim mode."""
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    ir_database = hass.data[DOMAIN]["ir_database"]
+    for name in ("Power", "Mute", "Input"):
+        await ir_database.add_command("TV", name, 38, 33, 1, RAW)
+    await hass.services.async_call(DOMAIN, "set_event_mode", {"mode": "slim"}, blocking=True)
+    events = async_capture_events(hass, EVENT_OPERATION)
+
+    for names in (["Power"], ["Mute", "Volume"]):
+        await hass.services.async_call(
+            DOMAIN,
+            "delete_ir_commands",
+            {"device_name": "TV", "command_names": names},
+            blocking=True,
+        )
+    await hass.async_block_till_done()
+
+    assert [event.data["data"] for event in events] == [
+        {"deleted": ["Power"], "missing": []},
+        {"deleted": ["Mute"], "missing": ["Volume"]},
+    ]
@@ -0,0 +1,64 @@
+"""Tests for the press-and-hold sends of Haptique Extender hubs."""
+from __future__ import annotations
+
+import json
+
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.haptique_extender.const import API_IR_SEND, DOMAIN
+from custom_components.haptique_extender.hold import HoldSession
+
+# A NEC frame, then the same frame twice more as in an untrimmed capture
+NEC_FRAME = [9000, 4500] + [560, 560, 560, 1690] * 16 + [560]
+NEC_CAPTURE = NEC_FRAME + [40000] + NEC_FRAME + [40000] + NEC_FRAME
+
+
+def _command(raw: list[int]) -> dict:
+    return {"freq_khz": 38, "duty": 33, "repeat": 1, "raw": raw}
+
+
+def _frame_ms(frame: list[int]) -> float:
+    return sum(frame) / 1000
+
+
+def test_untrimmed_capture_repeats_its_first_frame() -> None:
+    """Each repeat is one frame long, whatever the capture holds."""
+    session = HoldSession(None, _command(NEC_CAPTURE))
+    first_frame = NEC_FRAME + [40000]
+
+    assert session.frame_period * 1000 == _frame_ms(first_frame)
+    request = json.loads(session._body(session.batch_frames))
+    assert request["raw"] == first_frame
+    assert request["repeat"] == session.batch_frames
+
+
+def test_single_frame_gets_a_repeat_gap() -> None:
+    """A frame ending on a mark is sent with the gap its period counts."""
+    session = HoldSession(None, _command(NEC_FRAME))
+
+    request = json.loads(session._body(1))
+    assert request["raw"][-1] == 40000
+    assert session.frame_period * 1000 == _frame_ms(request["raw"])
+
+
+async def test_hold_batches_fill_the_schedule(
+    hass: HomeAssistant, hub, config_entry: MockConfigEntry
+) -> None:
+    """The frames requested match the time the session was held."""
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+
+    session = coordinator.start_hold(_command(NEC_CAPTURE), hold_secs=0.5)
+    await session.async_wait()
+
+    sends = [call for call in hub.mock_calls if str(call[1]).endswith(API_IR_SEND)]
+    requests = [json.loads(call[2]) for call in sends]
+    assert session.status == "timeout"
+    assert len(requests) == session.requests
+    assert all(request["raw"] == NEC_FRAME + [40000] for request in requests)
+    # As many frames as fit in the hold time, not a capture per frame
+    held_ms = sum(request["repeat"] for request in requests) * session.frame_period * 1000
+    assert 500 <= held_ms < 500 + session.frame_period * 1000
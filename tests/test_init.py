@@ -0,0 +1,72 @@
+"""Tests for the setup and unload of Haptique Extender entries."""
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.haptique_extender.const import CONF_DEVICE_SNAPSHOT, DOMAIN
+
+from .conftest import HUB_MAC
+
+# Nothing listens on port 9 of the loopback address; the sessions these
+# tests check are real ones, the mocked client sessions skip their cleanup
+OFFLINE_HOST = "127.0.0.1:9"
+SNAPSHOT = {"mac": HUB_MAC, "hostname": "haptique-test", "fw_ver": "1.1.2"}
+
+
+def _offline_entry(data: dict | None = None) -> MockConfigEntry:
+    """Return an entry for a hub nothing answers on."""
+    return MockConfigEntry(
+        domain=DOMAIN,
+        title="Haptique Test",
+        unique_id=HUB_MAC,
+        data={"host": OFFLINE_HOST, "name": "Haptique Test", "token": "", **(data or {})},
+    )
+
+
+def _track_sessions() -> tuple[list, object]:
+    """Patch the coordinator session factory to keep what it creates."""
+    sessions = []
+
+    def _create(hass, **kwargs):
+        sessions.append(async_create_clientsession(hass, **kwargs))
+        return sessions[-1]
+
+    return sessions, patch(
+        "custom_components.haptique_extender.coordinator.async_create_clientsession",
+        _create,
+    )
+
+
+async def test_unload_releases_the_session(hass: HomeAssistant, socket_enabled) -> None:
+    """The coordinator session goes away with the entry."""
+    entry = _offline_entry({CONF_DEVICE_SNAPSHOT: SNAPSHOT})
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    session = hass.data[DOMAIN][entry.entry_id].session
+    assert not session.closed
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert entry.state is ConfigEntryState.NOT_LOADED
+    assert entry.entry_id not in hass.data[DOMAIN]
+    assert session.closed
+
+
+async def test_failed_setup_releases_the_session(hass: HomeAssistant, socket_enabled) -> None:
+    """A hub that cannot be reached on first setup leaves no session behind."""
+    entry = _offline_entry()
+    entry.add_to_hass(hass)
+    sessions, patcher = _track_sessions()
+    with patcher:
+        assert not await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert entry.state is ConfigEntryState.SETUP_RETRY
+    assert sessions and all(session.closed for session in sessions)
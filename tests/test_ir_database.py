@@ -0,0 +1,184 @@
+"""Tests for the IR database of Haptique Extender."""
+from __future__ import annotations
+
+import asyncio
+import threading
+from pathlib import Path
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.haptique_extender import ir_database as ir_database_module
+from custom_components.haptique_extender.codec import json_loads
+from custom_components.haptique_extender.ir_database import (
+    JOURNAL_DELETE_COMMAND,
+    JOURNAL_PUT_COMMAND,
+    JOURNAL_PUT_DEVICE,
+    IRDatabase,
+)
+
+NEC_FRAME = [9000, 4500] + [560, 560, 560, 1690] * 16 + [560]
+NEC_CAPTURE = NEC_FRAME + [40000] + NEC_FRAME
+
+
+def _journal(hass: HomeAssistant) -> list[dict]:
+    path = Path(hass.config.path("haptique_ir_database.journal"))
+    if not path.exists():
+        return []
+    return [json_loads(line) for line in path.read_bytes().splitlines()]
+
+
+async def _reload(hass: HomeAssistant) -> IRDatabase:
+    database = IRDatabase(hass)
+    await database.async_ensure_loaded()
+    return database
+
+
+async def test_mutations_go_to_the_journal(
+    hass: HomeAssistant, ir_database: IRDatabase
+) -> None:
+    """Changes are appended to the journal and replayed on load."""
+    await ir_database.add_command("TV", "Power", 38, 33, 1, NEC_FRAME)
+    await ir_database.add_command("TV", "Mute", 38, 33, 1, NEC_FRAME)
+    await ir_database.delete_command("TV", "Mute")
+
+    operations = [record["op"] for record in _journal(hass)]
+    assert operations == [
+        JOURNAL_PUT_DEVICE,
+        JOURNAL_PUT_COMMAND,
+        JOURNAL_PUT_COMMAND,
+        JOURNAL_DELETE_COMMAND,
+    ]
+    assert not Path(hass.config.path("haptique_ir_database.json")).exists()
+
+    reloaded = await _reload(hass)
+    assert reloaded.command_names("TV") == ["Power"]
+    assert reloaded.get_command("tv", "power")["raw"] == NEC_FRAME
+
+
+async def test_torn_journal_record_is_skipped(
+    hass: HomeAssistant, ir_database: IRDatabase
+) -> None:
+    """A record cut short by a crash does not lose the ones before it."""
+    await ir_database.add_command("TV", "Power", 38, 33, 1, NEC_FRAME)
+    with open(hass.config.path("haptique_ir_database.journal"), "ab") as file:
+        file.write(b'{"op": "put_command", "dev')
+
+    reloaded = await _reload(hass)
+    assert reloaded.command_names("TV") == ["Power"]
+
+
+async def test_transaction_commits_once(ir_database: IRDatabase) -> None:
+    """Mutations in a transaction reach listeners in a single commit."""
+    commits: list[list[dict]] = []
+    ir_database.add_listener(commits.append)
+
+    async with ir_database.transaction():
+        await ir_database.add_command("TV", "Power", 38, 33, 1, NEC_FRAME)
+        await ir_database.add_command("TV", "Mute", 38, 33, 1, NEC_FRAME)
+        # Inside the transaction its own changes are visible
+        assert ir_database.command_names("TV") == ["Power", "Mute"]
+
+    assert len(commits) == 1
+    assert [record["op"] for record in commits[0]] == [
+        JOURNAL_PUT_DEVICE,
+        JOURNAL_PUT_COMMAND,
+        JOURNAL_PUT_COMMAND,
+    ]
+
+
+async def test_failed_transaction_changes_nothing(
+    hass: HomeAssistant, ir_database: IRDatabase
+) -> None:
+    """An exception inside a transaction discards all of its changes."""
+    await ir_database.add_command("TV", "Power", 38, 33, 1, NEC_FRAME)
+    commits: list[list[dict]] = []
+    ir_database.add_listener(commits.append)
+
+    with pytest.raises(RuntimeError):
+        async with ir_database.transaction():
+            await ir_database.delete_command("TV", "Power")
+            await ir_database.add_command("Radio", "On", 38, 33, 1, NEC_FRAME)
+            raise RuntimeError
+
+    assert commits == []
+    assert ir_database.command_names("TV") == ["Power"]
+    assert "Radio" not in ir_database.device_names()
+    assert len(_journal(hass)) == 2
+
+
+async def test_other_tasks_read_committed_data(
+    hass: HomeAssistant, ir_database: IRDatabase
+) -> None:
+    """Readers outside a running transaction see the last commit only."""
+    await ir_database.add_command("TV", "Power", 38, 33, 1, NEC_FRAME)
+    read = asyncio.Event()
+    seen: list[list[str]] = []
+
+    async def _read_commands() -> None:
+        await read.wait()
+        seen.append(ir_database.command_names("TV"))
+
+    reader = hass.async_create_task(_read_commands())
+    async with ir_database.transaction():
+        await ir_database.delete_command("TV", "Power")
+        read.set()
+        await reader
+
+    assert seen == [["Power"]]
+    assert ir_database.command_names("TV") == []
+
+
+async def test_compaction_folds_the_journal_into_the_file(
+    hass: HomeAssistant, ir_database: IRDatabase, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A grown journal is folded into the database file."""
+    monkeypatch.setattr(ir_database_module, "JOURNAL_MIN_COMPACT_BYTES", 1)
+    for index in range(5):
+        await ir_database.add_command("TV", f"Key {index}", 38, 33, 1, NEC_FRAME)
+    await hass.async_block_till_done()
+
+    # Commits made while the file was written stay in the journal
+    saved = json_loads(Path(hass.config.path("haptique_ir_database.json")).read_bytes())
+    assert len(saved["devices"]["TV"]["commands"]) + len(_journal(hass)) >= 5
+    assert len(_journal(hass)) < 5
+
+    reloaded = await _reload(hass)
+    assert len(reloaded.command_names("TV")) == 5
+
+
+async def test_save_encodes_off_the_event_loop(
+    hass: HomeAssistant, ir_database: IRDatabase, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """The full database is encoded in the executor, not in the loop."""
+    encode = ir_database_module.json_dumps_pretty
+    threads: list[threading.Thread] = []
+
+    def _encode(data):
+        threads.append(threading.current_thread())
+        return encode(data)
+
+    monkeypatch.setattr(ir_database_module, "json_dumps_pretty", _encode)
+    await ir_database.add_command("TV", "Power", 38, 33, 1, NEC_FRAME)
+    await ir_database.async_save()
+
+    assert threads
+    assert threading.main_thread() not in threads
+    assert (await _reload(hass)).command_names("TV") == ["Power"]
+
+
+async def test_optimize_trims_and_saves(
+    hass: HomeAssistant, ir_database: IRDatabase
+) -> None:
+    """Optimizing rewrites the file once and is stable on a second run."""
+    await ir_database.add_command("TV", "Power", 38, 33, 1, NEC_CAPTURE)
+
+    result = await ir_database.optimize()
+    assert result["commands_trimmed"] == 1
+    assert _journal(hass) == []
+    command = ir_database.get_command("TV", "Power")
+    assert command["repeat"] == 2
+
+    again = await ir_database.optimize()
+    assert again == {"commands_normalized": 0, "commands_trimmed": 0, "bytes_saved": 0}
+    assert ir_database.get_command("TV", "Power") == command
@@ -0,0 +1,136 @@
+"""Tests for the IR signal helpers of Haptique Extender."""
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from custom_components.haptique_extender.ir_database import IRDatabase
+from custom_components.haptique_extender.ir_signal import (
+    FRAME_GAP_US,
+    detect_repeat_frames,
+    fingerprint,
+    frame_period_ms,
+    normalize_command,
+    normalize_timings,
+    split_frames,
+    timings_match,
+    trim_repeated_command,
+)
+
+NEC_FRAME = [9000, 4500] + [560, 560, 560, 1690] * 16 + [560]
+NEC_CAPTURE = NEC_FRAME + [40000] + NEC_FRAME + [40000] + NEC_FRAME
+
+
+def _jitter(raw: list[int], rng: random.Random, spread: int = 80) -> list[int]:
+    """Return a capture of a code as a receiver would time it."""
+    return [value + rng.randint(-spread, spread) for value in raw]
+
+
+def _random_capture(rng: random.Random) -> list[int]:
+    """Return a capture of random durations, frame gaps included."""
+    return [
+        rng.choice(
+            (rng.randint(30, 20000), rng.randint(300, 2000), rng.randint(30, 60000))
+        )
+        for _ in range(rng.randint(2, 150))
+    ]
+
+
+def test_split_frames_round_trip() -> None:
+    """Frames keep their trailing gap and concatenate back to the capture."""
+    frames = split_frames(NEC_CAPTURE)
+
+    assert len(frames) == 3
+    assert frames[0][-1] == 40000
+    assert sum(frames, []) == NEC_CAPTURE
+
+
+def test_frame_period_adds_a_gap_to_a_single_frame() -> None:
+    """A frame ending on a mark is timed with the default repeat gap."""
+    assert frame_period_ms(NEC_CAPTURE) == frame_period_ms(NEC_FRAME)
+    assert frame_period_ms(NEC_FRAME) == (sum(NEC_FRAME) + 40000) / 1000
+
+
+def test_normalize_snaps_jitter_to_centroids() -> None:
+    """Receiver jitter is removed while the code stays the same."""
+    capture = _jitter(NEC_CAPTURE, random.Random(1))
+    normalized, quality = normalize_timings(capture)
+
+    assert len(normalized) == len(capture)
+    assert timings_match(normalized, NEC_CAPTURE)
+    assert len(set(normalized[2:len(NEC_FRAME):2])) == 1
+    assert 0 < quality <= 100
+
+
+def test_normalize_is_a_fixed_point() -> None:
+    """Normalizing a normalized capture changes nothing."""
+    rng = random.Random(2026)
+    for _ in range(2000):
+        capture = _random_capture(rng)
+        normalized, _ = normalize_timings(capture)
+        assert normalize_timings(normalized)[0] == normalized
+
+
+def test_normalize_keeps_frame_gaps_apart() -> None:
+    """Spaces inside frames and frame gaps never share a centroid."""
+    capture = [9000, 9800] + [560, 560] * 4 + [560, 10200] + [560, 560] * 4 + [560]
+    normalized, _ = normalize_timings(capture)
+
+    assert normalized[1] < FRAME_GAP_US <= normalized[11]
+    assert len(split_frames(normalized)) == len(split_frames(capture))
+
+
+def test_normalize_command_round_trip() -> None:
+    """A stored command is normalized once, then left alone."""
+    command = {"raw": _jitter(NEC_FRAME, random.Random(3)), "repeat": 1}
+    assert normalize_command(command) >= 0
+    normalized = dict(command)
+
+    assert normalize_command(command) == 0
+    assert command == normalized
+
+
+def test_normalize_command_sets_the_quality() -> None:
+    """The quality of the normalized capture replaces a stored one."""
+    capture = _jitter(NEC_FRAME, random.Random(4))
+    command = {"raw": capture, "quality": 12}
+    normalize_command(command)
+
+    assert command["quality"] == normalize_timings(capture)[1]
+
+
+def test_trim_repeated_command_folds_the_repeat_count() -> None:
+    """A held-button capture is stored as one frame repeated."""
+    command = {"raw": list(NEC_CAPTURE), "repeat": 2}
+    assert trim_repeated_command(command) > 0
+    assert command["raw"] == NEC_FRAME + [40000]
+    assert command["repeat"] == 6
+    assert detect_repeat_frames(command["raw"])[1] == 1
+
+
+def test_fingerprint_ignores_repeats() -> None:
+    """A held-button capture has the fingerprint of its single frame."""
+    assert fingerprint(NEC_CAPTURE) == fingerprint(NEC_FRAME)
+
+
+@pytest.mark.parametrize("seed", range(20))
+async def test_relearn_keeps_the_stored_code(ir_database: IRDatabase, seed: int) -> None:
+    """Learning the same button again stores the same timings."""
+    rng = random.Random(seed)
+    first, quality = normalize_timings(_jitter(NEC_FRAME, rng))
+    assert await ir_database.add_command("TV", "Power", 38, 33, 1, first, quality)
+
+    again, quality = normalize_timings(_jitter(NEC_FRAME, rng))
+    assert await ir_database.add_command("tv", "power", 38, 33, 1, again, quality)
+
+    assert ir_database.get_command("TV", "Power")["raw"] == first
+
+
+async def test_relearn_of_another_code_replaces_it(ir_database: IRDatabase) -> None:
+    """A different code learned under the same name is stored."""
+    assert await ir_database.add_command("TV", "Power", 38, 33, 1, NEC_FRAME)
+    other = NEC_FRAME[:2] + [560, 1690, 560, 560] * 16 + [560]
+    assert await ir_database.add_command("TV", "Power", 38, 33, 1, other)
+
+    assert ir_database.get_command("TV", "Power")["raw"] == other
@@ -0,0 +1,38 @@
+"""Tests for IR learning on Haptique Extender hubs."""
+from __future__ import annotations
+
+from homeassistant.const import STATE_UNKNOWN
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.haptique_extender.const import DOMAIN
+from custom_components.haptique_extender.learning import BatchLearning, LearningSession
+
+NEC_FRAME = [9000, 4500] + [560, 560, 560, 1690] * 16 + [560]
+LEARN_SENSOR = "sensor.haptique_test_last_learn_ir_code"
+
+
+async def test_batch_capture_updates_the_learn_sensor(
+    hass: HomeAssistant, hub, config_entry: MockConfigEntry
+) -> None:
+    """Every batch capture shows on the learn sensor, before the commit."""
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+    assert hass.states.get(LEARN_SENSOR).state == STATE_UNKNOWN
+    requests = len(hub.mock_calls)
+
+    session = LearningSession(
+        "batch", coordinator, "TV", batch=BatchLearning(["Power", "Mute"], 2)
+    )
+    ir_data = {"combined": NEC_FRAME, "freq_khz": 38, "frames": 1}
+    assert not coordinator.handle_batch_capture(ir_data, session)
+    await hass.async_block_till_done()
+
+    assert coordinator.data["last_learn_ir_code"] == ir_data
+    assert coordinator.data["last_learn_ir_timestamp"] == coordinator.last_learn_ir_timestamp
+    state = hass.states.get(LEARN_SENSOR)
+    assert state.state == coordinator.last_learn_ir_timestamp.replace(microsecond=0).isoformat()
+    # Shown without polling the hub
+    assert len(hub.mock_calls) == requests
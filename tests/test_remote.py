@@ -0,0 +1,86 @@
+"""Tests for the remote entity of Haptique Extender hubs."""
+from __future__ import annotations
+
+import pytest
+from homeassistant.components.remote import (
+    DOMAIN as REMOTE_DOMAIN,
+    SERVICE_DELETE_COMMAND,
+    SERVICE_LEARN_COMMAND,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.haptique_extender.const import DOMAIN
+from custom_components.haptique_extender.entity import async_select_device
+from custom_components.haptique_extender.ir_database import IRDatabase
+
+REMOTE = "remote.haptique_test_remote"
+NEC_FRAME = [9000, 4500] + [560, 560, 560, 1690] * 16 + [560]
+
+
+@pytest.fixture
+async def ir_db(hass: HomeAssistant, hub, config_entry: MockConfigEntry) -> IRDatabase:
+    """Set the hub up and return its IR database, with two devices."""
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert hass.states.get(REMOTE)
+    ir_db: IRDatabase = hass.data[DOMAIN]["ir_database"]
+    for device_name in ("TV", "Radio"):
+        for command_name in ("Power", "Mute"):
+            await ir_db.add_command(device_name, command_name, 38, 33, 1, NEC_FRAME)
+    return ir_db
+
+
+async def _call(hass: HomeAssistant, service: str, data: dict) -> None:
+    await hass.services.async_call(
+        REMOTE_DOMAIN, service, {"entity_id": REMOTE, **data}, blocking=True
+    )
+
+
+async def test_learn_without_commands_is_rejected(
+    hass: HomeAssistant, ir_db: IRDatabase
+) -> None:
+    """Learning needs at least one command name."""
+    with pytest.raises(ServiceValidationError):
+        await _call(hass, SERVICE_LEARN_COMMAND, {"device": "TV"})
+
+
+async def test_learn_without_device_is_rejected(
+    hass: HomeAssistant, ir_db: IRDatabase, config_entry: MockConfigEntry
+) -> None:
+    """Learning needs a device, given or selected on the hub."""
+    async_select_device(hass, None, config_entry.entry_id)
+    with pytest.raises(ServiceValidationError):
+        await _call(hass, SERVICE_LEARN_COMMAND, {"command": ["Power"]})
+
+
+async def test_delete_from_the_given_device(hass: HomeAssistant, ir_db: IRDatabase) -> None:
+    """Commands are deleted from the device of the call."""
+    await _call(hass, SERVICE_DELETE_COMMAND, {"device": "TV", "command": ["Power"]})
+
+    assert ir_db.command_names("TV") == ["Mute"]
+    assert ir_db.command_names("Radio") == ["Power", "Mute"]
+
+
+async def test_delete_from_the_selected_device(
+    hass: HomeAssistant, ir_db: IRDatabase, config_entry: MockConfigEntry
+) -> None:
+    """Without a device, commands are deleted from the selected one."""
+    async_select_device(hass, "Radio", config_entry.entry_id)
+    await _call(hass, SERVICE_DELETE_COMMAND, {"command": ["Mute", "TV/Power"]})
+
+    assert ir_db.command_names("Radio") == ["Power"]
+    assert ir_db.command_names("TV") == ["Mute"]
+
+
+async def test_delete_without_device_is_rejected(
+    hass: HomeAssistant, ir_db: IRDatabase, config_entry: MockConfigEntry
+) -> None:
+    """Nothing is deleted when no device is given or selected."""
+    async_select_device(hass, None, config_entry.entry_id)
+    with pytest.raises(ServiceValidationError):
+        await _call(hass, SERVICE_DELETE_COMMAND, {"command": ["TV/Mute", "Power"]})
+
+    assert ir_db.command_names("TV") == ["Power", "Mute"]
@@ -0,0 +1,96 @@
+"""Tests for the request limiter of Haptique Extender hubs."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.haptique_extender.request_limiter import HubBusyError, RequestLimiter
+from custom_components.haptique_extender.timeouts import Deadline, DeadlineExceededError
+
+
+async def _queued(limiter: RequestLimiter, order: list[int], index: int) -> asyncio.Task:
+    """Start a request waiting for a slot, wait until it is in line."""
+
+    async def _request() -> None:
+        await limiter.acquire()
+        order.append(index)
+
+    task = asyncio.create_task(_request())
+    await asyncio.sleep(0)
+    return task
+
+
+async def test_waiters_get_slots_in_order() -> None:
+    """Requests past the limit wait, first come first served."""
+    limiter = RequestLimiter("hub", concurrency=1, queue_depth=5)
+    order: list[int] = []
+    await limiter.acquire()
+    tasks = [await _queued(limiter, order, index) for index in range(3)]
+    assert limiter.active == 1
+    assert limiter.waiting == 3
+
+    for _ in tasks:
+        limiter.release()
+        await asyncio.sleep(0)
+    await asyncio.gather(*tasks)
+
+    assert order == [0, 1, 2]
+    assert limiter.active == 1
+    assert limiter.waiting == 0
+
+
+async def test_full_queue_rejects() -> None:
+    """Once the queue is full, requests fail at once."""
+    limiter = RequestLimiter("hub", concurrency=1, queue_depth=1)
+    await limiter.acquire()
+    task = await _queued(limiter, [], 0)
+
+    with pytest.raises(HubBusyError):
+        await limiter.acquire()
+    assert limiter.rejected == 1
+
+    limiter.release()
+    await task
+
+
+async def test_deadline_leaves_the_queue() -> None:
+    """A waiter whose deadline passes gives its place up."""
+    limiter = RequestLimiter("hub", concurrency=1, queue_depth=1)
+    await limiter.acquire()
+
+    with pytest.raises(DeadlineExceededError):
+        await limiter.acquire(Deadline(0.01))
+    assert limiter.waiting == 0
+
+    limiter.release()
+    assert limiter.active == 0
+
+
+async def test_cancelled_waiter_leaves_the_queue() -> None:
+    """Cancelling a waiting request neither keeps nor leaks a slot."""
+    limiter = RequestLimiter("hub", concurrency=1, queue_depth=2)
+    await limiter.acquire()
+    task = await _queued(limiter, [], 0)
+
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert limiter.waiting == 0
+
+    limiter.release()
+    assert limiter.active == 0
+
+
+async def test_raising_the_limit_wakes_waiters() -> None:
+    """More concurrency hands slots to the waiters right away."""
+    limiter = RequestLimiter("hub", concurrency=1, queue_depth=5)
+    order: list[int] = []
+    await limiter.acquire()
+    tasks = [await _queued(limiter, order, index) for index in range(2)]
+
+    limiter.configure(concurrency=3, queue_depth=5)
+    await asyncio.gather(*tasks)
+
+    assert order == [0, 1]
+    assert limiter.active == 3
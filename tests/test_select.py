@@ -0,0 +1,119 @@
+"""Tests for the IR device and command selects of Haptique Extender hubs."""
+from __future__ import annotations
+
+import pytest
+from homeassistant.components.select import (
+    ATTR_OPTION,
+    ATTR_OPTIONS,
+    DOMAIN as SELECT_DOMAIN,
+    SERVICE_SELECT_OPTION,
+)
+from homeassistant.const import STATE_UNKNOWN
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.haptique_extender.const import DOMAIN
+from custom_components.haptique_extender.entity import async_select_device
+from custom_components.haptique_extender.ir_database import IRDatabase
+
+DEVICE_SELECT = "select.haptique_test_ir_device"
+COMMAND_SELECT = "select.haptique_test_ir_command"
+NEC_FRAME = [9000, 4500] + [560, 560, 560, 1690] * 16 + [560]
+
+
+@pytest.fixture
+async def ir_db(hass: HomeAssistant, hub, config_entry: MockConfigEntry) -> IRDatabase:
+    """Set the hub up and return its empty IR database."""
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    return hass.data[DOMAIN]["ir_database"]
+
+
+def _select(hass: HomeAssistant, entity_id: str) -> tuple[list[str], str]:
+    """Return the options and the current option of a select."""
+    state = hass.states.get(entity_id)
+    return state.attributes[ATTR_OPTIONS], state.state
+
+
+async def _add(ir_db: IRDatabase, device_name: str, *command_names: str) -> None:
+    for command_name in command_names:
+        await ir_db.add_command(device_name, command_name, 38, 33, 1, NEC_FRAME)
+
+
+async def test_devices_follow_commits(hass: HomeAssistant, ir_db: IRDatabase) -> None:
+    """Devices are added and removed as they are committed."""
+    assert _select(hass, DEVICE_SELECT)[0] == []
+
+    await _add(ir_db, "TV", "Power")
+    # The first device is selected for the hub
+    assert _select(hass, DEVICE_SELECT) == (["TV"], "TV")
+
+    await _add(ir_db, "Radio", "Power")
+    assert _select(hass, DEVICE_SELECT) == (["TV", "Radio"], "TV")
+
+    await ir_db.delete_device("Radio")
+    assert _select(hass, DEVICE_SELECT) == (["TV"], "TV")
+
+
+async def test_commands_follow_the_selected_device(
+    hass: HomeAssistant, ir_db: IRDatabase
+) -> None:
+    """Only commits of the selected device change the command options."""
+    await _add(ir_db, "TV", "Power", "Mute")
+    assert _select(hass, COMMAND_SELECT) == (["Power", "Mute"], "Power")
+    assert hass.states.get(COMMAND_SELECT).attributes["selected_device"] == "TV"
+
+    await _add(ir_db, "Radio", "Tune")
+    await _add(ir_db, "tv", "Input")
+    assert _select(hass, COMMAND_SELECT) == (["Power", "Mute", "Input"], "Power")
+
+    await ir_db.delete_command("TV", "Power")
+    # The selected command is gone, the first one left is selected
+    assert _select(hass, COMMAND_SELECT) == (["Mute", "Input"], "Mute")
+
+
+async def test_selection_is_case_insensitive(
+    hass: HomeAssistant, ir_db: IRDatabase, config_entry: MockConfigEntry
+) -> None:
+    """A device selected elsewhere is matched whatever its case."""
+    await _add(ir_db, "TV", "Power")
+    await _add(ir_db, "Radio", "Tune", "Mute")
+
+    async_select_device(hass, "radio", config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert _select(hass, DEVICE_SELECT) == (["TV", "Radio"], "Radio")
+    assert _select(hass, COMMAND_SELECT) == (["Tune", "Mute"], "Tune")
+
+
+async def test_select_option_selects_the_device(hass: HomeAssistant, ir_db: IRDatabase) -> None:
+    """Choosing a device shows its commands."""
+    await _add(ir_db, "TV", "Power")
+    await _add(ir_db, "Radio", "Tune")
+
+    await hass.services.async_call(
+        SELECT_DOMAIN,
+        SERVICE_SELECT_OPTION,
+        {"entity_id": DEVICE_SELECT, ATTR_OPTION: "Radio"},
+        blocking=True,
+    )
+
+    assert _select(hass, DEVICE_SELECT)[1] == "Radio"
+    assert _select(hass, COMMAND_SELECT) == (["Tune"], "Tune")
+
+
+async def test_deleting_the_selected_device_falls_back(
+    hass: HomeAssistant, ir_db: IRDatabase
+) -> None:
+    """The first device left is selected, with its commands."""
+    await _add(ir_db, "TV", "Power")
+    await _add(ir_db, "Radio", "Tune")
+
+    await ir_db.delete_device("TV")
+    assert _select(hass, DEVICE_SELECT) == (["Radio"], "Radio")
+    assert _select(hass, COMMAND_SELECT) == (["Tune"], "Tune")
+
+    await ir_db.delete_device("Radio")
+    assert _select(hass, DEVICE_SELECT) == ([], STATE_UNKNOWN)
+    assert _select(hass, COMMAND_SELECT) == ([], STATE_UNKNOWN)
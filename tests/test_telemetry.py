@@ -0,0 +1,231 @@
+"""Tests for the MQTT telemetry of Haptique Extender hubs."""
+from __future__ import annotations
+
+import asyncio
+import shutil
+from unittest.mock import patch
+
+import pytest
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_mqtt_message,
+)
+
+from custom_components.haptique_extender.const import (
+    API_WIFI_STATUS,
+    CONF_EVENT_MODE,
+    CONF_MQTT_TOPIC,
+    CONF_SCAN_INTERVAL,
+    DOMAIN,
+)
+
+from .conftest import HUB_HOST
+
+TOPIC = "haptique/living"
+
+
+@pytest.fixture
+def expected_lingering_timers() -> bool:
+    """Allow the periodic timer the MQTT client leaves behind."""
+    return True
+
+
+def _http_calls(hub, endpoint: str) -> int:
+    """Return how many times the hub answered an endpoint over HTTP."""
+    return sum(1 for call in hub.mock_calls if str(call[1]).endswith(endpoint))
+
+
+async def _setup(hass: HomeAssistant, entry: MockConfigEntry, options: dict) -> None:
+    entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(entry, options=options)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_pushed_answers_replace_polling(
+    hass: HomeAssistant, mqtt_mock, hub, config_entry: MockConfigEntry
+) -> None:
+    """A fresh pushed answer is used instead of the HTTP request."""
+    await _setup(hass, config_entry, {CONF_MQTT_TOPIC: TOPIC})
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+    assert coordinator.telemetry is not None
+    assert coordinator.telemetry.connected
+
+    polled = _http_calls(hub, API_WIFI_STATUS)
+    async_fire_mqtt_message(hass, f"{TOPIC}/wifi/status", '{"sta": {"rssi": -40, "ip": "x"}}')
+    await hass.async_block_till_done()
+    await coordinator.async_refresh()
+
+    assert coordinator.data["wifi"]["sta"]["rssi"] == -40
+    assert _http_calls(hub, API_WIFI_STATUS) == polled
+    assert coordinator.telemetry.received[API_WIFI_STATUS] == 1
+
+
+async def test_stale_answers_fall_back_to_http(
+    hass: HomeAssistant, mqtt_mock, hub, config_entry: MockConfigEntry
+) -> None:
+    """An answer older than the maximum age is polled over HTTP again."""
+    await _setup(hass, config_entry, {CONF_MQTT_TOPIC: TOPIC})
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+
+    async_fire_mqtt_message(hass, f"{TOPIC}/wifi/status", '{"sta": {"rssi": -40}}')
+    await hass.async_block_till_done()
+    coordinator.telemetry.max_age = -1
+    polled = _http_calls(hub, API_WIFI_STATUS)
+    await coordinator.async_refresh()
+
+    assert coordinator.data["wifi"]["sta"]["rssi"] == -55
+    assert _http_calls(hub, API_WIFI_STATUS) == polled + 1
+
+
+async def test_max_age_follows_the_scan_interval(
+    hass: HomeAssistant, mqtt_mock, hub, config_entry: MockConfigEntry
+) -> None:
+    """A hub that stops publishing is polled again after two scan intervals."""
+    await _setup(hass, config_entry, {CONF_MQTT_TOPIC: TOPIC, CONF_SCAN_INTERVAL: 10})
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+    telemetry = coordinator.telemetry
+    assert telemetry.max_age == 20
+
+    async_fire_mqtt_message(hass, f"{TOPIC}/wifi/status", '{"sta": {"rssi": -40}}')
+    await hass.async_block_till_done()
+    value, pushed_at = telemetry._values[API_WIFI_STATUS]
+    telemetry._values[API_WIFI_STATUS] = (value, pushed_at - 21)
+    await coordinator.async_refresh()
+    assert coordinator.data["wifi"]["sta"]["rssi"] == -55
+
+    hass.config_entries.async_update_entry(
+        config_entry, options={CONF_MQTT_TOPIC: TOPIC, CONF_SCAN_INTERVAL: 60}
+    )
+    await hass.async_block_till_done()
+    assert telemetry.max_age == 120
+    assert telemetry.get(API_WIFI_STATUS) == value
+
+
+async def test_malformed_messages_are_ignored(
+    hass: HomeAssistant, mqtt_mock, hub, config_entry: MockConfigEntry
+) -> None:
+    """Messages that are not JSON objects never stand in for the hub."""
+    await _setup(hass, config_entry, {CONF_MQTT_TOPIC: TOPIC})
+    telemetry = hass.data[DOMAIN][config_entry.entry_id].telemetry
+
+    async_fire_mqtt_message(hass, f"{TOPIC}/wifi/status", "not json")
+    async_fire_mqtt_message(hass, f"{TOPIC}/wifi/status", "[1, 2]")
+    await hass.async_block_till_done()
+
+    assert telemetry.get(API_WIFI_STATUS) is None
+
+
+async def test_setup_does_not_wait_for_the_broker(
+    hass: HomeAssistant, hub, config_entry: MockConfigEntry
+) -> None:
+    """The hub is polled over HTTP while the broker is still unavailable."""
+    broker_ready = asyncio.Event()
+
+    async def _wait_for_mqtt_client(hass: HomeAssistant) -> bool:
+        await broker_ready.wait()
+        return True
+
+    hass.config.components.add("mqtt")
+    config_entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(config_entry, options={CONF_MQTT_TOPIC: TOPIC})
+    with patch(
+        "homeassistant.components.mqtt.async_wait_for_mqtt_client",
+        _wait_for_mqtt_client,
+    ):
+        assert await hass.config_entries.async_setup(config_entry.entry_id)
+        assert config_entry.state is ConfigEntryState.LOADED
+
+        coordinator = hass.data[DOMAIN][config_entry.entry_id]
+        assert coordinator.telemetry is None
+        assert coordinator.data["status"]["hostname"] == "haptique-test"
+
+        # Unloading stops the pending subscription
+        assert await hass.config_entries.async_unload(config_entry.entry_id)
+        await hass.async_block_till_done()
+        assert coordinator.telemetry is None
+
+
+async def test_removing_the_topic_stops_telemetry(
+    hass: HomeAssistant, mqtt_mock, hub, config_entry: MockConfigEntry
+) -> None:
+    """Clearing the topic in the options goes back to HTTP polling only."""
+    await _setup(hass, config_entry, {CONF_MQTT_TOPIC: TOPIC, CONF_EVENT_MODE: "slim"})
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+    assert coordinator.telemetry is not None
+
+    result = await hass.config_entries.options.async_init(config_entry.entry_id)
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], user_input={CONF_MQTT_TOPIC: "  "}
+    )
+    await hass.async_block_till_done()
+
+    assert CONF_MQTT_TOPIC not in config_entry.options
+    assert config_entry.options[CONF_EVENT_MODE] == "slim"
+    assert coordinator.telemetry is None
+
+
+async def test_options_flow_drops_an_omitted_topic(
+    hass: HomeAssistant, hub, config_entry: MockConfigEntry
+) -> None:
+    """A topic left out of the form is removed from the saved options."""
+    await _setup(hass, config_entry, {CONF_MQTT_TOPIC: TOPIC})
+
+    result = await hass.config_entries.options.async_init(config_entry.entry_id)
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], user_input={}
+    )
+    await hass.async_block_till_done()
+
+    assert CONF_MQTT_TOPIC not in config_entry.options
+
+
+@pytest.mark.skipif(shutil.which("mosquitto") is None, reason="mosquitto is not installed")
+async def test_telemetry_through_mosquitto(
+    socket_enabled,
+    mock_hass_config,
+    hass: HomeAssistant,
+    hub,
+    config_entry: MockConfigEntry,
+    tmp_path,
+    unused_tcp_port,
+) -> None:
+    """Telemetry published on a real broker reaches the coordinator."""
+    from homeassistant.components import mqtt
+
+    config = tmp_path / "mosquitto.conf"
+    config.write_text(f"listener {unused_tcp_port} 127.0.0.1\nallow_anonymous true\n")
+    broker = await asyncio.create_subprocess_exec(
+        shutil.which("mosquitto"), "-c", str(config)
+    )
+    try:
+        await asyncio.sleep(0.5)
+        mqtt_entry = MockConfigEntry(
+            domain=mqtt.DOMAIN,
+            data={mqtt.CONF_BROKER: "127.0.0.1", "port": unused_tcp_port},
+        )
+        mqtt_entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(mqtt_entry.entry_id)
+        await hass.async_block_till_done()
+
+        await _setup(hass, config_entry, {CONF_MQTT_TOPIC: TOPIC})
+        coordinator = hass.data[DOMAIN][config_entry.entry_id]
+        for _ in range(50):
+            if coordinator.telemetry and coordinator.telemetry.connected:
+                break
+            await asyncio.sleep(0.1)
+        assert coordinator.telemetry and coordinator.telemetry.connected
+
+        # Subscriptions reach the broker in debounced batches, publish until one lands
+        for _ in range(50):
+            await mqtt.async_publish(hass, f"{TOPIC}/wifi/status", '{"sta": {"rssi": -40}}')
+            await asyncio.sleep(0.2)
+            if coordinator.telemetry.get(API_WIFI_STATUS):
+                break
+        assert coordinator.telemetry.get(API_WIFI_STATUS) == {"sta": {"rssi": -40}}
+        assert HUB_HOST in coordinator.base_url
+    finally:
+        broker.terminate()
+        await broker.wait()